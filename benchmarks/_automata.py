@@ -0,0 +1,107 @@
+"""
+Generadores de autómatas sintéticos compartidos por los benchmarks.
+"""
+import os
+import random
+import sys
+from typing import Dict, Set, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from nfa_dfa.nfa import NFA  # noqa: E402
+
+
+def nth_from_end_nfa(n: int) -> NFA:
+    """
+    AFN de (a|b)* a (a|b)^n: su AFD por subconjuntos tiene 2^(n+1) estados,
+    lo que permite escalar el tamaño del AFD de forma controlada.
+    """
+    states = {f"q{i}" for i in range(n + 2)}
+    delta: Dict[Tuple[str, str], Set[str]] = {
+        ("q0", "a"): {"q0", "q1"},
+        ("q0", "b"): {"q0"},
+    }
+    for i in range(1, n + 1):
+        delta[(f"q{i}", "a")] = {f"q{i + 1}"}
+        delta[(f"q{i}", "b")] = {f"q{i + 1}"}
+    return NFA(states=states, sigma={"a", "b"}, delta=delta, q0="q0", finals={f"q{n + 1}"})
+
+
+def wide_nth_from_end_nfa(n: int, width: int) -> NFA:
+    """
+    (a|b)*a(a|b)^n con width cadenas idénticas en paralelo: el AFD sigue
+    teniendo 2^(n+1) estados, pero cada subconjunto tiene width veces más
+    miembros, así que cada expansión cuesta más (y compensa repartirla).
+    """
+    delta = {("q0", "a"): {"q0"} | {f"c{j}_1" for j in range(width)}, ("q0", "b"): {"q0"}}
+    states = {"q0"}
+    for j in range(width):
+        for i in range(1, n + 2):
+            states.add(f"c{j}_{i}")
+            if i <= n:
+                delta[(f"c{j}_{i}", "a")] = {f"c{j}_{i + 1}"}
+                delta[(f"c{j}_{i}", "b")] = {f"c{j}_{i + 1}"}
+    finals = {f"c{j}_{n + 1}" for j in range(width)}
+    return NFA(states=states, sigma={"a", "b"}, delta=delta, q0="q0", finals=finals)
+
+
+def random_nfa(n: int, k: int = 2, density: float = 1.5, eps: float = 0.2, seed: int = 0) -> NFA:
+    """
+    AFN aleatorio con n estados, k símbolos, ~density destinos por (estado, símbolo)
+    y una proporción eps de estados con transiciones ε.
+    """
+    rnd = random.Random(seed)
+    states = [f"q{i}" for i in range(n)]
+    sigma = [chr(ord('a') + i) for i in range(k)]
+    delta: Dict[Tuple[str, str], Set[str]] = {}
+    for q in states:
+        for a in sigma:
+            m = int(density) + (rnd.random() < density - int(density))
+            if m:
+                delta[(q, a)] = set(rnd.sample(states, min(m, n)))
+        if rnd.random() < eps:
+            delta[(q, '')] = {rnd.choice(states)}
+    finals = set(rnd.sample(states, max(1, n // 10)))
+    return NFA(states=set(states), sigma=set(sigma), delta=delta, q0=states[0], finals=finals)
+
+
+def random_dfa(n: int, k: int = 2, seed: int = 0):
+    """
+    DFA completo aleatorio con n estados y k símbolos; ~1/3 de los estados son
+    finales. Los estados se llaman s0..s(n-1) con s0 como inicial.
+    """
+    from nfa_dfa.dfa import DFA
+
+    rnd = random.Random(seed)
+    states = [f"s{i}" for i in range(n)]
+    sigma = [chr(ord('a') + i) for i in range(k)]
+    delta = {(q, a): states[rnd.randrange(n)] for q in states for a in sigma}
+    finals = {q for q in states if rnd.random() < 1 / 3}
+    return DFA(states=set(states), sigma=set(sigma), delta=delta, q0=states[0], finals=finals)
+
+
+def chain_dfa(n: int):
+    """
+    DFA en cadena s0 -a-> s1 -a-> ... -a-> s(n-1) (final), con 'b' volviendo
+    a s0. Es el peor caso de Moore: hace falta una ronda por estado.
+    """
+    from nfa_dfa.dfa import DFA
+
+    states = [f"s{i:06d}" for i in range(n)]
+    delta = {}
+    for i, q in enumerate(states):
+        delta[(q, "a")] = states[min(i + 1, n - 1)]
+        delta[(q, "b")] = states[0]
+    return DFA(states=set(states), sigma={"a", "b"}, delta=delta, q0=states[0], finals={states[-1]})
+
+
+def random_corpus(total_bytes: int, alphabet: str = "ab", min_len: int = 4, max_len: int = 40, seed: int = 0):
+    """Lista de palabras aleatorias sobre alphabet que suman ~total_bytes caracteres."""
+    rnd = random.Random(seed)
+    words = []
+    size = 0
+    while size < total_bytes:
+        n = rnd.randint(min_len, max_len)
+        words.append(''.join(rnd.choice(alphabet) for _ in range(n)))
+        size += n
+    return words
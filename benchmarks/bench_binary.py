@@ -0,0 +1,69 @@
+"""
+Benchmark del formato binario (.afb) frente a volver a parsear texto/XML:
+  - AFN aleatorio: parsear .txt y .jff frente a binary.load();
+  - AFD grande (por subconjuntos): load() (DFA con dict δ) y
+    BinaryAutomaton + compile() (tabla compilada directa desde el mmap).
+
+Uso: python benchmarks/bench_binary.py [n_estados_afn] [n_afd]
+     (el AFD sale de (a|b)*a(a|b)^n_afd: 2^(n_afd+1) estados)
+"""
+import os
+import sys
+import tempfile
+import time
+
+from _automata import nth_from_end_nfa, random_nfa
+from bench_txt_parser import write_labeled
+from nfa_dfa import binary
+from nfa_dfa.jflap_export import export_nfa_to_jff
+from nfa_dfa.step_engine import convert_nfa_to_dfa
+from parsers.jflap_parser import parse_nfa_from_jff
+from parsers.txt_parser import parse_nfa_from_txt
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def open_and_compile(path: str):
+    with binary.BinaryAutomaton(path) as b:
+        return b.compile()
+
+
+def main():
+    n_nfa = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_dfa = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    with tempfile.TemporaryDirectory() as tmp:
+        nfa = random_nfa(n_nfa, k=3)
+        txt, jff, afb = (os.path.join(tmp, f'nfa{ext}') for ext in ('.txt', '.jff', binary.SUFFIX))
+        write_labeled(nfa, txt)
+        export_nfa_to_jff(nfa, jff)
+        binary.save(nfa, afb)
+        n_trans = sum(map(len, nfa.delta.values()))
+        print(f"AFN: {n_nfa} estados, {n_trans} transiciones")
+        for label, fn, path in (
+            ("parse .txt", parse_nfa_from_txt, txt),
+            ("parse .jff", parse_nfa_from_jff, jff),
+            ("binary.load", binary.load, afb),
+        ):
+            dt, loaded = timed(fn, path)
+            assert loaded.delta == nfa.delta
+            print(f"{label:>24} {dt:>8.3f} s {os.path.getsize(path) / 2**20:>8.1f} MiB")
+
+        dfa = convert_nfa_to_dfa(nth_from_end_nfa(n_dfa)).dfa
+        path = os.path.join(tmp, f'dfa{binary.SUFFIX}')
+        binary.save(dfa, path)
+        print(f"AFD: {len(dfa.states)} estados, {len(dfa.delta)} transiciones")
+        dt, loaded = timed(binary.load, path)
+        assert loaded.delta == dfa.delta
+        print(f"{'binary.load':>24} {dt:>8.3f} s {os.path.getsize(path) / 2**20:>8.1f} MiB")
+        dt, compiled = timed(open_and_compile, path)
+        assert compiled.table == dfa.compile().table
+        print(f"{'mmap + compile()':>24} {dt:>8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark de la exportación a JFLAP: escritura en streaming (sin y con
+gzip) frente al exportador anterior, que construía el árbol lxml completo
+con SubElement y lo escribía con pretty_print (se conserva aquí como
+referencia). Se exporta el AFD de (a|b)*a(a|b)^n, con 2^(n+1) estados y el
+doble de transiciones. Cada exportación se ejecuta en un proceso nuevo para
+medir su pico de memoria (ru_maxrss); se resta el RSS tras construir el AFD.
+
+Uso: python benchmarks/bench_jff_export.py [n] [repeticiones]
+"""
+import math
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from _automata import nth_from_end_nfa
+from lxml import etree
+from nfa_dfa.dfa import DFA
+from nfa_dfa.jflap_export import export_dfa_to_jff
+from nfa_dfa.step_engine import convert_nfa_to_dfa
+
+
+def _layout_positions_old(states, width=800, height=600, margin=50):
+    """Grid anterior: siempre dentro de 800×600, sin importar el tamaño."""
+    n = len(states)
+    cols = math.ceil(math.sqrt(n))
+    rows = math.ceil(n / cols)
+    usable_w = width - 2 * margin
+    usable_h = height - 2 * margin
+    dx = usable_w / (cols - 1) if cols > 1 else 0
+    dy = usable_h / (rows - 1) if rows > 1 else 0
+    positions = {}
+    for idx, q in enumerate(sorted(states)):
+        r = idx // cols
+        c = idx % cols
+        positions[q] = (margin + c * dx, margin + r * dy)
+    return positions
+
+
+def export_dfa_to_jff_dom(dfa: DFA, path: str) -> None:
+    """Exportador anterior (árbol completo en memoria), como línea base."""
+    root = etree.Element("structure")
+    etree.SubElement(root, "type").text = "fa"
+    automaton = etree.SubElement(root, "automaton")
+
+    positions = _layout_positions_old(dfa.states)
+    state_ids = {q: idx for idx, q in enumerate(sorted(dfa.states))}
+
+    for q, idx in state_ids.items():
+        x, y = positions[q]
+        s = etree.SubElement(automaton, "state", id=str(idx), name=dfa.label(q))
+        etree.SubElement(s, "x").text = f"{x:.1f}"
+        etree.SubElement(s, "y").text = f"{y:.1f}"
+        if q == dfa.q0:
+            etree.SubElement(s, "initial")
+        if q in dfa.finals:
+            etree.SubElement(s, "final")
+
+    for (q, a), dest in dfa.delta.items():
+        t = etree.SubElement(automaton, "transition")
+        etree.SubElement(t, "from").text = str(state_ids[q])
+        etree.SubElement(t, "to").text = str(state_ids[dest])
+        etree.SubElement(t, "read").text = a or ""
+
+    tree = etree.ElementTree(root)
+    tree.write(path, pretty_print=True, xml_declaration=True, encoding="UTF-8")
+
+
+EXPORTERS = {
+    'dom (SubElement)': (export_dfa_to_jff_dom, '.jff'),
+    'streaming': (export_dfa_to_jff, '.jff'),
+    'streaming gzip': (export_dfa_to_jff, '.jff.gz'),
+}
+
+
+def run_child(name: str, n: str, directory: str):
+    """Modo hijo: exporta una vez e imprime tiempo, pico de RSS (KiB) y tamaño."""
+    dfa = convert_nfa_to_dfa(nth_from_end_nfa(int(n))).dfa
+    export, suffix = EXPORTERS[name]
+    path = os.path.join(directory, 'bench' + suffix)
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    export(dfa, path)
+    dt = time.perf_counter() - t0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(dt, peak - base, os.path.getsize(path), len(dfa.states), len(dfa.delta))
+
+
+def measure(name: str, n: int, directory: str):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', name, str(n), directory],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(out[0]), int(out[1]), int(out[2]), int(out[3]), int(out[4])
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in EXPORTERS:
+            runs = [measure(name, n, tmp) for _ in range(repeats)]
+            results[name] = (min(r[0] for r in runs), max(r[1] for r in runs)) + runs[0][2:]
+
+    _, _, _, n_states, n_trans = results['dom (SubElement)']
+    print(f"AFD: {n_states} estados, {n_trans} transiciones")
+    print(f"{'exportador':>20} {'tiempo':>10} {'pico RSS':>12} {'archivo':>12}")
+    for name, (dt, rss, size, _, _) in results.items():
+        print(f"{name:>20} {dt:>8.3f} s {rss / 1024:>8.1f} MiB {size / 2**20:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(*sys.argv[2:5])
+    else:
+        main()
@@ -0,0 +1,133 @@
+"""
+Benchmark del parser JFLAP: parser en streaming (iterparse) frente al
+parser anterior, que cargaba el documento entero con etree.parse y lo
+recorría con findall/findtext (se conserva aquí como referencia).
+Cada parser (y la generación del archivo) se ejecuta en un proceso nuevo
+para medir su pico de memoria (ru_maxrss) sin interferencias: en Linux el
+proceso hijo hereda el pico del padre. Se resta el RSS tras los imports.
+
+Uso: python benchmarks/bench_jff_parser.py [n_estados] [repeticiones]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Set, Tuple
+
+from _automata import random_nfa
+from lxml import etree
+from nfa_dfa.jflap_export import export_nfa_to_jff
+from nfa_dfa.nfa import NFA
+from parsers.jflap_parser import parse_nfa_from_jff
+
+
+def parse_nfa_from_jff_dom(path: str) -> NFA:
+    """Parser anterior (árbol completo en memoria), como línea base."""
+    try:
+        tree = etree.parse(path)
+    except (etree.XMLSyntaxError, OSError) as e:
+        raise ValueError(f"Error al abrir o parsear JFLAP file: {e}")
+
+    automaton = tree.getroot().find('.//automaton')
+    if automaton is None:
+        raise ValueError("No se encontró el elemento <automaton> en el JFLAP file")
+
+    states: Set[str] = set()
+    finals: Set[str] = set()
+    initial_state: str = None
+    state_id_map: Dict[str, str] = {}
+    for state in automaton.findall('state'):
+        sid = state.get('id')
+        name = state.get('name')
+        if sid is None or name is None:
+            raise ValueError(f"Estado mal formado: {etree.tostring(state)}")
+        state_id_map[sid] = name
+        states.add(name)
+        if state.find('initial') is not None:
+            if initial_state is not None:
+                raise ValueError("Múltiples estados iniciales detectados")
+            initial_state = name
+        if state.find('final') is not None:
+            finals.add(name)
+    if initial_state is None:
+        raise ValueError('No se encontró estado inicial en el JFLAP file')
+
+    delta: Dict[Tuple[str, str], Set[str]] = {}
+    sigma: Set[str] = set()
+    for trans in automaton.findall('transition'):
+        src_id = trans.findtext('from')
+        dst_id = trans.findtext('to')
+        sym = trans.findtext('read') or ''
+        if src_id not in state_id_map or dst_id not in state_id_map:
+            raise ValueError(f"Transición con referencia de estado desconocido: {src_id}->{dst_id}")
+        if sym:
+            sigma.add(sym)
+        delta.setdefault((state_id_map[src_id], sym), set()).add(state_id_map[dst_id])
+
+    return NFA(states=states, sigma=sigma, delta=delta, q0=initial_state, finals=finals)
+
+
+PARSERS = {
+    'dom (etree.parse)': parse_nfa_from_jff_dom,
+    'streaming (iterparse)': parse_nfa_from_jff,
+}
+
+
+def run_child(name: str, path: str):
+    """Modo hijo: parsea path una vez e imprime tiempo y pico de RSS (KiB)."""
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    nfa = PARSERS[name](path)
+    dt = time.perf_counter() - t0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(dt, peak - base, len(nfa.states), sum(map(len, nfa.delta.values())))
+
+
+def run_generate(n: str, path: str):
+    """Modo hijo: escribe en path un AFN aleatorio de n estados."""
+    export_nfa_to_jff(random_nfa(int(n), k=3), path)
+
+
+def _child(*args: str) -> str:
+    return subprocess.run(
+        [sys.executable, os.path.abspath(__file__), *args],
+        capture_output=True, text=True, check=True
+    ).stdout
+
+
+def measure(name: str, path: str):
+    out = _child('--child', name, path).split()
+    return float(out[0]), int(out[1]), int(out[2]), int(out[3])
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.jff')
+        _child('--generate', str(n), path)
+        size_mb = os.path.getsize(path) / 2**20
+
+        results = {}
+        for name in PARSERS:
+            runs = [measure(name, path) for _ in range(repeats)]
+            results[name] = (min(r[0] for r in runs), max(r[1] for r in runs)) + runs[0][2:]
+
+    _, _, n_states, n_trans = results['dom (etree.parse)']
+    assert all(r[2:] == (n_states, n_trans) for r in results.values())
+    print(f"{n_states} estados, {n_trans} transiciones, archivo de {size_mb:.1f} MiB")
+    print(f"{'parser':>24} {'tiempo':>10} {'pico RSS':>12}")
+    for name, (dt, rss, _, _) in results.items():
+        print(f"{name:>24} {dt:>8.3f} s {rss / 1024:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) > 1 and sys.argv[1] == '--generate':
+        run_generate(sys.argv[2], sys.argv[3])
+    else:
+        main()
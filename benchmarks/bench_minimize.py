@@ -0,0 +1,64 @@
+"""
+Benchmark de minimización: Hopcroft (nfa_dfa.minimize) frente a una
+implementación ingenua de Moore (refinamiento por firmas hasta punto fijo)
+sobre DFAs aleatorios y en cadena de 1k a 100k estados. En los aleatorios
+Moore converge en pocas rondas; en los de cadena necesita una ronda por
+estado (O(n²)), así que sólo se ejecuta hasta MOORE_CHAIN_LIMIT estados.
+
+Uso: python benchmarks/bench_minimize.py [tamaño ...]
+"""
+import sys
+import time
+
+from _automata import chain_dfa, random_dfa
+from nfa_dfa.minimize import minimize
+
+MOORE_CHAIN_LIMIT = 2_000
+
+
+def moore_block_count(dfa) -> int:
+    """Moore ingenuo: devuelve el número de clases de equivalencia alcanzables."""
+    symbols = sorted(dfa.sigma)
+    reachable = {dfa.q0}
+    pending = [dfa.q0]
+    while pending:
+        q = pending.pop()
+        for a in symbols:
+            t = dfa.delta[(q, a)]
+            if t not in reachable:
+                reachable.add(t)
+                pending.append(t)
+    cls = {q: int(q in dfa.finals) for q in reachable}
+    count = len(set(cls.values()))
+    while True:
+        signatures = {}
+        new_cls = {}
+        for q in reachable:
+            sig = (cls[q],) + tuple(cls[dfa.delta[(q, a)]] for a in symbols)
+            new_cls[q] = signatures.setdefault(sig, len(signatures))
+        if len(signatures) == count:
+            return count
+        cls, count = new_cls, len(signatures)
+
+
+def main():
+    sizes = [int(x) for x in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    print(f"{'familia':>9} {'estados':>8} {'mínimo':>8} {'Hopcroft (s)':>13} {'Moore (s)':>10}")
+    for family, build in (("aleatorio", lambda n: random_dfa(n, k=3, seed=n)), ("cadena", chain_dfa)):
+        for n in sizes:
+            dfa = build(n)
+            t0 = time.perf_counter()
+            minimal = minimize(dfa)
+            t_hop = time.perf_counter() - t0
+            if family == "cadena" and n > MOORE_CHAIN_LIMIT:
+                moore = "—"
+            else:
+                t0 = time.perf_counter()
+                blocks = moore_block_count(dfa)
+                moore = f"{time.perf_counter() - t0:.3f}"
+                assert blocks == len(minimal.states), (blocks, len(minimal.states))
+            print(f"{family:>9} {n:>8} {len(minimal.states):>8} {t_hop:>13.3f} {moore:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Benchmark de escalado de la construcción por subconjuntos en paralelo:
+convierte el mismo NFA con 1..N procesos y reporta tiempo y aceleración.
+Comprueba además que el AFD obtenido es idéntico al secuencial.
+
+Uso: python benchmarks/bench_parallel.py [max_jobs] [n] [width]
+"""
+import os
+import sys
+import time
+
+from _automata import wide_nth_from_end_nfa
+from nfa_dfa.step_engine import _subset_construction
+
+
+def main():
+    max_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+    width = int(sys.argv[3]) if len(sys.argv) > 3 else 40
+    nfa = wide_nth_from_end_nfa(n, width)
+    print(f"NFA: {len(nfa.states)} estados; núcleos disponibles: {os.cpu_count()}")
+    baseline = None
+    for jobs in range(1, max_jobs + 1):
+        t0 = time.perf_counter()
+        dfa, _ = _subset_construction(nfa, jobs=jobs)
+        dt = time.perf_counter() - t0
+        if baseline is None:
+            baseline = (dt, dfa)
+            print(f"AFD: {len(dfa.states)} estados")
+        else:
+            assert dfa.delta == baseline[1].delta
+        print(f"jobs={jobs:>2} {dt:>8.2f} s  x{baseline[0] / dt:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark del escáner por bloques (nfa_dfa.scanner): genera un archivo de
+líneas aleatorias, lo recorre con scan_lines() leyendo por mmap y reporta el
+rendimiento en MB/s y el pico de memoria residente (RSS) del proceso, que no
+debe crecer con el tamaño del archivo.
+
+Uso: python benchmarks/bench_scanner.py [MB]
+"""
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from _automata import nth_from_end_nfa
+from nfa_dfa.scanner import scan_lines
+from nfa_dfa.step_engine import convert_nfa_to_dfa
+
+
+def write_corpus(path: str, total_bytes: int, seed: int = 0) -> int:
+    rnd = random.Random(seed)
+    written = 0
+    with open(path, 'w', encoding='latin-1') as f:
+        while written < total_bytes:
+            lines = [''.join(rnd.choices('ab', k=rnd.randint(4, 60))) for _ in range(10_000)]
+            block = '\n'.join(lines) + '\n'
+            f.write(block)
+            written += len(block)
+    return written
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss está en KiB en Linux y en bytes en macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == 'darwin' else rss / 1024
+
+
+def main():
+    mb = float(sys.argv[1]) if len(sys.argv) > 1 else 50
+    dfa = convert_nfa_to_dfa(nth_from_end_nfa(8)).dfa
+    fd, path = tempfile.mkstemp(suffix='.log')
+    os.close(fd)
+    try:
+        size = write_corpus(path, int(mb * 1e6))
+        rss_before = peak_rss_mb()
+        t0 = time.perf_counter()
+        lines = accepted = 0
+        for _, _, _, ok in scan_lines(dfa, path):
+            lines += 1
+            accepted += ok
+        dt = time.perf_counter() - t0
+        print(f"archivo: {size / 1e6:.1f} MB, {lines} líneas, {accepted} aceptadas")
+        print(f"tiempo: {dt:.2f} s, {size / dt / 1e6:.2f} MB/s")
+        print(f"RSS pico: {rss_before:.1f} MB antes del escaneo, {peak_rss_mb():.1f} MB después")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark del arranque en frío de la GUI. Lanza procesos nuevos que:
+  1. importan gui.main_window bajo -X importtime y listan los módulos más
+     caros, avisando si se cargan en el arranque módulos que deberían ser
+     perezosos (lxml, QtWebEngine, el motor de conversión);
+  2. crean QApplication + MainWindow, la muestran y procesan eventos,
+     midiendo el tiempo total de proceso contra TARGET_SECONDS.
+Sin pantalla se usa la plataforma Qt "offscreen".
+
+Uso: python benchmarks/bench_startup.py [repeticiones] [top]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+# Objetivo de arranque en frío (proceso completo hasta la ventana visible)
+TARGET_SECONDS = 0.5
+
+# Módulos que no deben importarse hasta su primer uso
+LAZY_MODULES = ('lxml', 'PySide6.QtWebEngineWidgets', 'nfa_dfa.step_engine', 'parsers')
+
+STARTUP = """
+import sys
+from PySide6.QtWidgets import QApplication
+from gui.main_window import MainWindow
+app = QApplication(sys.argv)
+win = MainWindow()
+win.show()
+app.processEvents()
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = SRC + os.pathsep + env.get('PYTHONPATH', '')
+    if not env.get('DISPLAY') and not env.get('WAYLAND_DISPLAY'):
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return env
+
+
+def import_times():
+    """Devuelve [(módulo, self_us, cumulative_us)] de importar gui.main_window."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import gui.main_window'],
+        env=_env(), cwd=SRC, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def cold_start():
+    t0 = time.perf_counter()
+    subprocess.run(
+        [sys.executable, '-c', STARTUP], env=_env(), cwd=SRC, check=True,
+        stderr=subprocess.DEVNULL
+    )
+    return time.perf_counter() - t0
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    top = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+
+    rows = import_times()
+    total_us = sum(self_us for _, self_us, _ in rows)
+    print(f"import gui.main_window: {total_us / 1e6:.3f} s en {len(rows)} módulos")
+    for name, _, cumulative_us in sorted(rows, key=lambda r: -r[2])[:top]:
+        print(f"  {cumulative_us / 1e3:>9.1f} ms  {name}")
+    eager = [
+        name for name, _, _ in rows
+        if any(name == m or name.startswith(m + '.') for m in LAZY_MODULES)
+    ]
+    if eager:
+        print(f"⚠ módulos perezosos importados al arrancar: {', '.join(eager)}")
+
+    cold_start()  # calentar la caché de disco y los .pyc
+    times = [cold_start() for _ in range(repeat)]
+    median = statistics.median(times)
+    status = "OK" if median <= TARGET_SECONDS else "POR ENCIMA DEL OBJETIVO"
+    print(
+        f"arranque en frío: mediana {median:.3f} s, mínimo {min(times):.3f} s "
+        f"(objetivo {TARGET_SECONDS:.2f} s) → {status}"
+    )
+    return 0 if median <= TARGET_SECONDS else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,52 @@
+"""
+Compara las estrategias de convert_nfa_to_dfa: 'subset' (+ Hopcroft) frente a
+'brzozowski', reportando estados pico materializados, tamaño del AFD mínimo
+y tiempo. La familia "unión Σ*" tiene un AFD de subconjuntos exponencial pero
+un AFD mínimo de un solo estado, que es el caso en el que Brzozowski gana.
+
+Uso: python benchmarks/bench_strategies.py [n_max]
+"""
+import sys
+import time
+
+from _automata import nth_from_end_nfa, random_nfa
+from nfa_dfa.step_engine import convert_nfa_to_dfa
+
+
+def universal_union_nfa(n: int):
+    """(a|b)*a(a|b)^n ∪ (a|b)*: rama extra que acepta cualquier cadena."""
+    nfa = nth_from_end_nfa(n)
+    delta = dict(nfa.delta)
+    delta[("q0", "")] = {"todo"}
+    delta[("todo", "a")] = {"todo"}
+    delta[("todo", "b")] = {"todo"}
+    nfa.states = nfa.states | {"todo"}
+    nfa.finals = nfa.finals | {"todo"}
+    nfa.delta = delta
+    return nfa
+
+
+def measure(nfa, strategy):
+    t0 = time.perf_counter()
+    result = convert_nfa_to_dfa(nfa, minimal=True, strategy=strategy)
+    return result.peak_states, len(result.minimal_dfa.states), time.perf_counter() - t0
+
+
+def main():
+    n_max = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    families = (
+        ("n-ésimo desde el final", nth_from_end_nfa),
+        ("unión Σ*", universal_union_nfa),
+        ("aleatorio", lambda n: random_nfa(2 * n, k=2, density=1.2, eps=0.1, seed=n)),
+    )
+    print(f"{'familia':>22} {'n':>3} {'estrategia':>11} {'pico':>7} {'mínimo':>7} {'tiempo (s)':>11}")
+    for family, build in families:
+        for n in range(4, n_max + 1, 4):
+            nfa = build(n)
+            for strategy in ("subset", "brzozowski"):
+                peak, size, dt = measure(nfa, strategy)
+                print(f"{family:>22} {n:>3} {strategy:>11} {peak:>7} {size:>7} {dt:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
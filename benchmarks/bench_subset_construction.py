@@ -0,0 +1,28 @@
+"""
+Benchmark de la construcción por subconjuntos: mide el tiempo de
+convert_nfa_to_dfa frente al número de estados del AFD resultante.
+Con el worklist indexado el tiempo por estado debe mantenerse ~constante.
+
+Uso: python benchmarks/bench_subset_construction.py [n_max]
+"""
+import sys
+import time
+
+from _automata import nth_from_end_nfa
+from nfa_dfa.step_engine import convert_nfa_to_dfa
+
+
+def main():
+    n_max = int(sys.argv[1]) if len(sys.argv) > 1 else 14
+    print(f"{'n':>3} {'estados AFD':>12} {'tiempo (s)':>11} {'µs/estado':>10}")
+    for n in range(4, n_max + 1):
+        nfa = nth_from_end_nfa(n)
+        t0 = time.perf_counter()
+        result = convert_nfa_to_dfa(nfa)
+        dt = time.perf_counter() - t0
+        size = len(result.dfa.states)
+        print(f"{n:>3} {size:>12} {dt:>11.3f} {dt / size * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark de la poda de estados inútiles (nfa_dfa.trim):
+  - conversión con y sin prune de un AFN generado con una rama muerta:
+    (a|b)*a(a|b)^n unido por ε a (a|b)*b(a|b)^m sin finales. Con m > n
+    la rama muerta obliga al AFD a recordar los últimos m + 1 símbolos
+    (~2^(m+1) estados) en lugar de n + 1; podando el AFN antes sólo queda
+    la parte útil (2^(n+1));
+  - coste de trim_nfa y trim_dfa por sí solos sobre autómatas grandes.
+
+Uso: python benchmarks/bench_trim.py [n] [m] [n_estados_afn]
+"""
+import sys
+import time
+from typing import Dict, Set, Tuple
+
+from _automata import nth_from_end_nfa, random_nfa
+from nfa_dfa.nfa import NFA
+from nfa_dfa.step_engine import convert_nfa_to_dfa
+from nfa_dfa.trim import trim_dfa, trim_nfa
+
+
+def with_dead_branch(n: int, m: int) -> NFA:
+    """nth_from_end_nfa(n) más una rama (a|b)*b(a|b)^m de m + 2 estados que nunca llega a un final."""
+    useful = nth_from_end_nfa(n)
+    delta: Dict[Tuple[str, str], Set[str]] = dict(useful.delta)
+    delta[("s", "")] = {useful.q0, "d0"}
+    delta[("d0", "a")] = {"d0"}
+    delta[("d0", "b")] = {"d0", "d1"}
+    for i in range(1, m + 1):
+        delta[(f"d{i}", "a")] = {f"d{i + 1}"}
+        delta[(f"d{i}", "b")] = {f"d{i + 1}"}
+    states = useful.states | {"s"} | {f"d{i}" for i in range(m + 2)}
+    return NFA(states=states, sigma={"a", "b"}, delta=delta, q0="s", finals=set(useful.finals))
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - t0, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    m = int(sys.argv[2]) if len(sys.argv) > 2 else 13
+    n_nfa = int(sys.argv[3]) if len(sys.argv) > 3 else 100_000
+
+    nfa = with_dead_branch(n, m)
+    print(f"AFN: {len(nfa.states)} estados ({m + 2} en la rama muerta)")
+    print(f"{'':>16} {'tiempo':>10} {'AFD':>8} {'pico':>8} {'mínimo':>8}")
+    for label, prune in (("sin podar", False), ("prune=True", True)):
+        dt, result = timed(convert_nfa_to_dfa, nfa, minimal=True, prune=prune)
+        print(f"{label:>16} {dt:>8.3f} s {len(result.dfa.states):>8} "
+              f"{result.peak_states:>8} {len(result.minimal_dfa.states):>8}")
+        if prune:
+            assert all(result.dfa.accepts(w) == nfa.accepts(w) for w in ("a" * n, "ab" * n, "b" * n + "a" * (n + 1)))
+
+    big = random_nfa(n_nfa, k=3)
+    big.finals = {"q0"}
+    dt, trimmed = timed(trim_nfa, big)
+    print(f"trim_nfa: {n_nfa} → {len(trimmed.states)} estados en {dt:.3f} s")
+    dfa = convert_nfa_to_dfa(nth_from_end_nfa(16)).dfa
+    dfa.finals = set(list(dfa.finals)[:1])
+    dt, trimmed = timed(trim_dfa, dfa)
+    print(f"trim_dfa: {len(dfa.states)} → {len(trimmed.states)} estados, "
+          f"{len(dfa.delta)} transiciones, en {dt:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
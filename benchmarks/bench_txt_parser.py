@@ -0,0 +1,139 @@
+"""
+Benchmark del parser .txt: parser de una sola pasada frente al anterior
+(lista de líneas, re.split por fila y validación contra la lista de
+estados, O(|δ|·|Q|)), que se conserva aquí como referencia. Se miden los
+dos formatos, etiquetado y crudo. El parser anterior sólo se ejecuta
+hasta OLD_MAX_STATES estados: por encima tarda minutos.
+
+Uso: python benchmarks/bench_txt_parser.py [n_estados ...]
+"""
+import os
+import re
+import sys
+import tempfile
+import time
+from typing import Dict, List, Set, Tuple
+
+from _automata import random_nfa
+from nfa_dfa.nfa import NFA
+from parsers.txt_parser import parse_nfa_from_txt
+
+# Tamaño máximo con el que se ejecuta el parser anterior
+OLD_MAX_STATES = 10_000
+
+
+def parse_nfa_from_txt_old(path: str) -> NFA:
+    """Parser anterior, como línea base."""
+    def _parse_dests(tok: str) -> List[str]:
+        tok = tok.strip()
+        core = tok[1:-1] if tok.startswith('{') and tok.endswith('}') else tok
+        return [d.strip() for d in core.split(',') if d.strip()]
+
+    with open(path, encoding='utf-8') as f:
+        lines = [line.strip() for line in f if line.strip()]
+
+    delta: Dict[Tuple[str, str], Set[str]] = {}
+    states: List[str] = []
+    sigma: List[str] = []
+    q0: str = None
+    finals: Set[str] = set()
+
+    if any(line.lower().startswith('estados') for line in lines):
+        for line in lines:
+            low = line.lower()
+            if low.startswith('estados'):
+                parts = re.split(r'[:\s]+', line, maxsplit=1)[1]
+                states = [s.strip() for s in parts.split(',') if s.strip()]
+            elif low.startswith('alfabeto'):
+                sigma = [s.strip() for s in line.split(':', 1)[1].split(',') if s.strip()]
+            elif low.startswith('inicial'):
+                q0 = line.split(':', 1)[1].strip()
+            elif low.startswith('finales'):
+                finals = set(s.strip() for s in line.split(':', 1)[1].split(',') if s.strip())
+            elif low.startswith('transiciones'):
+                raw = lines[lines.index(line) + 1:]
+                break
+        else:
+            raise ValueError('Sección "Transiciones:" no encontrada')
+        rows = []
+        for row in raw:
+            if ':' in row:
+                src, rest = row.split(':', 1)
+                rows.append((src.strip(), rest))
+    else:
+        states = lines[0].split()
+        q0 = lines[1].strip()
+        finals = set(lines[2].split())
+        sigma = lines[3].split()
+        rows = list(zip(states, lines[4:]))
+
+    syms = sigma + ['']
+    for src, row in rows:
+        toks = re.split(r'\s+', row.strip())
+        toks = ['' if t in ('-', '–', '—') else t for t in toks]
+        for sym, tok in zip(syms, toks):
+            if tok:
+                for d in _parse_dests(tok):
+                    delta.setdefault((src, sym), set()).add(d)
+
+    if set(finals) - set(states):
+        raise ValueError('Estados finales desconocidos')
+    for (s, sym), dests in delta.items():
+        if s not in states:
+            raise ValueError(f'Transición desde estado desconocido: {s}')
+        for d in dests:
+            if d not in states:
+                raise ValueError(f'Transición hacia estado desconocido: {d}')
+    return NFA(states=set(states), sigma=set(sigma), delta=delta, q0=q0, finals=finals)
+
+
+def _cells(nfa: NFA, q: str, symbols: List[str]) -> str:
+    return ' '.join('{' + ','.join(sorted(nfa.delta[(q, a)])) + '}' if (q, a) in nfa.delta else '-'
+                    for a in symbols)
+
+
+def write_labeled(nfa: NFA, path: str):
+    states, symbols = sorted(nfa.states), sorted(nfa.sigma)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"Estados: {', '.join(states)}\n")
+        f.write(f"Alfabeto: {', '.join(symbols)}\n")
+        f.write(f"Inicial: {nfa.q0}\n")
+        f.write(f"Finales: {', '.join(sorted(nfa.finals))}\n")
+        f.write("Transiciones:\n")
+        f.writelines(f"{q}: {_cells(nfa, q, symbols + [''])}\n" for q in states)
+
+
+def write_raw(nfa: NFA, path: str):
+    states, symbols = sorted(nfa.states), sorted(nfa.sigma)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(' '.join(states) + '\n' + nfa.q0 + '\n')
+        f.write(' '.join(sorted(nfa.finals)) + '\n' + ' '.join(symbols) + '\n')
+        f.writelines(_cells(nfa, q, symbols + ['']) + '\n' for q in states)
+
+
+def timed(parse, path: str):
+    t0 = time.perf_counter()
+    nfa = parse(path)
+    return time.perf_counter() - t0, nfa
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [OLD_MAX_STATES, 100_000]
+    print(f"{'estados':>8} {'formato':>10} {'anterior':>10} {'una pasada':>12} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            nfa = random_nfa(n, k=3)
+            for fmt, write in (('etiquetado', write_labeled), ('crudo', write_raw)):
+                path = os.path.join(tmp, f'{fmt}-{n}.txt')
+                write(nfa, path)
+                t_new, parsed = timed(parse_nfa_from_txt, path)
+                assert parsed.delta == nfa.delta and parsed.finals == nfa.finals
+                if n <= OLD_MAX_STATES:
+                    t_old, _ = timed(parse_nfa_from_txt_old, path)
+                    print(f"{n:>8} {fmt:>10} {t_old:>8.3f} s {t_new:>10.3f} s {t_old / t_new:>7.1f}x")
+                else:
+                    print(f"{n:>8} {fmt:>10} {'-':>10} {t_new:>10.3f} s {'':>8}")
+
+
+if __name__ == "__main__":
+    main()
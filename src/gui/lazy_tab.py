@@ -0,0 +1,64 @@
+"""
+Pestañas que se construyen la primera vez que se muestran. LazyTab ocupa el
+lugar del widget en el QTabWidget; hasta que se construye, las llamadas a
+sus setters (set_*) se guardan y se reproducen sobre el widget real,
+clear() simplemente las descarta y refresh_*() se ignora (el widget, al
+construirse, ya parte del estado actual de lo que le pasaron los setters).
+"""
+from importlib import import_module
+from typing import Any, Callable, List, Tuple
+
+from PySide6.QtWidgets import QTabWidget, QVBoxLayout, QWidget
+
+
+class LazyTab(QWidget):
+    def __init__(self, module: str, class_name: str, parent=None):
+        super().__init__(parent)
+        self._module = module
+        self._class_name = class_name
+        self._widget = None
+        self._pending: List[Tuple[str, tuple, dict]] = []
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+
+    @property
+    def is_built(self) -> bool:
+        return self._widget is not None
+
+    def widget(self) -> QWidget:
+        """Construye el widget real si aún no existe y lo devuelve."""
+        if self._widget is None:
+            cls = getattr(import_module(self._module), self._class_name)
+            self._widget = cls(parent=self)
+            self._layout.addWidget(self._widget)
+            pending, self._pending = self._pending, []
+            for name, args, kwargs in pending:
+                getattr(self._widget, name)(*args, **kwargs)
+        return self._widget
+
+    def _defer(self, name: str) -> Callable[..., None]:
+        def call(*args: Any, **kwargs: Any):
+            if self._widget is not None:
+                getattr(self._widget, name)(*args, **kwargs)
+            elif name == 'clear':
+                self._pending.clear()
+            elif not name.startswith('refresh'):
+                self._pending.append((name, args, kwargs))
+        return call
+
+    def __getattr__(self, name: str):
+        # Sólo llega aquí lo que no es atributo del propio QWidget
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if self._widget is None and (name.startswith(('set_', 'refresh')) or name == 'clear'):
+            return self._defer(name)
+        return getattr(self.widget(), name)
+
+
+def build_on_show(tabs: QTabWidget):
+    """Conecta tabs para construir cada LazyTab cuando pasa a ser la actual."""
+    def on_current_changed(index: int):
+        page = tabs.widget(index)
+        if isinstance(page, LazyTab):
+            page.widget()
+    tabs.currentChanged.connect(on_current_changed)
@@ -1,5 +1,7 @@
 # src/gui/main_window.py
 
+import os
+
 from PySide6.QtWidgets import (
     QMainWindow, QToolBar, QTabWidget, QMessageBox, QFileDialog,
     QStatusBar, QWidget, QSizePolicy, QStyle
@@ -7,20 +9,63 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QIcon, QAction
 from PySide6.QtCore import QSize, Qt
 
-from parsers.txt_parser import parse_nfa_from_txt
-from parsers.jflap_parser import parse_nfa_from_jff
-from nfa_dfa.step_engine import convert_nfa_to_dfa
-from nfa_dfa.jflap_export import export_nfa_to_jff, export_dfa_to_jff
-
+# El motor de conversión, los parsers, la exportación (lxml) y las pestañas
+# que no se ven al arrancar se importan en su primer uso: así la ventana se
+# muestra cuanto antes.
+from gui.lazy_tab import LazyTab, build_on_show
+from gui.workers import Worker
 from gui.widgets.nfa_info_widget import NFAInfoWidget
-from gui.widgets.epsilon_closure_widget import EpsilonClosureWidget
-from gui.widgets.subset_construction_widget import SubsetConstructionWidget
-from gui.widgets.dfa_info_widget import DFAInfoWidget
-from gui.widgets.report_widget import ReportWidget
-from gui.widgets.theory_widget import TheoryWidget
 from gui.widgets.log_widget import LogWidget
 
 
+def _load_nfa(path: str):
+    """Parsea el AFN y calcula sus clausuras ε (se ejecuta en un Worker)."""
+    if path.lower().endswith(".txt"):
+        from parsers.txt_parser import parse_nfa_from_txt
+        nfa = parse_nfa_from_txt(path)
+    elif path.lower().endswith(".afb"):
+        from nfa_dfa.binary import load
+        from nfa_dfa.nfa import NFA
+        nfa = load(path)
+        if not isinstance(nfa, NFA):
+            raise ValueError("El archivo .afb no contiene un AFN")
+    else:
+        from parsers.jflap_parser import parse_nfa_from_jff
+        nfa = parse_nfa_from_jff(path)
+    return nfa, nfa.epsilon_closures()
+
+
+def _remove_trace(path: str):
+    """Borra la traza de una conversión que no llegó a aplicarse."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _convert(nfa, trace_path: str, cache=None, progress=None, cancelled=None, partial=None):
+    """
+    Convierte el AFN volcando los pasos a trace_path (se ejecuta en un
+    Worker); las pestañas los recorren desde disco en lugar de guardarlos
+    en memoria. Si se indica partial, además recibe los pasos por lotes
+    según se producen. Con cache (ConversionCache) un AFN ya convertido se
+    carga de disco junto con su traza; devuelve (resultado, CacheLookup).
+    """
+    from nfa_dfa.cache import cached_convert
+    from nfa_dfa.trace import BatchTrace
+
+    if partial is None:
+        return cached_convert(
+            cache, nfa, minimal=True, trace_path=trace_path,
+            progress=progress, cancelled=cancelled
+        )
+    with BatchTrace(partial) as batch:
+        return cached_convert(
+            cache, nfa, minimal=True, trace_path=trace_path, trace=batch,
+            progress=progress, cancelled=cancelled
+        )
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -36,7 +81,7 @@ class MainWindow(QMainWindow):
         # Cargar AFN
         icon_open = style.standardIcon(QStyle.SP_DialogOpenButton)
         self.open_action = QAction(icon_open, "Cargar AFN", self)
-        self.open_action.setToolTip("Elige un archivo .txt o .jff de tu AFN")
+        self.open_action.setToolTip("Elige un archivo .txt, .jff o .afb de tu AFN")
         self.open_action.triggered.connect(self.on_load)
         toolbar.addAction(self.open_action)
 
@@ -48,6 +93,14 @@ class MainWindow(QMainWindow):
         self.convert_action.triggered.connect(self.on_convert)
         toolbar.addAction(self.convert_action)
 
+        # Cancelar la operación en curso
+        icon_stop = style.standardIcon(QStyle.SP_BrowserStop)
+        self.cancel_action = QAction(icon_stop, "Cancelar", self)
+        self.cancel_action.setEnabled(False)
+        self.cancel_action.setToolTip("Detiene la carga o conversión en curso")
+        self.cancel_action.triggered.connect(self.on_cancel)
+        toolbar.addAction(self.cancel_action)
+
         toolbar.addSeparator()
 
         clear_icon = style.standardIcon(QStyle.SP_TrashIcon)
@@ -82,12 +135,15 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
 
+        # Sólo AFN (la pestaña inicial) y Log se crean ya; el resto se
+        # construye al seleccionarla por primera vez
+        widgets = "gui.widgets."
         self.nfa_tab = NFAInfoWidget(parent=self)
-        self.closure_tab = EpsilonClosureWidget(parent=self)
-        self.subset_tab = SubsetConstructionWidget(parent=self)
-        self.dfa_tab = DFAInfoWidget(parent=self)
-        self.rep_tab = ReportWidget(parent=self)
-        self.theory_tab = TheoryWidget(parent=self)
+        self.closure_tab = LazyTab(widgets + "epsilon_closure_widget", "EpsilonClosureWidget", parent=self)
+        self.subset_tab = LazyTab(widgets + "subset_construction_widget", "SubsetConstructionWidget", parent=self)
+        self.dfa_tab = LazyTab(widgets + "dfa_info_widget", "DFAInfoWidget", parent=self)
+        self.rep_tab = LazyTab(widgets + "report_widget", "ReportWidget", parent=self)
+        self.theory_tab = LazyTab(widgets + "theory_widget", "TheoryWidget", parent=self)
         self.log_tab = LogWidget(parent=self)
 
         for widget, title in [
@@ -100,6 +156,7 @@ class MainWindow(QMainWindow):
             (self.log_tab, "Log"),
         ]:
             self.tabs.addTab(widget, title)
+        build_on_show(self.tabs)
 
         # ── Barra de estado ────────────────────────────────────────────────
         status = QStatusBar()
@@ -110,31 +167,90 @@ class MainWindow(QMainWindow):
         self.current_nfa = None
         self.current_dfa = None
         self.result = None
+        self.trace = None
+        self.steps = None
+        self._trace_dir = None
+        self._trace_count = 0
+        self._cache = None
+        self._worker = None
+
+    def _start(self, worker: Worker, on_finished, on_failed, status: str, on_partial=None):
+        """
+        Lanza worker en el pool; sus señales sólo se aplican si sigue siendo
+        la operación actual (una cancelada puede terminar más tarde).
+        """
+        def current(handler):
+            def slot(*args):
+                if worker is self._worker:
+                    self._worker = None
+                    self._set_busy(False)
+                    handler(*args)
+            return slot
+
+        worker.signals.finished.connect(current(on_finished))
+        worker.signals.failed.connect(current(on_failed))
+        worker.signals.cancelled.connect(current(self._on_cancelled))
+        worker.signals.progress.connect(
+            lambda p: worker is self._worker and self._on_progress(p)
+        )
+        if on_partial is not None:
+            worker.signals.partial.connect(
+                lambda batch: worker is self._worker and on_partial(batch)
+            )
+        self._worker = worker
+        self._set_busy(True)
+        self.statusBar().showMessage(status)
+        worker.start()
+
+    def _set_busy(self, busy: bool):
+        self.cancel_action.setEnabled(busy)
+        self.open_action.setEnabled(not busy)
+        self.convert_action.setEnabled(not busy and self.current_nfa is not None)
+
+    def _on_progress(self, progress):
+        self.statusBar().showMessage(
+            f"Convirtiendo… {progress.states} estados descubiertos, "
+            f"frontera {progress.frontier}, {progress.elapsed:.1f} s"
+        )
+
+    def _on_cancelled(self):
+        self.subset_tab.clear()
+        self.log_tab.log("⏹ Operación cancelada")
+        self.statusBar().showMessage("Operación cancelada", 5000)
+
+    def on_cancel(self):
+        """Pide la cancelación de la carga o conversión en curso."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self.cancel_action.setEnabled(False)
+            self.statusBar().showMessage("Cancelando…")
 
     def on_load(self):
         self.on_clear()
         path, _ = QFileDialog.getOpenFileName(
-            self, "Abrir AFN", filter="Text Files (*.txt);;JFLAP Files (*.jff)"
+            self, "Abrir AFN", filter="Text Files (*.txt);;JFLAP Files (*.jff *.jff.gz);;Binary Files (*.afb)"
         )
         self.log_tab.log(f"Dialogo abrió: {path or '<ningún archivo>'}")
         if not path:
             return
 
-        try:
-            if path.lower().endswith(".txt"):
-                self.current_nfa = parse_nfa_from_txt(path)
-            else:
-                self.current_nfa = parse_nfa_from_jff(path)
-        except Exception as ex:
-            QMessageBox.critical(self, "Error al cargar AFN", str(ex))
-            self.log_tab.log(f"❌ Error parseando {path}: {ex}")
-            return
+        self._start(
+            Worker(_load_nfa, path),
+            lambda loaded: self._apply_nfa(path, *loaded),
+            lambda msg: self._on_load_failed(path, msg),
+            f"Cargando {path}…"
+        )
+
+    def _on_load_failed(self, path: str, message: str):
+        QMessageBox.critical(self, "Error al cargar AFN", message)
+        self.log_tab.log(f"❌ Error parseando {path}: {message}")
 
+    def _apply_nfa(self, path: str, nfa, closures):
+        self.current_nfa = nfa
         self.log_tab.log(f"✅ AFN cargado: {path}")
         self.nfa_tab.set_nfa(self.current_nfa)
 
         # También preparo la tabla de clausuras
-        closures = self.current_nfa.epsilon_closures()
         self.closure_tab.set_closures(closures)
 
         self.convert_action.setEnabled(True)
@@ -143,44 +259,112 @@ class MainWindow(QMainWindow):
         self.tabs.setCurrentWidget(self.nfa_tab)
 
     def on_convert(self):
-        try:
-            # 1. Ejecutar la conversión
-            self.result = convert_nfa_to_dfa(self.current_nfa, step_by_step=True)
-        except Exception as ex:
-            QMessageBox.critical(self, "Error al convertir a AFD", str(ex))
-            self.log_tab.log(f"❌ Error convirtiendo AFN→AFD: {ex}")
-            return
+        from nfa_dfa.trace import StepIndex
+
+        # La conversión corre en el pool; cada una escribe su propia traza
+        # para no pisar la de una conversión cancelada que aún no terminó.
+        # Los pasos llegan por lotes a la pestaña de construcción, que los
+        # muestra con ids provisionales (S0, S1, …) hasta tener el AFD.
+        trace_path = self._trace_path()
+        self.steps = StepIndex()
+        self.subset_tab.set_store(
+            self.steps, sorted(self.current_nfa.sigma), label=lambda q: f"S{q}"
+        )
+        worker = Worker(
+            _convert, self.current_nfa, trace_path, self._conversion_cache(),
+            with_progress=True, with_partial=True
+        )
+        # Si falla o se cancela (también si ya no es la actual), su traza sobra
+        worker.signals.failed.connect(lambda _: _remove_trace(trace_path))
+        worker.signals.cancelled.connect(lambda: _remove_trace(trace_path))
+        self._start(
+            worker,
+            lambda outcome: self._apply_result(*outcome, trace_path),
+            self._on_convert_failed,
+            "Convirtiendo AFN→AFD…",
+            on_partial=self._on_steps
+        )
 
-        self.current_dfa = self.result.dfa
-        self.log_tab.log("✅ Conversión AFN→AFD completada")
+    def _on_steps(self, batch):
+        self.steps.extend(batch)
+        self.subset_tab.refresh_rows()
+
+    def _on_convert_failed(self, message: str):
+        QMessageBox.critical(self, "Error al convertir a AFD", message)
+        self.log_tab.log(f"❌ Error convirtiendo AFN→AFD: {message}")
+
+    def _conversion_cache(self):
+        """Caché de conversiones en disco (se crea en la primera conversión)."""
+        if self._cache is None:
+            from nfa_dfa.cache import ConversionCache
+            self._cache = ConversionCache()
+        return self._cache
+
+    def _log_cache(self, lookup):
+        cache = self._cache
+        if lookup.hit:
+            self.log_tab.log(f"♻️ AFD cargado de la caché: {lookup.seconds:.2f} s de conversión ahorrados")
+        else:
+            self.log_tab.log(f"💾 AFD guardado en la caché (conversión: {lookup.seconds:.2f} s)")
+        self.log_tab.log(
+            f"   Caché: {cache.hits} aciertos, {cache.misses} fallos, "
+            f"{cache.saved_seconds:.2f} s ahorrados en esta sesión"
+        )
 
-        sigma = sorted(self.current_nfa.sigma)
-        self.subset_tab.set_steps(
-            steps=self.result.steps,
-            sigma=sigma,
-            finals=self.current_dfa.finals
+    def _apply_result(self, result, lookup, trace_path: str):
+        from nfa_dfa.trace import TraceReader
+
+        self.result = result
+        self._discard_trace()
+        self.trace = TraceReader(trace_path)
+        if lookup is not None:
+            self._log_cache(lookup)
+            if lookup.hit:
+                # No hubo pasos parciales: la tabla se llena desde la traza
+                self.steps.extend(self.trace)
+        self.current_dfa = self.result.dfa
+        n_states = len(self.current_dfa.states)
+        n_minimal = len(self.result.minimal_dfa.states)
+        self.log_tab.log(
+            f"✅ Conversión AFN→AFD completada: {n_states} estados "
+            f"({n_minimal} en el AFD mínimo)"
         )
 
-        self.dfa_tab.set_dfa(self.current_dfa)
+        self.subset_tab.set_labels(self.current_dfa.finals, self.current_dfa.label)
 
-        self.rep_tab.set_steps(self.result.steps, self.current_nfa)
+        self.dfa_tab.set_dfa(self.current_dfa, minimal_states=n_minimal)
 
-        self.rep_tab.set_details(self.current_dfa)
+        self.rep_tab.set_steps(self.trace, self.current_nfa, self.current_dfa)
 
-        self.dfa_tab.set_dfa(self.current_dfa)
+        self.rep_tab.set_details(self.current_dfa)
 
         self.exp_dfa_action.setEnabled(True)
         self.statusBar().showMessage("AFD listo para revisión y exportación")
         self.tabs.setCurrentWidget(self.dfa_tab)
 
+    def _discard_trace(self):
+        """Cierra la traza del resultado actual y borra su archivo."""
+        if self.trace is not None:
+            self.trace.close(remove=True)
+            self.trace = None
+
+    def _trace_path(self) -> str:
+        """Ruta de la traza de pasos, en un directorio temporal propio de la ventana."""
+        if self._trace_dir is None:
+            import tempfile
+            self._trace_dir = tempfile.TemporaryDirectory(prefix="nfa_dfa_")
+        self._trace_count += 1
+        return os.path.join(self._trace_dir.name, f"steps-{self._trace_count}.ndjson")
+
     def on_export_nfa(self):
         """Exporta el AFN cargado a .jff y confirma al usuario."""
         path, _ = QFileDialog.getSaveFileName(
-            self, "Guardar AFN (.jff)", filter="JFLAP Files (*.jff)"
+            self, "Guardar AFN (.jff)", filter="JFLAP Files (*.jff);;JFLAP gzip (*.jff.gz)"
         )
         if not path:
             return
         try:
+            from nfa_dfa.jflap_export import export_nfa_to_jff
             export_nfa_to_jff(self.current_nfa, path)
 
             QMessageBox.information(
@@ -202,11 +386,12 @@ class MainWindow(QMainWindow):
     def on_export_dfa(self):
         """Exporta el AFD generado a .jff y confirma al usuario."""
         path, _ = QFileDialog.getSaveFileName(
-            self, "Guardar AFD (.jff)", filter="JFLAP Files (*.jff)"
+            self, "Guardar AFD (.jff)", filter="JFLAP Files (*.jff);;JFLAP gzip (*.jff.gz)"
         )
         if not path:
             return
         try:
+            from nfa_dfa.jflap_export import export_dfa_to_jff
             export_dfa_to_jff(self.current_dfa, path)
             QMessageBox.information(
                 self,
@@ -226,10 +411,17 @@ class MainWindow(QMainWindow):
 
     def on_clear(self):
 
+        # Descartar la operación en curso, si la hay
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+            self._set_busy(False)
+
         # Reset datos internos
         self.current_nfa = None
         self.current_dfa = None
         self.result = None
+        self.steps = None
 
         # Deshabilitar botones
         self.convert_action.setEnabled(False)
@@ -243,6 +435,7 @@ class MainWindow(QMainWindow):
         self.dfa_tab.clear()
         self.rep_tab.clear()
         self.log_tab.clear()
+        self._discard_trace()
         self.statusBar().showMessage("Estado limpio. Carga un nuevo AFN para comenzar.")
 
         self.tabs.setCurrentWidget(self.nfa_tab)
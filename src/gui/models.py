@@ -0,0 +1,155 @@
+"""
+Modelos de tabla para las pestañas. En lugar de crear un QTableWidgetItem por
+celda, cada modelo guarda sólo una referencia a los datos (delta del AFD,
+clausuras, pasos…) y genera el texto de una celda cuando la vista la pinta,
+así que la memoria no crece con el número de celdas visibles.
+
+Las vistas se configuran con filas de altura fija (la vista no tiene que
+medir cada fila) y con anchos de columna calculados sobre una muestra de
+filas en lugar de resizeColumnsToContents(), que recorre todo el modelo.
+"""
+from typing import Callable, Iterable, List, Sequence
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide6.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+
+# Filas que se miden para ajustar el ancho de las columnas
+SIZE_SAMPLE_ROWS = 100
+# Ancho máximo de una columna ajustada automáticamente (px)
+MAX_COLUMN_WIDTH = 480
+# Elementos que se muestran en línea en etiquetas (Q′, F′, δ′…); el resto
+# queda en la tabla correspondiente
+MAX_INLINE_ITEMS = 200
+
+TABLE_STYLE = """
+    QTableView {
+        gridline-color: #444444;
+        background-color: #1e1e1e;
+        color: #ffffff;
+    }
+    QHeaderView::section {
+        background-color: #2c2c2c;
+        color: #ffffff;
+        padding: 4px;
+        border: 1px solid #555555;
+    }
+"""
+
+CellFn = Callable[[int, int], str]
+
+
+class TableModel(QAbstractTableModel):
+    """
+    Modelo de sólo lectura: headers, un número de filas y una función
+    cell(fila, columna) -> texto que se evalúa bajo demanda. Sirve también
+    para listas (QListView muestra la columna 0).
+    """
+
+    def __init__(self, parent=None, alignment=Qt.AlignCenter):
+        super().__init__(parent)
+        self._alignment = int(alignment)
+        self._headers: List[str] = []
+        self._rows = 0
+        self._cell: CellFn = lambda row, col: ""
+
+    def reset(self, headers: Sequence[str], rows: int, cell: CellFn):
+        """Sustituye el contenido completo del modelo."""
+        self.beginResetModel()
+        self._headers = list(headers)
+        self._rows = rows
+        self._cell = cell
+        self.endResetModel()
+
+    def clear(self):
+        self.reset([], 0, lambda row, col: "")
+
+    def append_rows(self, count: int):
+        """Añade count filas al final; cell ya debe saber responder por ellas."""
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._rows, self._rows + count - 1)
+        self._rows += count
+        self.endInsertRows()
+
+    def refresh_rows(self, first: int, last: int):
+        """Avisa de que han cambiado las celdas de las filas first..last."""
+        if first <= last:
+            self.dataChanged.emit(
+                self.index(first, 0), self.index(last, len(self._headers) - 1)
+            )
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self._cell(index.row(), index.column())
+        if role == Qt.TextAlignmentRole:
+            return self._alignment
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._headers[section] if section < len(self._headers) else None
+        return None
+
+
+def make_table_view(model: TableModel, parent=None) -> QTableView:
+    """Crea una QTableView con el estilo de la aplicación y filas de altura fija."""
+    view = QTableView(parent)
+    view.setModel(model)
+    view.setShowGrid(True)
+    view.setGridStyle(Qt.SolidLine)
+    view.setAlternatingRowColors(True)
+    view.setStyleSheet(TABLE_STYLE)
+    view.setSelectionBehavior(QAbstractItemView.SelectRows)
+    view.setWordWrap(False)
+    view.verticalHeader().setVisible(False)
+    rows = view.verticalHeader()
+    rows.setSectionResizeMode(QHeaderView.Fixed)
+    rows.setDefaultSectionSize(view.fontMetrics().height() + 8)
+    view.horizontalHeader().setStretchLastSection(True)
+    return view
+
+
+def fit_columns(view: QTableView, sample: int = SIZE_SAMPLE_ROWS):
+    """
+    Ajusta el ancho de cada columna a su cabecera y a una muestra de filas
+    repartida por todo el modelo (primeras, últimas y equiespaciadas).
+    """
+    model = view.model()
+    rows = model.rowCount()
+    if rows <= sample:
+        sampled = range(rows)
+    else:
+        step = rows / sample
+        sampled = sorted({int(i * step) for i in range(sample)} | {rows - 1})
+    metrics = view.fontMetrics()
+    header_metrics = view.horizontalHeader().fontMetrics()
+    padding = 24
+    for col in range(model.columnCount()):
+        header = model.headerData(col, Qt.Horizontal) or ""
+        width = header_metrics.horizontalAdvance(str(header))
+        for row in sampled:
+            text = model.data(model.index(row, col))
+            if text:
+                width = max(width, metrics.horizontalAdvance(text))
+        view.setColumnWidth(col, min(width + padding, MAX_COLUMN_WIDTH))
+
+
+def abbreviate(items: Iterable[str], total: int, sep: str) -> str:
+    """Une como mucho MAX_INLINE_ITEMS elementos e indica cuántos se omiten."""
+    shown: List[str] = []
+    for item in items:
+        if len(shown) == MAX_INLINE_ITEMS:
+            break
+        shown.append(item)
+    text = sep.join(shown)
+    if total > len(shown):
+        text += f"{sep}… ({total - len(shown)} más, ver tabla)"
+    return text
@@ -1,8 +1,9 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QGroupBox, QFormLayout,
-    QLabel, QTableWidget, QTableWidgetItem, QSizePolicy
+    QLabel, QSizePolicy
 )
 from PySide6.QtCore    import Qt
+from gui.models import TableModel, abbreviate, fit_columns, make_table_view
 
 class DFAInfoWidget(QWidget):
     def __init__(self, parent=None):
@@ -21,7 +22,8 @@ class DFAInfoWidget(QWidget):
         self.delta_lbl = QLabel(); self.delta_lbl.setTextInteractionFlags(Qt.TextSelectableByMouse)
         self.q0_lbl    = QLabel(); self.q0_lbl.setTextInteractionFlags(Qt.TextSelectableByMouse)
         self.F_lbl     = QLabel(); self.F_lbl.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        for lbl in (self.Q_lbl, self.Sigma_lbl, self.delta_lbl, self.q0_lbl, self.F_lbl):
+        self.size_lbl  = QLabel(); self.size_lbl.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        for lbl in (self.Q_lbl, self.Sigma_lbl, self.delta_lbl, self.q0_lbl, self.F_lbl, self.size_lbl):
             lbl.setWordWrap(True)
 
         form.addRow("<b>Q′:</b>",  self.Q_lbl)
@@ -29,83 +31,63 @@ class DFAInfoWidget(QWidget):
         form.addRow("<b>δ′:</b>",  self.delta_lbl)
         form.addRow("<b>q₀′:</b>", self.q0_lbl)
         form.addRow("<b>F′:</b>",  self.F_lbl)
+        form.addRow("<b>|Q′|:</b>", self.size_lbl)
 
         main_layout.addWidget(quint_group, stretch=0)
 
         # ── Tabla de δ′ ───────────────────────────────────────────────
-        self.table = QTableWidget()
-        self.table.setShowGrid(True)
-        self.table.setGridStyle(Qt.SolidLine)
-        self.table.setAlternatingRowColors(True)
-        self.table.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #444444;
-                background-color: #1e1e1e;
-                color: #ffffff;
-            }
-            QHeaderView::section {
-                background-color: #2c2c2c;
-                color: #ffffff;
-                padding: 4px;
-                border: 1px solid #555555;
-            }
-        """)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.verticalHeader().setVisible(False)
-        self.table.horizontalHeader().setStretchLastSection(True)
+        self.model = TableModel(self)
+        self.table = make_table_view(self.model)
 
         main_layout.addWidget(self.table, stretch=1)
 
-    def set_dfa(self, dfa):
+    def set_dfa(self, dfa, minimal_states=None):
+        """
+        Muestra el AFD. minimal_states, si se indica, es el número de estados
+        del AFD mínimo equivalente y se muestra junto al tamaño actual.
+        """
         states = sorted(dfa.states)
-        name_map = {s: f"S{i}" for i, s in enumerate(states)}
-
-        Qp     = ", ".join(name_map[s] for s in states)
-        Sigma  = ", ".join(sorted(dfa.sigma))
-        q0p    = name_map[dfa.q0]
-        Fp     = ", ".join(name_map[s] for s in states if s in dfa.finals)
-
-        lines = []
-        for (src, sym), dest in sorted(dfa.delta.items(), key=lambda kv: (kv[0][0], kv[0][1])):
-            src_lbl = name_map[src]
-            sym_lbl = sym if sym else "ε"
-            if not dest:
-                tgt_lbl = "∅"
-            else:
-                tgt_lbl = name_map.get(dest, dest)
-            lines.append(f"δ′({src_lbl}, {sym_lbl}) = &#123;{tgt_lbl}&#125;")
+        symbols = sorted(dfa.sigma)
+        # Los estados se muestran como S0, S1, … según su posición
+        position = {s: i for i, s in enumerate(states)}
+
+        def name(state) -> str:
+            return f"S{position[state]}"
+
+        def target(state, sym) -> str:
+            dest = dfa.delta.get((state, sym))
+            if dest is None:
+                return "∅"
+            return name(dest) if dest in position else str(dest)
+
+        Qp     = abbreviate((name(s) for s in states), len(states), ", ")
+        Sigma  = ", ".join(symbols)
+        q0p    = name(dfa.q0)
+        Fp     = abbreviate((name(s) for s in states if s in dfa.finals), len(dfa.finals), ", ")
+
+        transitions = (
+            f"δ′({name(src)}, {sym if sym else 'ε'}) = &#123;{target(src, sym)}&#125;"
+            for src in states for sym in symbols if (src, sym) in dfa.delta
+        )
 
         self.Q_lbl.setText(f"{{{Qp}}}")
         self.Sigma_lbl.setText(f"{{{Sigma}}}")
-        self.delta_lbl.setText("<br>".join(lines))
+        self.delta_lbl.setText(abbreviate(transitions, len(dfa.delta), "<br>"))
         self.q0_lbl.setText(q0p)
         self.F_lbl.setText(f"{{{Fp}}}")
+        size = f"{len(states)} estados"
+        if minimal_states is not None:
+            size += f" (mínimo: {minimal_states})"
+        self.size_lbl.setText(size)
 
-        headers = ["Estado"] + sorted(dfa.sigma)
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        self.table.setRowCount(len(states))
-
-        for i, state in enumerate(states):
-            it0 = QTableWidgetItem(name_map[state])
-            it0.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 0, it0)
-
-            for j, sym in enumerate(sorted(dfa.sigma), start=1):
-                dest = dfa.delta.get((state, sym), "")
-                if not dest:
-                    text = "∅"
-                else:
-                    text = name_map.get(dest, dest)
-                cell = QTableWidgetItem(text)
-                cell.setTextAlignment(Qt.AlignCenter)
-                self.table.setItem(i, j, cell)
+        def cell(row: int, col: int) -> str:
+            state = states[row]
+            return name(state) if col == 0 else target(state, symbols[col - 1])
 
-        self.table.resizeColumnsToContents()
+        self.model.reset(["Estado"] + symbols, len(states), cell)
+        fit_columns(self.table)
 
     def clear(self):
-        for lbl in (self.Q_lbl, self.Sigma_lbl, self.delta_lbl, self.q0_lbl, self.F_lbl):
+        for lbl in (self.Q_lbl, self.Sigma_lbl, self.delta_lbl, self.q0_lbl, self.F_lbl, self.size_lbl):
             lbl.clear()
-        self.table.clearContents()
-        self.table.setRowCount(0)
-        self.table.setColumnCount(0)
+        self.model.clear()
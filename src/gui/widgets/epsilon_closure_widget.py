@@ -1,9 +1,8 @@
-from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem
-)
-from PySide6.QtCore    import Qt
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
 from typing import Dict, Set
 
+from gui.models import TableModel, fit_columns, make_table_view
+
 class EpsilonClosureWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -11,30 +10,9 @@ class EpsilonClosureWidget(QWidget):
         lay.addWidget(QLabel("<h2>2. Cálculo de clausuras ε</h2>"))
 
         # Tabla de ε-closures
-        self.table = QTableWidget()
-        self.table.setColumnCount(2)
-        self.table.setHorizontalHeaderLabels(["Estado", "ε-closure({Estado})"])
-
-        self.table.setShowGrid(True)
-        self.table.setGridStyle(Qt.SolidLine)
-        self.table.setAlternatingRowColors(True)
-        self.table.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #444444;
-                background-color: #1e1e1e;
-                color: #ffffff;
-            }
-            QHeaderView::section {
-                background-color: #2c2c2c;
-                color: #ffffff;
-                padding: 4px;
-                border: 1px solid #555555;
-            }
-        """)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.verticalHeader().setVisible(False)
-        self.table.horizontalHeader().setStretchLastSection(True)
-        # ───────────────────────────────────────────────────────────────
+        self.model = TableModel(self)
+        self.model.reset(["Estado", "ε-closure({Estado})"], 0, lambda row, col: "")
+        self.table = make_table_view(self.model)
 
         lay.addWidget(self.table)
 
@@ -42,23 +20,17 @@ class EpsilonClosureWidget(QWidget):
         """
         closures: mapeo estado -> conjunto de estados en su ε-closure
         """
-        items = sorted(closures.items(), key=lambda x: x[0])
-        self.table.setRowCount(len(items))
-        for i, (state, clset) in enumerate(items):
-            # Columna Estado
-            item_state = QTableWidgetItem(state)
-            item_state.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 0, item_state)
+        states = sorted(closures)
 
-            # Columna ε-closure
-            text = "{ " + ", ".join(sorted(clset)) + " }"
-            item_cl = QTableWidgetItem(text)
-            item_cl.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, 1, item_cl)
+        def cell(row: int, col: int) -> str:
+            state = states[row]
+            if col == 0:
+                return state
+            return "{ " + ", ".join(sorted(closures[state])) + " }"
 
-        self.table.resizeColumnsToContents()
+        self.model.reset(["Estado", "ε-closure({Estado})"], len(states), cell)
+        fit_columns(self.table)
 
     def clear(self):
         """Borra todas las filas de la tabla, dejando intactas las columnas."""
-        self.table.clearContents()
-        self.table.setRowCount(0)
+        self.model.reset(["Estado", "ε-closure({Estado})"], 0, lambda row, col: "")
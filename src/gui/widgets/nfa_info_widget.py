@@ -1,9 +1,11 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QGroupBox, QFormLayout,
-    QLabel, QTableWidget, QTableWidgetItem, QSizePolicy
+    QLabel, QSizePolicy
 )
 from PySide6.QtCore    import Qt
 
+from gui.models import TableModel, fit_columns, make_table_view
+
 class NFAInfoWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -35,26 +37,8 @@ class NFAInfoWidget(QWidget):
         main_layout.addWidget(quint_group, stretch=0)
 
         # ── Tabla de transiciones δ ────────────────────────────────────
-        self.table = QTableWidget()
-        self.table.setShowGrid(True)
-        self.table.setGridStyle(Qt.SolidLine)
-        self.table.setAlternatingRowColors(True)
-        self.table.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #444444;
-                background-color: #1e1e1e;
-                color: #ffffff;
-            }
-            QHeaderView::section {
-                background-color: #2c2c2c;
-                color: #ffffff;
-                padding: 4px;
-                border: 1px solid #555555;
-            }
-        """)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.verticalHeader().setVisible(False)
-        self.table.horizontalHeader().setStretchLastSection(True)
+        self.model = TableModel(self)
+        self.table = make_table_view(self.model)
 
         main_layout.addWidget(self.table, stretch=1)
 
@@ -76,31 +60,19 @@ class NFAInfoWidget(QWidget):
         self.q0_lbl.setText(q0)
         self.F_lbl.setText("{" + ", ".join(F) + "}")
 
-        headers = ["Estado"] + Σ + ["ε"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        self.table.setRowCount(len(Q))
-
-        for i, state in enumerate(Q):
-            self.table.setItem(i, 0, QTableWidgetItem(state))
-            for j, sym in enumerate(Σ, start=1):
-                dests = nfa.delta.get((state, sym), set())
-                text = ", ".join(sorted(dests)) if dests else "∅"
-                item = QTableWidgetItem(text)
-                item.setTextAlignment(Qt.AlignCenter)
-                self.table.setItem(i, j, item)
+        symbols = Σ + [""]
 
-            edests = nfa.delta.get((state, ""), set())
-            text = ", ".join(sorted(edests)) if edests else "∅"
-            item = QTableWidgetItem(text)
-            item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(i, len(headers)-1, item)
+        def cell(row: int, col: int) -> str:
+            state = Q[row]
+            if col == 0:
+                return state
+            dests = nfa.delta.get((state, symbols[col - 1]))
+            return ", ".join(sorted(dests)) if dests else "∅"
 
-        self.table.resizeColumnsToContents()
+        self.model.reset(["Estado"] + Σ + ["ε"], len(Q), cell)
+        fit_columns(self.table)
 
     def clear(self):
         for lbl in (self.Q_lbl, self.Sigma_lbl, self.delta_lbl, self.q0_lbl, self.F_lbl):
             lbl.clear()
-        self.table.clearContents()
-        self.table.setRowCount(0)
-        self.table.setColumnCount(0)
+        self.model.clear()
@@ -1,10 +1,14 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QGroupBox, QLabel,
-    QTableWidget, QTableWidgetItem, QFormLayout, QTextEdit
+    QFormLayout
 )
 from PySide6.QtCore    import Qt
-from typing             import List, Tuple
+from typing             import Sequence, Tuple
 from nfa_dfa.nfa        import NFA
+from nfa_dfa.dfa        import DFA
+from gui.models         import TableModel, abbreviate, fit_columns, make_table_view
+
+STEP_HEADERS = ["Origen", "Símbolo", "Mover", "ε-cierre"]
 
 class ReportWidget(QWidget):
     def __init__(self, parent=None):
@@ -14,12 +18,9 @@ class ReportWidget(QWidget):
 
         grp_steps = QGroupBox("Pasos del algoritmo de subconjuntos")
         lay_steps = QVBoxLayout(grp_steps)
-        self.steps_table = QTableWidget()
-        self.steps_table.setColumnCount(4)
-        self.steps_table.setHorizontalHeaderLabels(
-            ["Origen", "Símbolo", "Mover", "ε-cierre"]
-        )
-        self._style_table(self.steps_table)
+        self.steps_model = TableModel(self)
+        self.steps_model.reset(STEP_HEADERS, 0, lambda row, col: "")
+        self.steps_table = make_table_view(self.steps_model)
         lay_steps.addWidget(self.steps_table)
         main.addWidget(grp_steps)
 
@@ -35,93 +36,88 @@ class ReportWidget(QWidget):
         form.addRow("Estado inicial:", self.initial_lbl)
         form.addRow("Estados finales:", self.finals_lbl)
 
-        self.delta_list = QTextEdit()
-        self.delta_list.setReadOnly(True)
-        self.delta_list.setStyleSheet("""
-            QTextEdit {
-                background-color: #1e1e1e;
-                color: #ffffff;
-                border: 1px solid #444444;
-                padding: 4px;
-            }
-        """)
+        # Listado de δ′ virtualizado: una línea por transición, generada al
+        # pintarla. Es una tabla de una columna sin cabecera porque QTableView,
+        # con filas de altura fija, no recorre todas las filas al mostrarse
+        # (QListView sí)
+        self.delta_model = TableModel(self, alignment=Qt.AlignLeft | Qt.AlignVCenter)
+        self.delta_list = make_table_view(self.delta_model)
+        self.delta_list.horizontalHeader().setVisible(False)
+        self.delta_list.setShowGrid(False)
+        self.delta_list.setAlternatingRowColors(False)
         form.addRow("Transiciones δ′:", self.delta_list)
 
         main.addWidget(grp_det)
 
-    def _style_table(self, tbl: QTableWidget):
-        tbl.setShowGrid(True)
-        tbl.setGridStyle(Qt.SolidLine)
-        tbl.setAlternatingRowColors(True)
-        tbl.verticalHeader().setVisible(False)
-        tbl.horizontalHeader().setStretchLastSection(True)
-        tbl.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #444444;
-                background-color: #1e1e1e;
-                color: #ffffff;
-            }
-            QHeaderView::section {
-                background-color: #2c2c2c;
-                color: #ffffff;
-                padding: 4px;
-                border: 1px solid #555555;
-            }
-        """)
-
-    def set_steps(self, steps: List[Tuple[str,str,str]], nfa: NFA):
+    def set_steps(self, steps: Sequence[Tuple], nfa: NFA, dfa: DFA):
         """
-        Rellena la tabla de pasos:
-          steps: lista de tuplas (origen_str, símbolo, cierre_str),
-                 donde cierre_str es la representación sin llaves de ε-cierre.
-          nfa: para calcular mover(p, símbolo).
+        Rellena la tabla de pasos; cada fila se calcula al pintarla:
+          steps: StepEvent (origen, símbolo, destino, mover) con los ids de
+                 estado del AFD y mover como bitmask del NFA, con acceso por
+                 índice: una lista o una traza en disco (TraceReader).
+          nfa: para nombrar los estados de mover (y calcularlo si el paso
+               no lo trae; si tampoco se conocen los miembros del origen,
+               como en Brzozowski, se muestra "—").
+          dfa: para obtener los miembros y nombres de cada estado.
         """
-        rows = []
-        for origen_str, sym, cierre_str in steps:
-            origen_set = set(origen_str.split(','))
-            mover = set()
-            for p in origen_set:
-                mover |= nfa.delta.get((p, sym), set())
-            mover_txt  = "{" + ",".join(sorted(mover)) + "}" if mover else "∅"
-            cierre_txt = "{" + cierre_str + "}"         if cierre_str else "∅"
-            rows.append((
-                "{" + origen_str + "}",
-                sym or "ε",
-                mover_txt,
-                cierre_txt
-            ))
-
-        self.steps_table.clearContents()
-        self.steps_table.setRowCount(len(rows))
-        for i, cols in enumerate(rows):
-            for j, txt in enumerate(cols):
-                it = QTableWidgetItem(txt)
-                it.setTextAlignment(Qt.AlignCenter)
-                self.steps_table.setItem(i, j, it)
-        self.steps_table.resizeColumnsToContents()
-
-    def set_details(self, dfa):
+        compiled = nfa.compile()
+
+        def braces(lbl: str) -> str:
+            return "{" + lbl + "}" if lbl != "∅" else "∅"
+
+        def mover_text(origen, sym, move) -> str:
+            if move is not None:
+                members = compiled.members(move)
+            elif dfa.subsets is None or dfa.nfa_states is None:
+                return "—"
+            else:
+                mover = set()
+                for p in dfa.members(origen):
+                    mover |= nfa.delta.get((p, sym), set())
+                members = sorted(mover)
+            return "{" + ",".join(members) + "}" if members else "∅"
+
+        def cell(row: int, col: int) -> str:
+            step = steps[row]
+            origen, sym, cierre = step[0], step[1], step[2]
+            if col == 0:
+                return braces(dfa.label(origen))
+            if col == 1:
+                return sym or "ε"
+            if col == 2:
+                return mover_text(origen, sym, step[3] if len(step) > 3 else None)
+            return braces(dfa.label(cierre))
+
+        self.steps_model.reset(STEP_HEADERS, len(steps), cell)
+        fit_columns(self.steps_table)
+
+    def set_details(self, dfa: DFA):
         """
         Muestra:
          - Estado inicial (q0)
          - Estados finales (F)
-         - Listado completo de δ′ en formato δ′(s,a) = {destinos}
+         - Listado completo de δ′ en formato δ′(s,a) = {destino}, una línea
+           por (estado, símbolo) generada al mostrarla
         """
         # Inicial y finales
-        self.initial_lbl.setText(dfa.q0)
-        finals = sorted(dfa.finals)
-        self.finals_lbl.setText("{" + ", ".join(finals) + "}")
+        self.initial_lbl.setText(dfa.label(dfa.q0))
+        finals = (dfa.label(q) for q in sorted(dfa.finals))
+        self.finals_lbl.setText("{" + abbreviate(finals, len(dfa.finals), ", ") + "}")
+
+        states = sorted(dfa.states)
+        symbols = sorted(dfa.sigma)
+        k = len(symbols)
+
+        def line(row: int, col: int) -> str:
+            s, sym = states[row // k], symbols[row % k]
+            dest = dfa.delta.get((s, sym))
+            tgt = dfa.label(dest) if dest is not None else "∅"
+            return f"δ′({dfa.label(s)}, {sym or 'ε'}) = {{{tgt}}}"
 
-        lines = []
-        for (s, sym), dests in sorted(dfa.delta.items()):
-            symbol = sym if sym else "ε"
-            tgt    = ", ".join(sorted(dests)) if dests else "∅"
-            lines.append(f"δ′({s}, {symbol}) = &#123;{tgt}&#125;")
-        self.delta_list.setHtml("<br>".join(lines))
+        self.delta_model.reset([""], len(states) * k, line)
 
     def clear(self):
-        self.steps_table.clearContents()
-        self.steps_table.setRowCount(0)
+        self.steps_model.reset(STEP_HEADERS, 0, lambda row, col: "")
         self.initial_lbl.clear()
         self.finals_lbl.clear()
-        self.delta_list.clear()
+        self.delta_model.clear()
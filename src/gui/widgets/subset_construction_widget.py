@@ -1,8 +1,8 @@
-from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem
-)
-from PySide6.QtCore    import Qt
-from typing import List, Tuple, Set
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from typing import Callable, Hashable, Iterable, List, Optional, Tuple, Set
+
+from nfa_dfa.trace import StepIndex
+from gui.models import TableModel, fit_columns, make_table_view
 
 class SubsetConstructionWidget(QWidget):
     def __init__(self, parent=None):
@@ -22,72 +22,82 @@ class SubsetConstructionWidget(QWidget):
         intro.setWordWrap(True)
         layout.addWidget(intro)
 
-        self.table = QTableWidget()
-        self.table.setShowGrid(True)
-        self.table.setGridStyle(Qt.SolidLine)
-        self.table.setAlternatingRowColors(True)
-        self.table.setStyleSheet("""
-            QTableWidget {
-                gridline-color: #444444;
-                background-color: #1e1e1e;
-                color: #ffffff;
-            }
-            QHeaderView::section {
-                background-color: #2c2c2c;
-                color: #ffffff;
-                padding: 4px;
-                border: 1px solid #555555;
-            }
-        """)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.verticalHeader().setVisible(False)
-        self.table.horizontalHeader().setStretchLastSection(True)
-        # ────────────────────────────────────────────────────────────────
+        self.model = TableModel(self)
+        self.table = make_table_view(self.model)
+        self._store: Optional[StepIndex] = None
 
         layout.addWidget(self.table)
 
     def set_steps(
         self,
-        steps: List[Tuple[str, str, str]],
+        steps: Iterable[Tuple[Hashable, str, Hashable]],
         sigma: List[str],
-        finals: Set[str]
+        finals: Set[Hashable],
+        label: Callable[[Hashable], str] = str
     ):
         """
         Llena la tabla con los pasos de la construcción.
-        - steps: lista de (estado_origen, símbolo, estado_destino)
+        - steps: pasos (estado_origen, símbolo, estado_destino); basta con
+          un iterable (p. ej. un TraceReader), se recorre una sola vez
         - sigma: lista de símbolos del alfabeto (sin ε)
         - finals: conjunto de estados finales en el AFD
+        - label: nombre para mostrar de cada estado (p. ej. DFA.label)
         """
-        origins: List[str] = []
-        for origin, symbol, dest in steps:
-            if origin not in origins:
-                origins.append(origin)
-
-        headers = ["Estado"] + sigma + ["¿Final?"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-
-        self.table.setRowCount(len(origins))
+        self.set_store(StepIndex(steps), sigma, finals, label)
 
-        for row_idx, origin in enumerate(origins):
+    def set_store(
+        self,
+        store: StepIndex,
+        sigma: List[str],
+        finals: Optional[Set[Hashable]] = None,
+        label: Callable[[Hashable], str] = str
+    ):
+        """
+        Muestra los pasos de store, que puede seguir creciendo: tras
+        ampliarlo basta con llamar a refresh_rows(). finals=None deja la
+        columna ¿Final? vacía hasta set_labels() (p. ej. mientras la
+        conversión está en curso).
+        """
+        self._store = store
+        self._sigma = sigma
+        self._finals = finals
+        self._label = label
 
-            self.table.setItem(row_idx, 0, QTableWidgetItem(origin))
+        def cell(row: int, col: int) -> str:
+            origin = store.origins[row]
+            if col == 0:
+                return self._label(origin)
+            if col > len(sigma):
+                if self._finals is None:
+                    return ""
+                return "Sí" if origin in self._finals else "No"
+            d = store.dest(origin, sigma[col - 1])
+            return self._label(d) if d is not None else ""
 
-            for col_idx, sym in enumerate(sigma, start=1):
-                dest = ""
-                for o, a, d in steps:
-                    if o == origin and a == sym:
-                        dest = d
-                        break
-                self.table.setItem(row_idx, col_idx, QTableWidgetItem(dest))
+        self.model.reset(["Estado"] + sigma + ["¿Final?"], len(store.origins), cell)
+        fit_columns(self.table)
 
-            is_final = "Sí" if origin in finals else "No"
-            self.table.setItem(row_idx, len(headers) - 1, QTableWidgetItem(is_final))
+    def refresh_rows(self):
+        """
+        Añade al final las filas de los orígenes nuevos del store y repinta
+        la última fila ya mostrada, cuyos destinos pueden haber llegado ahora.
+        """
+        if self._store is None:
+            return
+        shown = self.model.rowCount()
+        self.model.refresh_rows(max(shown - 1, 0), shown - 1)
+        self.model.append_rows(len(self._store.origins) - shown)
+        if shown == 0:
+            fit_columns(self.table)
 
-        self.table.resizeColumnsToContents()
+    def set_labels(self, finals: Set[Hashable], label: Callable[[Hashable], str]):
+        """Fija los estados finales y los nombres definitivos y repinta la tabla."""
+        self._finals = finals
+        self._label = label
+        self.refresh_rows()
+        self.model.refresh_rows(0, self.model.rowCount() - 1)
+        fit_columns(self.table)
 
     def clear(self):
-
-        self.table.clear()
-        self.table.setRowCount(0)
-        self.table.setColumnCount(0)
+        self._store = None
+        self.model.clear()
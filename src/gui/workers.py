@@ -0,0 +1,70 @@
+"""
+Ejecución en segundo plano para la GUI. Worker envuelve una función en un
+QRunnable del QThreadPool global; su resultado, error o cancelación llegan
+como señales que Qt entrega en el hilo principal, donde se aplican a la
+interfaz. La cancelación es cooperativa: la función recibe cancelled() y
+progress(...) si se crea con with_progress=True, y partial(...) para ir
+entregando resultados parciales si se crea con with_partial=True.
+"""
+import threading
+from typing import Any, Callable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class WorkerSignals(QObject):
+    progress = Signal(object)   # lo que la función pase a progress(...)
+    partial = Signal(object)    # lo que la función pase a partial(...)
+    finished = Signal(object)   # valor devuelto por la función
+    failed = Signal(str)        # mensaje de la excepción
+    cancelled = Signal()
+
+
+class Worker(QRunnable):
+    def __init__(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        with_progress: bool = False,
+        with_partial: bool = False,
+        **kwargs
+    ):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = WorkerSignals()
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._cancel = threading.Event()
+        if with_progress:
+            self._kwargs['progress'] = self.signals.progress.emit
+            self._kwargs['cancelled'] = self._cancel.is_set
+        if with_partial:
+            self._kwargs['partial'] = self.signals.partial.emit
+
+    def cancel(self):
+        """Pide a la función que se detenga en su próxima comprobación."""
+        self._cancel.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
+
+    def run(self):
+        # Tras pedir la cancelación, cualquier salida (ConversionCancelled
+        # incluida) cuenta como cancelada
+        try:
+            result = self._fn(*self._args, **self._kwargs)
+        except Exception as ex:
+            if self._cancel.is_set():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.failed.emit(str(ex))
+        else:
+            if self._cancel.is_set():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
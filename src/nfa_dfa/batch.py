@@ -0,0 +1,96 @@
+"""
+Aceptación por lotes con NumPy: avanza miles de palabras a la vez sobre la
+tabla compilada de un DFA, con una indexación vectorizada por posición.
+Este módulo es el único que requiere NumPy (pip install numpy).
+"""
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
+
+from .compiled import CompiledDFA
+from .dfa import DFA
+
+
+def _compiled(dfa) -> CompiledDFA:
+    return dfa.compile() if isinstance(dfa, DFA) else dfa
+
+
+def transition_matrix(dfa) -> np.ndarray:
+    """
+    Tabla de transiciones como matriz (estados + 1) × (símbolos + 1) de
+    índices de estado. La última fila es el estado muerto y la última columna
+    el símbolo "desconocido", que siempre lleva al estado muerto.
+    """
+    compiled = _compiled(dfa)
+    n_rows = compiled.dead + 1
+    table = np.frombuffer(compiled.table, dtype=np.int64).reshape(n_rows, compiled.stride)
+    table = table[:, :len(compiled.symbols)] // compiled.stride
+    unknown = np.full((n_rows, 1), compiled.dead, dtype=np.int64)
+    return np.ascontiguousarray(np.hstack([table, unknown]), dtype=np.int32)
+
+
+def encode(dfa, words: Sequence[Iterable[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Codifica words como matriz de símbolos rellenada con ceros (uint8 si el
+    alfabeto cabe, si no uint16) más el vector de longitudes. Los símbolos
+    fuera de sigma se codifican con el índice "desconocido".
+    """
+    compiled = _compiled(dfa)
+    unknown = len(compiled.symbols)
+    dtype = np.uint8 if unknown < 256 else np.uint16
+    lengths = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))
+    width = int(lengths.max()) if len(words) else 0
+    symbols = np.zeros((len(words), width), dtype=dtype)
+    if all(isinstance(w, str) for w in words) and all(len(a) == 1 for a in compiled.symbols):
+        # Camino rápido: todas las palabras como un único vector de code points,
+        # traducido con una tabla de búsqueda y repartido por filas.
+        codes = np.frombuffer(''.join(words).encode('utf-32-le'), dtype=np.uint32)
+        top = max((ord(a) for a in compiled.symbols), default=0) + 1
+        lut = np.full(top + 1, unknown, dtype=dtype)
+        for a, i in compiled.sym_index.items():
+            lut[ord(a)] = i
+        values = lut[np.minimum(codes, top)]
+        rows = np.repeat(np.arange(len(words)), lengths)
+        starts = np.cumsum(lengths) - lengths
+        cols = np.arange(len(codes)) - np.repeat(starts, lengths)
+        symbols[rows, cols] = values
+    else:
+        sym_index = compiled.sym_index
+        for i, word in enumerate(words):
+            symbols[i, :lengths[i]] = [sym_index.get(c, unknown) for c in word]
+    return symbols, lengths
+
+
+def accepts_batch(dfa, symbols: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Devuelve un vector booleano con la aceptación de cada fila de symbols
+    (matriz de índices de símbolo, ver encode), donde lengths[i] es la
+    longitud real de la fila i. Las filas se ordenan por longitud descendente
+    para que en la posición j las palabras activas (lengths > j) sean un
+    prefijo; así cada paso es una sola indexación sobre ese prefijo.
+    """
+    compiled = _compiled(dfa)
+    table = transition_matrix(compiled)
+    lengths = np.asarray(lengths)
+    order = np.argsort(-lengths, kind='stable')
+    symbols = symbols[order]
+    sorted_lengths = lengths[order]
+
+    states = np.full(len(order), compiled.start // compiled.stride, dtype=np.int32)
+    # active[j] = número de palabras con longitud > j
+    active = np.searchsorted(-sorted_lengths, -np.arange(symbols.shape[1]), side='left')
+    for j, n_active in enumerate(active):
+        if n_active == 0:
+            break
+        states[:n_active] = table[states[:n_active], symbols[:n_active, j]]
+
+    accepting = np.frombuffer(compiled.accepting, dtype=np.uint8).astype(bool)
+    result = np.empty(len(order), dtype=bool)
+    result[order] = accepting[states]
+    return result
+
+
+def accepts_words(dfa, words: Sequence[Iterable[str]]) -> np.ndarray:
+    """Atajo: encode() + accepts_batch() para una lista de palabras."""
+    symbols, lengths = encode(dfa, words)
+    return accepts_batch(dfa, symbols, lengths)
@@ -0,0 +1,431 @@
+"""
+Formato binario versionado para NFA y DFA (extensión .afb), pensado para no
+volver a parsear texto/XML en cada ejecución.
+
+Estructura (little-endian, cada sección alineada a 8 bytes):
+
+    cabecera   magic "AFB\\0", versión, tipo (NFA/DFA), flags, nº de estados,
+               nº de símbolos, índice de q₀, nº de transiciones
+    secciones  tabla de (offset, longitud en bytes) de SECTIONS, en ese orden
+
+    symbols     símbolos de sigma (ordenados), UTF-8 terminados en \\0
+    names       nombres de estado, ídem (sólo si los estados son cadenas)
+    ids         u64 por estado: estados enteros de un DFA (falta si son 0..n-1)
+    state_flags u8 por estado: FINAL | DECLARED (pertenece a Q)
+    indptr      u64 × (estados + 1): transiciones de i en [indptr[i], indptr[i+1])
+    syms        u32 por transición: índice de símbolo (nº de símbolos = ε)
+    targets     u32 por transición: índice del estado destino
+    nfa_states  tabla lateral de los AFD de subconjuntos: nombres del NFA
+    subsets     ídem: un bitmask de ancho fijo por estado del AFD
+
+Con load()/BinaryAutomaton los arrays se leen con mmap y se exponen como
+memoryviews sobre el archivo, sin copiarlos: varios procesos que abren el
+mismo archivo comparten esas páginas de sólo lectura.
+"""
+import gc
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence as SequenceABC
+from contextlib import contextmanager
+from itertools import chain, compress, repeat
+from operator import le, sub
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from .compiled import CompiledDFA
+from .dfa import DFA
+from .nfa import NFA
+
+SUFFIX = '.afb'
+MAGIC = b'AFB\0'
+VERSION = 1
+
+KIND_NFA = 0
+KIND_DFA = 1
+
+# flags de cabecera
+HAS_NAMES = 1
+HAS_SUBSETS = 2
+HAS_IDS = 4
+
+# state_flags
+FINAL = 1
+DECLARED = 2
+
+SECTIONS = ('symbols', 'names', 'ids', 'state_flags', 'indptr', 'syms', 'targets', 'nfa_states', 'subsets')
+
+_HEADER = struct.Struct('<4sHBBIIIQ')
+_SECTION = struct.Struct('<QQ')
+_ALIGN = 8
+
+Automaton = Union[NFA, DFA]
+
+
+def _pack_strings(items: Sequence[str]) -> bytes:
+    return ''.join(s + '\0' for s in items).encode('utf-8')
+
+
+def _unpack_strings(data) -> List[str]:
+    return str(data, 'utf-8').split('\0')[:-1]
+
+
+def _le(values: array) -> bytes:
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _csr(rows: Sequence[Sequence[Tuple[int, int]]]) -> Tuple[array, array, array]:
+    """(indptr, syms, targets) a partir de las transiciones de cada estado."""
+    indptr = array('Q', [0])
+    syms = array('I')
+    targets = array('I')
+    for row in rows:
+        row = sorted(row)
+        syms.extend(a for a, _ in row)
+        targets.extend(t for _, t in row)
+        indptr.append(len(syms))
+    return indptr, syms, targets
+
+
+def _state_order(dfa: DFA, labels: bool) -> Tuple[list, Optional[List[str]]]:
+    """
+    Orden de los estados del DFA y sus nombres: None si son enteros (los
+    que generan la conversión y la minimización), los propios nombres si
+    son cadenas, o dfa.label(q) con labels=True.
+    """
+    known = set(dfa.states) | {dfa.q0}
+    known.update(t for t in dfa.delta.values() if t is not None)
+    order = sorted(known)
+    if labels:
+        names = [dfa.label(q) for q in order]
+        if len(set(names)) != len(names):
+            raise ValueError("Los nombres para mostrar de los estados no son únicos")
+        return order, names
+    if all(type(q) is int and q >= 0 for q in order):
+        return order, None
+    if all(isinstance(q, str) for q in order):
+        return order, order
+    raise TypeError("Los estados del DFA no son enteros ni cadenas: usa labels=True")
+
+
+def save(automaton: Automaton, path: str, labels: bool = False) -> None:
+    """
+    Guarda un NFA o un DFA en formato binario. Para un DFA, labels=True
+    guarda como nombre de cada estado su nombre para mostrar (dfa.label) en
+    lugar de su identidad; al cargarlo los estados serán esas cadenas.
+    """
+    if isinstance(automaton, NFA):
+        kind = KIND_NFA
+        nfa = automaton
+        known = set(nfa.states) | {nfa.q0}
+        for (q, _), dests in nfa.delta.items():
+            known.add(q)
+            known.update(dests)
+        order = names = sorted(known)
+    else:
+        kind = KIND_DFA
+        order, names = _state_order(automaton, labels)
+
+    symbols = sorted(automaton.sigma)
+    sym_index: Dict[str, int] = {a: i for i, a in enumerate(symbols)}
+    if kind == KIND_NFA:
+        sym_index[''] = len(symbols)
+    index = {q: i for i, q in enumerate(order)}
+
+    rows: List[List[Tuple[int, int]]] = [[] for _ in order]
+    for (q, a), dests in automaton.delta.items():
+        if a not in sym_index:
+            raise ValueError(f"Símbolo fuera del alfabeto en δ: {a!r}")
+        if kind == KIND_DFA:
+            if dests is None:
+                continue
+            dests = (dests,)
+        row = rows[index[q]]
+        j = sym_index[a]
+        row.extend((j, index[t]) for t in dests)
+    indptr, syms, targets = _csr(rows)
+
+    flags = bytearray(len(order))
+    for q in automaton.states:
+        flags[index[q]] |= DECLARED
+    for q in automaton.finals:
+        if q in index:
+            flags[index[q]] |= FINAL
+
+    header_flags = 0
+    sections = dict.fromkeys(SECTIONS, b'')
+    sections['symbols'] = _pack_strings(symbols)
+    sections['state_flags'] = bytes(flags)
+    sections['indptr'] = _le(indptr)
+    sections['syms'] = _le(syms)
+    sections['targets'] = _le(targets)
+    if names is not None:
+        header_flags |= HAS_NAMES
+        sections['names'] = _pack_strings(names)
+    elif kind == KIND_DFA and order != list(range(len(order))):
+        header_flags |= HAS_IDS
+        sections['ids'] = _le(array('Q', order))
+    if kind == KIND_DFA and names is None and automaton.subsets is not None and automaton.nfa_states is not None:
+        header_flags |= HAS_SUBSETS
+        width = (len(automaton.nfa_states) + 7) // 8
+        sections['nfa_states'] = _pack_strings(automaton.nfa_states)
+        sections['subsets'] = b''.join(automaton.subsets[q].to_bytes(width, 'little') for q in order)
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, kind, header_flags,
+        len(order), len(symbols), index[automaton.q0], len(syms)
+    )
+    offset = len(header) + _SECTION.size * len(SECTIONS)
+    table = []
+    for name in SECTIONS:
+        offset += -offset % _ALIGN
+        table.append(_SECTION.pack(offset, len(sections[name])))
+        offset += len(sections[name])
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.writelines(table)
+        for name in SECTIONS:
+            f.write(b'\0' * (-f.tell() % _ALIGN))
+            f.write(sections[name])
+
+
+class PackedSubsets(SequenceABC):
+    """
+    Tabla lateral DFA.subsets cargada de un .afb: guarda los bitmasks como
+    bytes de ancho fijo y los decodifica al consultarlos, en lugar de crear
+    un entero por estado al cargar. Se indexa por estado como una lista.
+    """
+
+    def __init__(self, data: bytes, width: int, ids: Optional[List[int]] = None):
+        self._data = data
+        self._width = width
+        self._position = None if ids is None else {q: i for i, q in enumerate(ids)}
+
+    def __len__(self) -> int:
+        return len(self._data) // self._width if self._width else 0
+
+    def __getitem__(self, q: int) -> int:
+        i = q if self._position is None else self._position[q]
+        if not 0 <= i < len(self):
+            raise IndexError(q)
+        w = self._width
+        return int.from_bytes(self._data[i * w:(i + 1) * w], 'little')
+
+
+class BinaryAutomaton:
+    """
+    Vista de sólo lectura de un archivo .afb. Con use_mmap=True (por
+    defecto) el archivo se mapea en memoria y indptr, syms, targets,
+    state_flags y subsets son memoryviews sobre el mapa, sin copia.
+    Hay que cerrarlo (close() o with) después de soltar esas vistas.
+    Atributos:
+        kind:        KIND_NFA o KIND_DFA.
+        version:     versión del formato del archivo.
+        n_states:    número de estados (filas de indptr).
+        q0:          índice del estado inicial.
+        symbols:     lista de símbolos (índice -> símbolo).
+        names:       nombres de estado (índice -> nombre) o None si los
+                     estados del DFA son enteros.
+        ids:         estados enteros del DFA (índice -> estado) o None si
+                     son 0..n-1 o tienen nombre.
+        nfa_states:  tabla lateral del DFA (o None).
+    """
+
+    def __init__(self, path: str, use_mmap: bool = True):
+        self._views: List[memoryview] = []
+        self._mmap = None
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size + _SECTION.size * len(SECTIONS):
+                raise ValueError(f"{path}: no es un archivo {SUFFIX}")
+            if use_mmap:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                data = self._mmap
+            else:
+                data = f.read()
+        try:
+            self._parse(path, data, size)
+        except BaseException:
+            self.close()
+            raise
+
+    def _parse(self, path: str, data, size: int):
+        self._buffer = self._view(memoryview(data))
+        magic, version, kind, flags, n_states, n_symbols, q0, n_trans = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: no es un archivo {SUFFIX}")
+        if version > VERSION:
+            raise ValueError(f"{path}: versión {version} del formato no soportada (máx. {VERSION})")
+        self.version = version
+        self.kind = kind
+        self.n_states = n_states
+        self.q0 = q0
+
+        sections = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = _SECTION.unpack_from(data, _HEADER.size + i * _SECTION.size)
+            if offset + length > size:
+                raise ValueError(f"{path}: archivo {SUFFIX} truncado")
+            sections[name] = self._view(self._buffer[offset:offset + length])
+
+        self.symbols: List[str] = _unpack_strings(sections['symbols'])
+        self.names: Optional[List[str]] = _unpack_strings(sections['names']) if flags & HAS_NAMES else None
+        self.ids = self._array(sections['ids'], 'Q') if flags & HAS_IDS else None
+        self.nfa_states: Optional[List[str]] = None
+        self.state_flags = sections['state_flags']
+        self.indptr = self._array(sections['indptr'], 'Q')
+        self.syms = self._array(sections['syms'], 'I')
+        self.targets = self._array(sections['targets'], 'I')
+        self.subsets = sections['subsets']
+        self._width = 0
+        if flags & HAS_SUBSETS:
+            self.nfa_states = _unpack_strings(sections['nfa_states'])
+            self._width = (len(self.nfa_states) + 7) // 8
+        if not self._consistent(n_symbols, n_trans):
+            raise ValueError(f"{path}: archivo {SUFFIX} inconsistente")
+
+    def _consistent(self, n_symbols: int, n_trans: int) -> bool:
+        """Comprueba tamaños e índices para no construir nada fuera de rango."""
+        n = self.n_states
+        indptr = self.indptr
+        n_syms = n_symbols + (1 if self.kind == KIND_NFA else 0)
+        return (
+            self.kind in (KIND_NFA, KIND_DFA)
+            and len(self.symbols) == n_symbols and len(self.state_flags) == n
+            and (self.names is None or len(self.names) == n)
+            and (self.ids is None or len(self.ids) == n)
+            and len(self.subsets) == n * self._width
+            and len(indptr) == n + 1 and indptr[0] == 0 and indptr[n] == n_trans
+            and all(map(le, indptr[:-1], indptr[1:]))
+            and len(self.syms) == n_trans and len(self.targets) == n_trans
+            and (n_trans == 0 or (max(self.syms) < n_syms and max(self.targets) < n))
+            and self.q0 < n
+        )
+
+    def _view(self, view: memoryview) -> memoryview:
+        self._views.append(view)
+        return view
+
+    def _array(self, view: memoryview, typecode: str):
+        """Reinterpreta view como array de enteros (copia sólo en big-endian)."""
+        if len(view) % array(typecode).itemsize:
+            raise ValueError(f"archivo {SUFFIX} inconsistente")
+        if sys.byteorder != 'little':
+            values = array(typecode, view.tobytes())
+            values.byteswap()
+            return values
+        return self._view(view.cast(typecode))
+
+    def row(self, i: int) -> Tuple[memoryview, memoryview]:
+        """(símbolos, destinos) de las transiciones del estado i."""
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return self.syms[lo:hi], self.targets[lo:hi]
+
+    def _sources(self, states: Sequence) -> List:
+        """Estado de origen de cada transición (indptr expandido)."""
+        indptr = self.indptr.tolist()
+        counts = map(sub, indptr[1:], indptr[:-1])
+        return list(chain.from_iterable(map(repeat, states, counts)))
+
+    def states(self) -> Sequence:
+        """Estados (índice -> estado): nombres, ids enteros o range(n)."""
+        if self.names is not None:
+            return self.names
+        if self.ids is not None:
+            return self.ids.tolist()
+        return range(self.n_states)
+
+    def _flagged(self, flag: int) -> bytes:
+        """Un byte por estado: 1 si tiene flag en state_flags."""
+        table = bytes(1 if i & flag else 0 for i in range(256))
+        return bytes(self.state_flags).translate(table)
+
+    def _states_with(self, states: Sequence, flag: int) -> Set:
+        return set(compress(states, self._flagged(flag)))
+
+    def to_automaton(self) -> Automaton:
+        """
+        Construye el NFA o DFA guardado. Las transiciones se recorren con
+        map/zip sobre los arrays, sin bucles Python por estado.
+        """
+        states = self.states()
+        finals = self._states_with(states, FINAL)
+        declared = self._states_with(states, DECLARED)
+        q0 = states[self.q0]
+        sources = self._sources(states)
+        targets = map(states.__getitem__, self.targets.tolist())
+
+        if self.kind == KIND_NFA:
+            keys = zip(sources, map((self.symbols + ['']).__getitem__, self.syms.tolist()))
+            delta: Dict[Tuple[str, str], Set[str]] = {}
+            for key, t in zip(keys, targets):
+                dests = delta.get(key)
+                if dests is None:
+                    delta[key] = {t}
+                else:
+                    dests.add(t)
+            return NFA(states=declared, sigma=set(self.symbols), delta=delta, q0=q0, finals=finals)
+
+        keys = zip(sources, map(self.symbols.__getitem__, self.syms.tolist()))
+        subsets = None
+        if self.nfa_states is not None:
+            subsets = PackedSubsets(bytes(self.subsets), self._width, None if self.ids is None else states)
+        return DFA(
+            states=declared, sigma=set(self.symbols), delta=dict(zip(keys, targets)), q0=q0, finals=finals,
+            subsets=subsets, nfa_states=self.nfa_states
+        )
+
+    def compile(self) -> CompiledDFA:
+        """
+        Tabla compilada del DFA construida directamente desde los arrays,
+        sin crear el dict delta: es lo más rápido para sólo aceptar palabras
+        (p. ej. en procesos que comparten el archivo).
+        """
+        if self.kind != KIND_DFA:
+            raise ValueError("compile() sólo está disponible para archivos de DFA")
+        states = self.states()
+        return CompiledDFA.from_csr(
+            list(states), self.symbols, self.q0, self._flagged(FINAL),
+            self.indptr.tolist(), self.syms.tolist(), self.targets.tolist()
+        )
+
+    def close(self):
+        """Libera las vistas y el mapa en memoria."""
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pausa el recolector cíclico: al crear cientos de miles de tuplas y sets
+    de golpe sus pasadas no liberan nada y llegan a ser un tercio del tiempo.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def load(path: str, use_mmap: bool = True) -> Automaton:
+    """Carga el NFA o DFA guardado con save()."""
+    with BinaryAutomaton(path, use_mmap) as binary, _gc_paused():
+        return binary.to_automaton()
@@ -0,0 +1,260 @@
+"""
+Caché en disco de conversiones AFN → AFD. La clave es un hash SHA-256 de la
+forma canónica del NFA (estados, alfabeto, δ, q₀ y finales, todo ordenado)
+más el algoritmo y la poda; cada entrada es un directorio con el AFD (y el mínimo) en
+formato binario .afb, los metadatos y, opcionalmente, la traza de pasos.
+
+El tamaño total está acotado: al guardar se borran las entradas usadas hace
+más tiempo (LRU por fecha de modificación, que se actualiza en cada acierto).
+Las entradas se escriben en un directorio temporal y se renombran al final,
+así que varios procesos pueden compartir la caché.
+
+Por defecto vive en $NFA_DFA_CACHE_DIR o en ~/.cache/nfa_dfa.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from . import binary
+from .nfa import NFA
+from .step_engine import ConversionResult, convert_nfa_to_dfa
+from .trace import NDJSONTraceWriter, TraceSink
+from .trim import trim_nfa
+
+# Cambiarlo invalida las entradas existentes (p. ej. si cambia el motor)
+CACHE_VERSION = 1
+CACHE_DIR_ENV = 'NFA_DFA_CACHE_DIR'
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+_DFA = 'dfa' + binary.SUFFIX
+_MINIMAL = 'minimal' + binary.SUFFIX
+_TRACE = 'steps.ndjson'
+_META = 'meta.json'
+
+
+def default_cache_dir() -> str:
+    """$NFA_DFA_CACHE_DIR, o nfa_dfa dentro de $XDG_CACHE_HOME (~/.cache)."""
+    path = os.environ.get(CACHE_DIR_ENV)
+    if path:
+        return path
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'nfa_dfa')
+
+
+def nfa_key(nfa: NFA, strategy: str = 'subset', prune: bool = False) -> str:
+    """
+    Hash canónico del NFA para la caché: no depende del orden de inserción
+    de los sets ni de δ, y omite las entradas de δ sin destinos.
+    """
+    canonical = [
+        CACHE_VERSION,
+        strategy,
+        prune,
+        sorted(nfa.states),
+        sorted(nfa.sigma),
+        nfa.q0,
+        sorted(nfa.finals),
+        sorted([q, a, sorted(dests)] for (q, a), dests in nfa.delta.items() if dests),
+    ]
+    data = json.dumps(canonical, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class CacheLookup(NamedTuple):
+    """
+    Resultado de consultar la caché: hit indica si hubo acierto y seconds
+    es lo que costó la conversión original (lo ahorrado, en un acierto) o
+    la que se acaba de hacer (en un fallo).
+    """
+    key: str
+    hit: bool
+    seconds: float
+
+
+class ConversionCache:
+    """
+    Caché de conversiones en directory, acotada a max_bytes. Lleva la
+    cuenta de aciertos, fallos y segundos de conversión ahorrados.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(
+        self,
+        nfa: NFA,
+        strategy: str = 'subset',
+        minimal: bool = False,
+        trace_path: Optional[str] = None,
+        key: Optional[str] = None,
+        prune: bool = False
+    ) -> Tuple[Optional[ConversionResult], CacheLookup]:
+        """
+        Busca la conversión de nfa. Con minimal=True la entrada debe tener
+        el AFD mínimo, y con trace_path la traza, que se copia ahí. Una
+        entrada incompleta o dañada cuenta como fallo. Con prune, nfa debe
+        estar ya podado (como queda en result.nfa al convertir).
+        """
+        key = key or nfa_key(nfa, strategy, prune)
+        entry = self._entry(key)
+        try:
+            with open(os.path.join(entry, _META), encoding='utf-8') as f:
+                meta = json.load(f)
+            if (minimal and not meta['minimal']) or (trace_path is not None and not meta['trace']):
+                raise FileNotFoundError(entry)
+            dfa = binary.load(os.path.join(entry, _DFA))
+            minimal_dfa = None
+            if meta['minimal']:
+                minimal_dfa = dfa if meta['minimal_is_dfa'] else binary.load(os.path.join(entry, _MINIMAL))
+            if trace_path is not None:
+                shutil.copyfile(os.path.join(entry, _TRACE), trace_path)
+            os.utime(entry)
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None, CacheLookup(key, False, 0.0)
+
+        self.hits += 1
+        self.saved_seconds += meta['seconds']
+        result = ConversionResult(nfa, dfa, [], minimal_dfa=minimal_dfa, peak_states=meta['peak_states'])
+        return result, CacheLookup(key, True, meta['seconds'])
+
+    def put(
+        self,
+        key: str,
+        result: ConversionResult,
+        seconds: float,
+        trace_path: Optional[str] = None
+    ):
+        """Guarda result (y la traza de trace_path, si se indica) bajo key."""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix='.tmp-', dir=self.directory)
+        try:
+            minimal_is_dfa = result.minimal_dfa is result.dfa
+            binary.save(result.dfa, os.path.join(tmp, _DFA))
+            if result.minimal_dfa is not None and not minimal_is_dfa:
+                binary.save(result.minimal_dfa, os.path.join(tmp, _MINIMAL))
+            if trace_path is not None:
+                shutil.copyfile(trace_path, os.path.join(tmp, _TRACE))
+            meta = {
+                'seconds': seconds,
+                'peak_states': result.peak_states,
+                'minimal': result.minimal_dfa is not None,
+                'minimal_is_dfa': minimal_is_dfa,
+                'trace': trace_path is not None,
+            }
+            with open(os.path.join(tmp, _META), 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            entry = self._entry(key)
+            # Sustituye una entrada incompleta (sin mínimo o sin traza)
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.evict()
+
+    def entries(self):
+        """[(última fecha de uso, bytes, ruta)] de las entradas, de la más antigua a la más nueva."""
+        found = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return found
+        for name in names:
+            path = os.path.join(self.directory, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(e.stat().st_size for e in os.scandir(path))
+                found.append((os.stat(path).st_mtime, size, path))
+            except OSError:
+                continue
+        found.sort()
+        return found
+
+    def size(self) -> int:
+        """Bytes que ocupan las entradas."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Borra las entradas menos usadas hasta quedar dentro de max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Vacía la caché."""
+        for _, _, path in self.entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def cached_convert(
+    cache: Optional[ConversionCache],
+    nfa: NFA,
+    minimal: bool = False,
+    strategy: str = 'subset',
+    trace_path: Optional[str] = None,
+    trace: Optional[TraceSink] = None,
+    progress: Optional[Callable] = None,
+    cancelled: Optional[Callable[[], bool]] = None,
+    prune: bool = False
+) -> Tuple[ConversionResult, Optional[CacheLookup]]:
+    """
+    convert_nfa_to_dfa con caché. Con trace_path la traza de pasos se
+    escribe ahí en NDJSON (copiada de la caché en un acierto); trace recibe
+    además los pasos cuando hay que convertir. Con cache=None convierte
+    siempre y devuelve lookup None. Con prune la clave se calcula sobre el
+    AFN ya podado, así que AFN que sólo difieren en estados inútiles
+    comparten entrada.
+    """
+    if prune:
+        nfa = trim_nfa(nfa)
+    key = None
+    if cache is not None:
+        key = nfa_key(nfa, strategy, prune)
+        result, lookup = cache.get(nfa, strategy, minimal, trace_path, key, prune)
+        if result is not None:
+            return result, lookup
+
+    t0 = time.perf_counter()
+    if trace_path is None:
+        result = convert_nfa_to_dfa(
+            nfa, minimal=minimal, strategy=strategy, trace=trace,
+            progress=progress, cancelled=cancelled, prune=prune
+        )
+    else:
+        with NDJSONTraceWriter(trace_path) as writer:
+            def tee(origin, symbol, dest, move):
+                writer(origin, symbol, dest, move)
+                trace(origin, symbol, dest, move)
+
+            result = convert_nfa_to_dfa(
+                nfa, minimal=minimal, strategy=strategy,
+                trace=tee if trace is not None else writer,
+                progress=progress, cancelled=cancelled, prune=prune
+            )
+    seconds = time.perf_counter() - t0
+
+    if cache is None:
+        return result, None
+    try:
+        cache.put(key, result, seconds, trace_path)
+    except OSError:
+        # Una caché no escribible no debe impedir la conversión
+        pass
+    return result, CacheLookup(key, False, seconds)
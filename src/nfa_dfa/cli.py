@@ -0,0 +1,226 @@
+"""
+Conversión AFN → AFD por lotes sin interfaz gráfica:
+
+    python -m nfa_dfa automatas/*.txt otros/**/*.jff -o salida -f json -j 4
+
+Cada archivo se parsea (.jff con el parser JFLAP, .afb con el formato
+binario, el resto como .txt), se convierte y se exporta a .jff, .jff.gz, .json o .afb. Con --jobs los archivos se reparten
+entre procesos. No importa PySide6, y lxml sólo se carga si hace falta leer
+o escribir .jff. Las conversiones pasan por la caché en disco
+(nfa_dfa.cache) salvo con --no-cache.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, List, NamedTuple, Optional
+
+from .step_engine import STRATEGIES
+
+FORMATS = ('jff', 'jff.gz', 'json', 'afb')
+INPUT_SUFFIXES = ('.txt', '.jff', '.jff.gz', '.afb')
+
+
+class FileResult(NamedTuple):
+    path: str
+    output: Optional[str]
+    nfa_states: int
+    dfa_states: int
+    seconds: float
+    error: Optional[str]
+    cache_hit: bool = False
+    saved_seconds: float = 0.0
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[str]:
+    """
+    Expande rutas, globs (con ** recursivo) y directorios (sus
+    .txt/.jff/.jff.gz/.afb) a una lista de archivos sin duplicados, en el
+    orden dado.
+    """
+    found = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(
+                os.path.join(pattern, name) for name in os.listdir(pattern)
+                if name.lower().endswith(INPUT_SUFFIXES)
+            )
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for path in matches:
+            if not os.path.isdir(path):
+                found.setdefault(path, None)
+    return list(found)
+
+
+def output_path(path: str, out_dir: Optional[str], fmt: str) -> str:
+    """Ruta de salida: <nombre>.dfa.<fmt> junto al original o en out_dir."""
+    name = os.path.basename(path)
+    if name.lower().endswith('.gz'):
+        name = name[:-3]
+    stem = os.path.splitext(name)[0]
+    directory = out_dir if out_dir is not None else os.path.dirname(path)
+    return os.path.join(directory, f"{stem}.dfa.{fmt}")
+
+
+def _parse(path: str):
+    if path.lower().endswith('.afb'):
+        from .binary import load
+        from .nfa import NFA
+        nfa = load(path)
+        if not isinstance(nfa, NFA):
+            raise ValueError("El archivo .afb no contiene un AFN")
+        return nfa
+    if path.lower().endswith(('.jff', '.jff.gz')):
+        from parsers.jflap_parser import parse_nfa_from_jff
+        return parse_nfa_from_jff(path)
+    from parsers.txt_parser import parse_nfa_from_txt
+    return parse_nfa_from_txt(path)
+
+
+def _export(dfa, path: str, fmt: str):
+    if fmt in ('jff', 'jff.gz'):
+        from .jflap_export import export_dfa_to_jff
+        export_dfa_to_jff(dfa, path, compress=fmt == 'jff.gz')
+    elif fmt == 'json':
+        from .json_export import export_dfa_to_json
+        export_dfa_to_json(dfa, path)
+    else:
+        from .binary import save
+        save(dfa, path)
+
+
+def convert_file(
+    path: str,
+    out_dir: Optional[str] = None,
+    fmt: str = 'jff',
+    minimal: bool = False,
+    strategy: str = 'subset',
+    cache_dir: Optional[str] = None,
+    prune: bool = False
+) -> FileResult:
+    """
+    Parsea, convierte y exporta un archivo. Los errores de entrada no se
+    propagan: quedan en FileResult.error para no detener el lote. Con
+    cache_dir la conversión pasa por la caché de ese directorio, y con
+    prune se podan los estados inútiles del AFN y del AFD.
+    """
+    from .cache import ConversionCache, cached_convert
+
+    t0 = time.perf_counter()
+    nfa_states = dfa_states = 0
+    try:
+        nfa = _parse(path)
+        nfa_states = len(nfa.states)
+        cache = ConversionCache(cache_dir) if cache_dir is not None else None
+        result, lookup = cached_convert(cache, nfa, minimal=minimal, strategy=strategy, prune=prune)
+        dfa = result.minimal_dfa if minimal else result.dfa
+        dfa_states = len(dfa.states)
+        out = output_path(path, out_dir, fmt)
+        _export(dfa, out, fmt)
+    except (ValueError, OSError) as ex:
+        return FileResult(path, None, nfa_states, dfa_states, time.perf_counter() - t0, str(ex))
+    hit = lookup is not None and lookup.hit
+    return FileResult(
+        path, out, nfa_states, dfa_states, time.perf_counter() - t0, None,
+        cache_hit=hit, saved_seconds=lookup.seconds if hit else 0.0
+    )
+
+
+def run(
+    paths: List[str],
+    out_dir: Optional[str] = None,
+    fmt: str = 'jff',
+    minimal: bool = False,
+    strategy: str = 'subset',
+    jobs: int = 1,
+    cache_dir: Optional[str] = None,
+    prune: bool = False
+) -> Iterable[FileResult]:
+    """
+    Convierte paths y va devolviendo los resultados según terminan. Con
+    jobs > 1 (o 0 = todos los núcleos) usa un pool de procesos.
+    """
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    if jobs == 1 or len(paths) <= 1:
+        for path in paths:
+            yield convert_file(path, out_dir, fmt, minimal, strategy, cache_dir, prune)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(convert_file, path, out_dir, fmt, minimal, strategy, cache_dir, prune)
+            for path in paths
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m nfa_dfa",
+        description="Convierte AFN (.txt/.jff/.afb) a AFD y los exporta a JFLAP, JSON o binario."
+    )
+    parser.add_argument("inputs", nargs="+", help="archivos, globs o directorios")
+    parser.add_argument("-o", "--output-dir", help="directorio de salida (por defecto, junto a cada entrada)")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="jff", help="formato de salida")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="procesos en paralelo (0 = todos los núcleos)")
+    parser.add_argument("-m", "--minimal", action="store_true", help="exportar el AFD mínimo")
+    parser.add_argument("-s", "--strategy", choices=STRATEGIES, default="subset", help="algoritmo de determinización")
+    parser.add_argument("-p", "--prune", action="store_true", help="podar estados inalcanzables y muertos del AFN y del AFD")
+    parser.add_argument("--cache-dir", help="directorio de la caché de conversiones (por defecto, $NFA_DFA_CACHE_DIR o ~/.cache/nfa_dfa)")
+    parser.add_argument("--no-cache", action="store_true", help="convertir siempre, sin leer ni escribir la caché")
+    parser.add_argument("-q", "--quiet", action="store_true", help="sólo mostrar errores y el resumen")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("No se encontraron archivos de entrada", file=sys.stderr)
+        return 2
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    total = len(paths)
+    width = len(str(total))
+    cache_dir = None
+    if not args.no_cache:
+        from .cache import default_cache_dir
+        cache_dir = args.cache_dir or default_cache_dir()
+    failures = hits = 0
+    saved = 0.0
+    t0 = time.perf_counter()
+    results = run(paths, args.output_dir, args.format, args.minimal, args.strategy, args.jobs, cache_dir, args.prune)
+    for done, res in enumerate(results, start=1):
+        prefix = f"[{done:>{width}}/{total}]"
+        if res.error is not None:
+            failures += 1
+            print(f"{prefix} ❌ {res.path}: {res.error}", file=sys.stderr)
+            continue
+        hits += res.cache_hit
+        saved += res.saved_seconds
+        if not args.quiet:
+            print(
+                f"{prefix} {res.path} → {res.output} "
+                f"({res.nfa_states} → {res.dfa_states} estados, {res.seconds:.3f} s"
+                + (", caché" if res.cache_hit else "") + ")",
+                file=sys.stderr
+            )
+
+    elapsed = time.perf_counter() - t0
+    print(
+        f"{total - failures}/{total} convertidos en {elapsed:.2f} s"
+        + (f", {failures} con errores" if failures else ""),
+        file=sys.stderr
+    )
+    if cache_dir is not None:
+        print(
+            f"caché: {hits} aciertos, {total - failures - hits} fallos, {saved:.2f} s ahorrados",
+            file=sys.stderr
+        )
+    return 1 if failures else 0
@@ -0,0 +1,335 @@
+from array import array
+from itertools import chain, repeat
+from operator import add, mul, sub
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Itera los índices de los bits encendidos de mask, de menor a mayor."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class TrackedDelta(dict):
+    """
+    dict de transiciones que avisa a su autómata (NFA o DFA) cuando se
+    modifica, para que invalide la forma compilada que tiene en caché.
+    """
+
+    def __init__(self, owner, data):
+        super().__init__(data)
+        self._owner = owner
+
+    def _changed(self):
+        # al deserializar (pickle) los items llegan antes que _owner
+        owner = getattr(self, '_owner', None)
+        if owner is not None:
+            owner.invalidate_cache()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._changed()
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._changed()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._changed()
+        return super().popitem()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+
+class CompiledNFA:
+    """
+    Forma compilada de un NFA con estados y símbolos indexados por enteros.
+    Un conjunto de estados se representa como un entero (bitmask) donde el
+    bit i corresponde a states[i]; los estados se numeran en orden alfabético,
+    así que recorrer los bits de menor a mayor produce los nombres ordenados.
+    Atributos:
+        states:    lista de nombres de estado (índice -> nombre).
+        index:     dict nombre -> índice.
+        symbols:   lista ordenada de símbolos de sigma (índice -> símbolo).
+        sym_index: dict símbolo -> índice.
+        delta:     delta[a][i] = bitmask de destinos de states[i] con symbols[a].
+        eps:       eps[i] = bitmask de destinos ε de states[i].
+        closures:  closures[i] = bitmask de la clausura ε de states[i].
+        q0:        índice del estado inicial.
+        finals:    bitmask de estados finales.
+    """
+
+    def __init__(self, nfa):
+        names = set(nfa.states) | {nfa.q0}
+        for (q, _), dests in nfa.delta.items():
+            names.add(q)
+            names |= dests
+        self.states: List[str] = sorted(names)
+        self.index: Dict[str, int] = {q: i for i, q in enumerate(self.states)}
+        self.symbols: List[str] = sorted(nfa.sigma)
+        self.sym_index: Dict[str, int] = {a: i for i, a in enumerate(self.symbols)}
+
+        n = len(self.states)
+        self.delta: List[List[int]] = [[0] * n for _ in self.symbols]
+        self.eps: List[int] = [0] * n
+        for (q, a), dests in nfa.delta.items():
+            mask = self.to_mask(dests)
+            if a == '':
+                self.eps[self.index[q]] |= mask
+            elif a in self.sym_index:
+                self.delta[self.sym_index[a]][self.index[q]] |= mask
+
+        self.q0: int = self.index[nfa.q0]
+        self.finals: int = self.to_mask(q for q in nfa.finals if q in self.index)
+        self.closures: List[int] = self._epsilon_closures()
+
+    def to_mask(self, names: Iterable[str]) -> int:
+        """Convierte un iterable de nombres de estado en su bitmask."""
+        mask = 0
+        for q in names:
+            mask |= 1 << self.index[q]
+        return mask
+
+    def members(self, mask: int) -> List[str]:
+        """Devuelve los nombres (ordenados) de los estados presentes en mask."""
+        return [self.states[i] for i in iter_bits(mask)]
+
+    def _epsilon_closures(self) -> List[int]:
+        """
+        Calcula la clausura ε de todos los estados en una sola pasada.
+        Usa el algoritmo de Tarjan (iterativo) sobre el grafo de transiciones ε:
+        todos los estados de una componente fuertemente conexa comparten
+        clausura, y Tarjan emite las componentes en orden topológico inverso,
+        así que al cerrar una componente sus sucesores ya están resueltos y
+        basta con unir sus clausuras.
+        """
+        n = len(self.states)
+        eps = self.eps
+        closures = [0] * n
+        order = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        counter = 0
+
+        for root in range(n):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, iter_bits(eps[root]))]
+            while work:
+                v, successors = work[-1]
+                for w in successors:
+                    if order[w] == -1:
+                        order[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, iter_bits(eps[w])))
+                        break
+                    if on_stack[w] and order[w] < low[v]:
+                        low[v] = order[w]
+                else:
+                    work.pop()
+                    if work:
+                        u = work[-1][0]
+                        if low[v] < low[u]:
+                            low[u] = low[v]
+                    if low[v] == order[v]:
+                        # v es raíz de una componente: la sacamos de la pila
+                        component = []
+                        members = 0
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = False
+                            component.append(w)
+                            members |= 1 << w
+                            if w == v:
+                                break
+                        closure = members
+                        for w in component:
+                            for x in iter_bits(eps[w] & ~members):
+                                closure |= closures[x]
+                        for w in component:
+                            closures[w] = closure
+        return closures
+
+    def closure(self, mask: int) -> int:
+        """Clausura ε de un conjunto: unión de las clausuras precalculadas."""
+        closures = self.closures
+        result = 0
+        for i in iter_bits(mask):
+            result |= closures[i]
+        return result
+
+    def move(self, mask: int, a: int) -> int:
+        """mover(T, a): unión de los destinos con el símbolo de índice a."""
+        row = self.delta[a]
+        result = 0
+        for i in iter_bits(mask):
+            result |= row[i]
+        return result
+
+    def successors(self, mask: int) -> List[int]:
+        """ε-closure(mover(T, a)) para cada símbolo a, en el orden de symbols."""
+        closure = self.closure
+        move = self.move
+        return [closure(move(mask, a)) for a in range(len(self.symbols))]
+
+    def transitions(self, mask: int) -> List[Tuple[int, int]]:
+        """Como successors, pero con pares (mover(T, a), ε-closure(mover(T, a)))."""
+        closure = self.closure
+        move = self.move
+        moves = [move(mask, a) for a in range(len(self.symbols))]
+        return [(M, closure(M)) for M in moves]
+
+    def accepts(self, word: Iterable[str]) -> bool:
+        """Simula el NFA sobre word operando con bitmasks."""
+        current = self.closure(1 << self.q0)
+        for c in word:
+            a = self.sym_index.get(c)
+            if a is None:
+                return False
+            current = self.closure(self.move(current, a))
+            if not current:
+                return False
+        return bool(current & self.finals)
+
+
+class CompiledDFA:
+    """
+    Forma compilada de un DFA: tabla de transiciones densa de enteros, de modo
+    que avanzar un símbolo es una sola indexación. La tabla es plana y los
+    estados se guardan premultiplicados por el ancho de fila (stride), así que
+    el siguiente estado es table[s + a]. Las transiciones ausentes (∅) van a
+    un estado muerto explícito, el último de la tabla.
+    Atributos:
+        states:     lista de estados del DFA (índice -> estado).
+        index:      dict estado -> índice.
+        symbols:    lista ordenada de símbolos (índice -> símbolo).
+        sym_index:  dict símbolo -> índice.
+        stride:     ancho de fila (número de símbolos, al menos 1).
+        dead:       índice del estado muerto.
+        table:      array plano de (len(states) + 1) * stride destinos premultiplicados.
+        start:      estado inicial premultiplicado.
+        accepting:  bytearray indexado por índice de estado (1 = final).
+    """
+
+    def __init__(self, dfa):
+        self.states = sorted(dfa.states | {dfa.q0})
+        self.index = {q: i for i, q in enumerate(self.states)}
+        self.symbols: List[str] = sorted(dfa.sigma)
+        self.sym_index: Dict[str, int] = {a: i for i, a in enumerate(self.symbols)}
+        self.stride = stride = max(len(self.symbols), 1)
+        self.dead = dead = len(self.states)
+
+        table = array('q', [dead * stride]) * ((dead + 1) * stride)
+        for (q, a), t in dfa.delta.items():
+            i = self.index.get(q)
+            j = self.sym_index.get(a)
+            if i is not None and j is not None and t is not None and t in self.index:
+                table[i * stride + j] = self.index[t] * stride
+        self.table = table
+        self.start = self.index[dfa.q0] * stride
+
+        self.accepting = bytearray(dead + 1)
+        for q in dfa.finals:
+            if q in self.index:
+                self.accepting[self.index[q]] = 1
+
+    @classmethod
+    def from_csr(cls, states: Sequence, symbols: List[str], q0: int, accepting: bytes,
+                 indptr: Sequence[int], syms: Sequence[int], targets: Sequence[int]) -> 'CompiledDFA':
+        """
+        Construye la tabla sin pasar por un DFA, a partir de transiciones en
+        formato CSR (como las de un archivo .afb): las del estado i son las
+        posiciones [indptr[i], indptr[i+1]) de syms/targets, todo como
+        índices. states debe estar ordenado; accepting tiene un byte por
+        estado (distinto de 0 = final).
+        """
+        self = cls.__new__(cls)
+        self.states = states
+        self.index = dict(zip(states, range(len(states))))
+        self.symbols = symbols
+        self.sym_index = {a: i for i, a in enumerate(symbols)}
+        self.stride = stride = max(len(symbols), 1)
+        self.dead = dead = len(states)
+
+        if len(symbols) == stride and list(indptr) == list(range(0, (dead + 1) * stride, stride)):
+            # DFA completo: las filas CSR ya son la tabla densa
+            table = array('q', map(mul, targets, repeat(stride)))
+            table.extend(repeat(dead * stride, stride))
+        else:
+            table = array('q', [dead * stride]) * ((dead + 1) * stride)
+            counts = map(sub, indptr[1:], indptr[:-1])
+            rows = chain.from_iterable(map(repeat, range(0, dead * stride, stride), counts))
+            for pos, t in zip(map(add, rows, syms), targets):
+                table[pos] = t * stride
+        self.table = table
+        self.start = q0 * stride
+        self.accepting = bytearray(accepting) + b'\0'
+        return self
+
+    def run(self, word: Iterable[str]) -> int:
+        """Devuelve el índice del estado alcanzado tras leer word."""
+        table = self.table
+        sym_index = self.sym_index
+        s = self.start
+        try:
+            for c in word:
+                s = table[s + sym_index[c]]
+        except KeyError:
+            return self.dead
+        return s // self.stride
+
+    def accepts(self, word: Iterable[str]) -> bool:
+        """Indica si el DFA acepta word (cadena o secuencia de símbolos)."""
+        table = self.table
+        sym_index = self.sym_index
+        s = self.start
+        try:
+            for c in word:
+                s = table[s + sym_index[c]]
+        except KeyError:
+            return False
+        return self.accepting[s // self.stride] == 1
+
+    def accepts_many(self, words: Iterable[Iterable[str]]) -> List[bool]:
+        """accepts() para cada palabra de words, en el mismo orden."""
+        table = self.table
+        sym_index = self.sym_index
+        start = self.start
+        stride = self.stride
+        accepting = self.accepting
+        result = []
+        append = result.append
+        for word in words:
+            s = start
+            try:
+                for c in word:
+                    s = table[s + sym_index[c]]
+            except KeyError:
+                append(False)
+                continue
+            append(accepting[s // stride] == 1)
+        return result
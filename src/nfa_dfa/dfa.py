@@ -1,55 +1,125 @@
-from typing import Set, Dict, List, Tuple
+from typing import Hashable, Set, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+from .compiled import CompiledDFA, TrackedDelta, iter_bits
 
 class DFA:
     """
     Autómata finito determinista.
-    states: set de nombres de estado (strings)
+    states: set de estados (enteros compactos en los AFD que genera la
+            conversión; cualquier valor hashable y ordenable en general)
     sigma:  set de símbolos del alfabeto (strings)
     delta:  dict[(estado, símbolo)] -> estado de destino
-    q0:     estado inicial (string)
-    finals: set de estados finales (strings)
+    q0:     estado inicial
+    finals: set de estados finales
+    Tabla lateral opcional para los AFD de subconjuntos:
+    subsets:    subsets[q] = bitmask de estados del NFA que forman q
+    nfa_states: nombres de los estados del NFA (índice de bit -> nombre)
+    Los nombres para mostrar ("q0,q1", "∅", …) no se guardan: label(q) los
+    genera bajo demanda a partir de la tabla lateral.
+    La tabla compilada (CompiledDFA) se construye en el primer uso de
+    accepts()/accepts_many() y se invalida igual que en NFA: al reasignar
+    atributos o modificar delta.
     """
+
+    _COMPILED_FIELDS = frozenset({'states', 'sigma', 'delta', 'q0', 'finals'})
+
     def __init__(
         self,
-        states: Set[str],
+        states: Set[Hashable],
         sigma: Set[str],
-        delta: Dict[Tuple[str, str], str],
-        q0: str,
-        finals: Set[str]
+        delta: Dict[Tuple[Hashable, str], Hashable],
+        q0: Hashable,
+        finals: Set[Hashable],
+        subsets: Optional[Sequence[int]] = None,
+        nfa_states: Optional[Sequence[str]] = None
     ):
+        self._compiled = None
         self.states = states
         self.sigma  = sigma
         self.delta  = delta
         self.q0     = q0
         self.finals = finals
+        self.subsets = subsets
+        self.nfa_states = nfa_states
+
+    def __setattr__(self, name, value):
+        if name in self._COMPILED_FIELDS:
+            if name == 'delta':
+                value = TrackedDelta(self, value)
+            self.__dict__['_compiled'] = None
+        super().__setattr__(name, value)
+
+    def invalidate_cache(self):
+        """Descarta la tabla compilada en caché."""
+        self.__dict__['_compiled'] = None
+
+    def compile(self) -> CompiledDFA:
+        """Devuelve (y guarda en caché) la tabla de transiciones densa."""
+        if self._compiled is None:
+            self.__dict__['_compiled'] = CompiledDFA(self)
+        return self._compiled
+
+    def accepts(self, word: Iterable[str]) -> bool:
+        """Indica si el DFA acepta word (cadena o secuencia de símbolos)."""
+        return self.compile().accepts(word)
+
+    def accepts_many(self, words: Iterable[Iterable[str]]) -> List[bool]:
+        """Clasifica muchas palabras de una vez; devuelve una lista de bools."""
+        return self.compile().accepts_many(words)
+
+    def members(self, q) -> List[str]:
+        """Estados del NFA que forman el estado q (lista vacía si no se conocen)."""
+        if self.subsets is None or self.nfa_states is None:
+            return []
+        return [self.nfa_states[i] for i in iter_bits(self.subsets[q])]
+
+    def label(self, q) -> str:
+        """Nombre para mostrar del estado q: sus miembros separados por comas."""
+        if self.subsets is None or self.nfa_states is None:
+            return str(q)
+        return ','.join(self.members(q)) or '∅'
+
+    def iter_quintuple(self) -> Iterator[str]:
+        """Genera M = (Q, Σ, δ, q₀, F) y la lista de δ en trozos de texto."""
+        states = sorted(self.states)
+        symbols = sorted(self.sigma)
+        labels = {q: self.label(q) for q in states}
+        Q     = "{" + ", ".join(labels[q] for q in states) + "}"
+        Σ     = "{" + ", ".join(symbols) + "}"
+        F     = "{" + ", ".join(labels[q] for q in states if q in self.finals) + "}"
+        yield f"M = ({Q}, {Σ}, δ, {self.label(self.q0)}, {F})\n{{ "
+
+        # Lista de transiciones con ∅ cuando no hay destino
+        sep = ""
+        for q in states:
+            for a in symbols:
+                dest = self.delta.get((q, a))
+                dest = labels.get(dest, "∅") if dest is not None else "∅"
+                yield f"{sep}δ({labels[q]}, {a}) = {dest}"
+                sep = ", "
+        yield " }"
 
     def quintuple(self) -> str:
         """Devuelve M = (Q, Σ, δ, q₀, F) más la lista de δ en texto."""
-        Q     = "{" + ", ".join(sorted(self.states)) + "}"
-        Σ     = "{" + ", ".join(sorted(self.sigma)) + "}"
-        F     = "{" + ", ".join(sorted(self.finals)) + "}"
-
-        # Construir lista de transiciones con ∅ cuando no hay destino
-        parts = []
-        for q in sorted(self.states):
-            for a in sorted(self.sigma):
-                dest = self.delta.get((q, a), "")
-                dest = dest if dest else "∅"
-                parts.append(f"δ({q}, {a}) = {dest}")
+        return "".join(self.iter_quintuple())
 
-        delta_str = "{ " + ", ".join(parts) + " }"
-        return f"M = ({Q}, {Σ}, δ, {self.q0}, {F})\n{delta_str}"
+    def write_quintuple(self, file: TextIO):
+        """Escribe la quíntupla en file sin materializarla entera."""
+        file.writelines(self.iter_quintuple())
 
     def transition_table(self) -> List[Dict[str, str]]:
         """
         Devuelve una lista de filas, donde cada fila es:
           {'state': q, 'a': destino_o_∅, 'b': ..., ...}
+        con los estados ya convertidos a su nombre para mostrar.
         """
+        states = sorted(self.states)
+        symbols = sorted(self.sigma)
+        labels = {q: self.label(q) for q in states}
         table: List[Dict[str, str]] = []
-        for q in sorted(self.states):
-            row = {'state': q}
-            for a in sorted(self.sigma):
-                dest = self.delta.get((q, a), "")
-                row[a] = dest if dest else "∅"
+        for q in states:
+            row = {'state': labels[q]}
+            for a in symbols:
+                dest = self.delta.get((q, a))
+                row[a] = labels.get(dest, "∅") if dest is not None else "∅"
             table.append(row)
         return table
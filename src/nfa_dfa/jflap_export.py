@@ -1,97 +1,114 @@
-from lxml import etree
+"""
+Exportación de AFN y AFD a JFLAP (.jff).
+
+El XML se escribe en streaming, estado a estado y transición a transición,
+sin construir el árbol en memoria: el tiempo y la memoria son lineales y
+pequeños incluso con cientos de miles de transiciones. Si la ruta termina
+en .gz (o con compress=True) la salida se comprime con gzip; el parser de
+JFLAP del proyecto lee esos archivos directamente.
+"""
+import gzip
 import math
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
 from .nfa import NFA
 from .dfa import DFA
 
+# Separación mínima (px) entre estados vecinos: los círculos de JFLAP miden
+# unos 40 px, así que con menos se solapan
+MIN_SPACING = 80.0
+
+# Entidades extra para valores de atributo (además de &, < y >)
+_ATTR_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#9;'}
+
 
-def _layout_positions(states, width=800, height=600, margin=50):
+def _layout_positions(n: int, width=800, height=600, margin=50,
+                      spacing=MIN_SPACING) -> Iterator[Tuple[float, float]]:
     """
-    Distribuye los estados en un grid dentro de un área width×height,
-    dejando un margen alrededor. Retorna dict: estado -> (x,y).
+    Distribuye n estados en un grid dentro de un área width×height, dejando
+    un margen alrededor, y genera (x, y) para cada índice 0..n-1. Si en esa
+    área los estados quedarían a menos de spacing px, el lienzo crece para
+    mantener esa separación.
     """
-    n = len(states)
     # determinamos columnas y filas
-    cols = math.ceil(math.sqrt(n))
+    cols = math.ceil(math.sqrt(n)) or 1
     rows = math.ceil(n / cols)
     # espacio utilizable
     usable_w = width - 2 * margin
     usable_h = height - 2 * margin
-    dx = usable_w / (cols - 1) if cols > 1 else 0
-    dy = usable_h / (rows - 1) if rows > 1 else 0
+    dx = max(usable_w / (cols - 1), spacing) if cols > 1 else 0
+    dy = max(usable_h / (rows - 1), spacing) if rows > 1 else 0
 
-    positions = {}
-    for idx, q in enumerate(sorted(states)):
-        r = idx // cols
-        c = idx % cols
-        x = margin + c * dx
-        y = margin + r * dy
-        positions[q] = (x, y)
-    return positions
+    for idx in range(n):
+        r, c = divmod(idx, cols)
+        yield margin + c * dx, margin + r * dy
 
 
-def export_nfa_to_jff(nfa: NFA, path: str) -> None:
+def _write_jff(
+    path: str,
+    names: Sequence[str],
+    initial: Optional[int],
+    finals: Iterable[int],
+    transitions: Iterable[Tuple[int, int, str]],
+    compress: Optional[bool] = None
+) -> None:
     """
-    Exporta un NFA a JFLAP (.jff) con layout en rejilla de estados.
+    Escribe un autómata en formato JFLAP. names son los nombres de los
+    estados por id, initial y finals ids, y transitions tuplas (origen,
+    destino, símbolo) con '' para ε. compress=None comprime si la ruta
+    termina en .gz.
     """
-    root = etree.Element("structure")
-    etree.SubElement(root, "type").text = "fa"
-    automaton = etree.SubElement(root, "automaton")
-
-    # calculamos posiciones en grid
-    positions = _layout_positions(nfa.states)
-    state_ids = {q: idx for idx, q in enumerate(sorted(nfa.states))}
-
-    # Crear estados
-    for q, idx in state_ids.items():
-        x, y = positions[q]
-        s = etree.SubElement(automaton, "state", id=str(idx), name=q)
-        etree.SubElement(s, "x").text = f"{x:.1f}"
-        etree.SubElement(s, "y").text = f"{y:.1f}"
-        if q == nfa.q0:
-            etree.SubElement(s, "initial")
-        if q in nfa.finals:
-            etree.SubElement(s, "final")
-
-    # Transiciones
-    for (q, a), dests in nfa.delta.items():
-        for dest in dests:
-            t = etree.SubElement(automaton, "transition")
-            etree.SubElement(t, "from").text = str(state_ids[q])
-            etree.SubElement(t, "to").text   = str(state_ids[dest])
-            etree.SubElement(t, "read").text = a or ""  # vacío para ε
-
-    tree = etree.ElementTree(root)
-    tree.write(path, pretty_print=True, xml_declaration=True, encoding="UTF-8")
-
-
-def export_dfa_to_jff(dfa: DFA, path: str) -> None:
+    if compress is None:
+        compress = path.lower().endswith('.gz')
+    finals = set(finals)
+    symbols = {}
+
+    def state(idx: int, name: str, x: float, y: float) -> str:
+        flags = ('      <initial/>\n' if idx == initial else '') + ('      <final/>\n' if idx in finals else '')
+        return (f'    <state id="{idx}" name="{escape(name, _ATTR_ENTITIES)}">\n'
+                f'      <x>{x:.1f}</x>\n      <y>{y:.1f}</y>\n{flags}    </state>\n')
+
+    def transition(src: int, dst: int, a: str) -> str:
+        read = symbols.get(a)
+        if read is None:
+            read = symbols[a] = f'<read>{escape(a)}</read>' if a else '<read/>'
+        return f'    <transition>\n      <from>{src}</from>\n      <to>{dst}</to>\n      {read}\n    </transition>\n'
+
+    if compress:
+        # Nivel 6 (el de gzip en línea de comandos): 9 es varias veces más lento y apenas reduce más
+        f = gzip.open(path, 'wt', compresslevel=6, encoding='utf-8', newline='\n')
+    else:
+        f = open(path, 'w', encoding='utf-8', newline='\n')
+    with f:
+        f.write("<?xml version='1.0' encoding='UTF-8'?>\n<structure>\n  <type>fa</type>\n  <automaton>\n")
+        f.writelines(state(idx, name, x, y) for idx, (name, (x, y))
+                     in enumerate(zip(names, _layout_positions(len(names)))))
+        f.writelines(transition(src, dst, a) for src, dst, a in transitions)
+        f.write("  </automaton>\n</structure>\n")
+
+
+def export_nfa_to_jff(nfa: NFA, path: str, compress: Optional[bool] = None) -> None:
+    """
+    Exporta un NFA a JFLAP (.jff) con layout en rejilla de estados. Con
+    compress (o una ruta .gz) lo comprime con gzip.
+    """
+    names: List[str] = sorted(nfa.states)
+    state_ids = {q: idx for idx, q in enumerate(names)}
+    transitions = (
+        (state_ids[q], state_ids[dest], a)
+        for (q, a), dests in nfa.delta.items() for dest in dests
+    )
+    _write_jff(path, names, state_ids.get(nfa.q0), map(state_ids.get, nfa.finals), transitions, compress)
+
+
+def export_dfa_to_jff(dfa: DFA, path: str, compress: Optional[bool] = None) -> None:
     """
-    Exporta un DFA a JFLAP (.jff) con layout en rejilla de estados.
+    Exporta un DFA a JFLAP (.jff) con layout en rejilla de estados. Con
+    compress (o una ruta .gz) lo comprime con gzip.
     """
-    root = etree.Element("structure")
-    etree.SubElement(root, "type").text = "fa"
-    automaton = etree.SubElement(root, "automaton")
-
-    positions = _layout_positions(dfa.states)
-    state_ids = {q: idx for idx, q in enumerate(sorted(dfa.states))}
-
-    # Crear estados
-    for q, idx in state_ids.items():
-        x, y = positions[q]
-        s = etree.SubElement(automaton, "state", id=str(idx), name=q)
-        etree.SubElement(s, "x").text = f"{x:.1f}"
-        etree.SubElement(s, "y").text = f"{y:.1f}"
-        if q == dfa.q0:
-            etree.SubElement(s, "initial")
-        if q in dfa.finals:
-            etree.SubElement(s, "final")
-
-    # Transiciones
-    for (q, a), dest in dfa.delta.items():
-        t = etree.SubElement(automaton, "transition")
-        etree.SubElement(t, "from").text = str(state_ids[q])
-        etree.SubElement(t, "to").text   = str(state_ids[dest])
-        etree.SubElement(t, "read").text = a or ""
-
-    tree = etree.ElementTree(root)
-    tree.write(path, pretty_print=True, xml_declaration=True, encoding="UTF-8")
+    states = sorted(dfa.states)
+    state_ids = {q: idx for idx, q in enumerate(states)}
+    transitions = ((state_ids[q], state_ids[dest], a) for (q, a), dest in dfa.delta.items())
+    _write_jff(path, [dfa.label(q) for q in states], state_ids.get(dfa.q0),
+               map(state_ids.get, dfa.finals), transitions, compress)
@@ -0,0 +1,58 @@
+import json
+from typing import Any, Dict
+from .nfa import NFA
+from .dfa import DFA
+
+
+def nfa_to_dict(nfa: NFA) -> Dict[str, Any]:
+    """
+    Representación JSON de un NFA: estados por id (en orden), transiciones
+    con los ids de origen y destino; read vacío para ε.
+    """
+    states = sorted(nfa.states)
+    state_ids = {q: idx for idx, q in enumerate(states)}
+    return {
+        "type": "nfa",
+        "alphabet": sorted(nfa.sigma),
+        "states": [{"id": idx, "name": q} for idx, q in enumerate(states)],
+        "initial": state_ids[nfa.q0],
+        "finals": sorted(state_ids[q] for q in nfa.finals),
+        "transitions": [
+            {"from": state_ids[q], "read": a, "to": state_ids[dest]}
+            for (q, a), dests in sorted(nfa.delta.items())
+            for dest in sorted(dests)
+        ],
+    }
+
+
+def dfa_to_dict(dfa: DFA) -> Dict[str, Any]:
+    """
+    Representación JSON de un DFA; el nombre de cada estado es su nombre para
+    mostrar (dfa.label).
+    """
+    states = sorted(dfa.states)
+    state_ids = {q: idx for idx, q in enumerate(states)}
+    return {
+        "type": "dfa",
+        "alphabet": sorted(dfa.sigma),
+        "states": [{"id": idx, "name": dfa.label(q)} for idx, q in enumerate(states)],
+        "initial": state_ids[dfa.q0],
+        "finals": sorted(state_ids[q] for q in dfa.finals),
+        "transitions": [
+            {"from": state_ids[q], "read": a, "to": state_ids[dest]}
+            for (q, a), dest in sorted(dfa.delta.items())
+            if dest is not None
+        ],
+    }
+
+
+def export_nfa_to_json(nfa: NFA, path: str) -> None:
+    """Exporta un NFA a JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(nfa_to_dict(nfa), f, ensure_ascii=False, indent=2)
+
+
+def export_dfa_to_json(dfa: DFA, path: str) -> None:
+    """Exporta un DFA a JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dfa_to_dict(dfa), f, ensure_ascii=False, indent=2)
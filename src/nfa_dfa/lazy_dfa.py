@@ -0,0 +1,126 @@
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterable, List, Optional
+from .nfa import NFA
+
+# Palabras recientes cuyos desalojos cuentan para detectar que la caché no da abasto
+FALLBACK_WINDOW = 64
+
+
+class LazyDFA:
+    """
+    DFA perezoso sobre un NFA: los subconjuntos (bitmasks de la forma
+    compilada) y sus transiciones se determinizan sólo la primera vez que
+    accepts() las recorre, y se guardan en una caché LRU acotada.
+    Atributos:
+        max_states:     máximo de estados de DFA en caché; al superarlo se
+                        desaloja el usado hace más tiempo.
+        fallback_after: desalojos tolerados en la ventana formada por las
+                        últimas FALLBACK_WINDOW palabras más la actual (por
+                        defecto, max_states // 2). Si se superan, la caché
+                        no está sirviendo y el resto de la palabra se
+                        procesa simulando el NFA directamente; esas palabras
+                        no desalojan, así que la ventana se vacía sola y
+                        más adelante se vuelve a probar la caché.
+        hits, misses, evictions, fallbacks: contadores de uso de la caché.
+    """
+
+    def __init__(self, nfa: NFA, max_states: int = 10_000, fallback_after: Optional[int] = None):
+        if max_states < 1:
+            raise ValueError("max_states debe ser al menos 1")
+        self.compiled = nfa.compile()
+        self.max_states = max_states
+        self.fallback_after = max(max_states // 2, 1) if fallback_after is None else fallback_after
+        self._start = self.compiled.closure(1 << self.compiled.q0)
+        # bitmask del estado -> fila de transiciones (None = aún no calculada)
+        self._cache: "OrderedDict[int, List[Optional[int]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.fallbacks = 0
+        # Desalojos de las últimas palabras y su suma
+        self._window: Deque[int] = deque(maxlen=FALLBACK_WINDOW)
+        self._window_evictions = 0
+
+    def _row(self, state: int) -> List[Optional[int]]:
+        """Fila de transiciones de state, creándola (y desalojando) si hace falta."""
+        row = self._cache.get(state)
+        if row is not None:
+            self._cache.move_to_end(state)
+            return row
+        if len(self._cache) >= self.max_states:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+        row = [None] * len(self.compiled.symbols)
+        self._cache[state] = row
+        return row
+
+    def accepts(self, word: Iterable[str]) -> bool:
+        """Indica si el autómata acepta word (cadena o secuencia de símbolos)."""
+        evictions_at_start = self.evictions
+        try:
+            return self._accepts(word)
+        finally:
+            window = self._window
+            if len(window) == window.maxlen:
+                self._window_evictions -= window[0]
+            evicted = self.evictions - evictions_at_start
+            window.append(evicted)
+            self._window_evictions += evicted
+
+    def _accepts(self, word: Iterable[str]) -> bool:
+        compiled = self.compiled
+        sym_index = compiled.sym_index
+        state = self._start
+        row = self._row(state)
+        # Desalojos que se toleran todavía en esta palabra
+        budget = self.evictions + self.fallback_after - self._window_evictions
+        symbols = iter(word)
+
+        for c in symbols:
+            a = sym_index.get(c)
+            if a is None:
+                return False
+            target = row[a]
+            if target is None:
+                self.misses += 1
+                target = row[a] = compiled.closure(compiled.move(state, a))
+            else:
+                self.hits += 1
+            state = target
+            if not state:
+                return False
+            row = self._row(state)
+            if self.evictions > budget:
+                # La caché no da abasto: simulamos el NFA en su lugar
+                self.fallbacks += 1
+                for c in symbols:
+                    a = sym_index.get(c)
+                    if a is None:
+                        return False
+                    state = compiled.closure(compiled.move(state, a))
+                    if not state:
+                        return False
+                break
+
+        return bool(state & compiled.finals)
+
+    def cached_states(self) -> int:
+        """Número de estados de DFA presentes en la caché."""
+        return len(self._cache)
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de la caché como dict."""
+        return {
+            'states': len(self._cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'fallbacks': self.fallbacks,
+        }
+
+    def clear(self):
+        """Vacía la caché y reinicia los contadores."""
+        self._cache.clear()
+        self.hits = self.misses = self.evictions = self.fallbacks = 0
+        self._window.clear()
+        self._window_evictions = 0
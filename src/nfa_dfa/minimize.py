@@ -0,0 +1,116 @@
+from collections import deque
+from typing import Dict, Hashable, List, Set, Tuple
+from .dfa import DFA
+
+
+def minimize(dfa: DFA) -> DFA:
+    """
+    Minimiza un DFA con el algoritmo de refinamiento de particiones de
+    Hopcroft, O(n·k·log n), usando índices de transiciones inversas.
+    Se descartan primero los estados inalcanzables. Si el DFA es parcial se
+    completa con un sumidero implícito, que desaparece del resultado salvo
+    que quede fusionado con estados reales. Cada bloque de estados
+    equivalentes se representa con su menor miembro, así que el resultado
+    reutiliza estados (y la tabla de subconjuntos) del DFA original.
+    """
+    symbols = sorted(dfa.sigma)
+    k = len(symbols)
+
+    # Tabla de transiciones con índices enteros; el sumidero es el índice n
+    states = sorted(dfa.states | {dfa.q0})
+    index = {q: i for i, q in enumerate(states)}
+    n = len(states)
+    sink = n
+    table: List[List[int]] = []
+    for sym in symbols:
+        row = [sink] * (n + 1)
+        for i, q in enumerate(states):
+            t = dfa.delta.get((q, sym))
+            if t is not None:
+                row[i] = index[t]
+        table.append(row)
+
+    # Estados alcanzables desde q0 (el sumidero siempre se incluye)
+    reachable = [False] * (n + 1)
+    reachable[index[dfa.q0]] = reachable[sink] = True
+    pending = [index[dfa.q0]]
+    while pending:
+        i = pending.pop()
+        for row in table:
+            t = row[i]
+            if not reachable[t]:
+                reachable[t] = True
+                pending.append(t)
+    alive = [i for i in range(n + 1) if reachable[i]]
+
+    # Índice inverso: inverse[a][t] = estados que llegan a t con el símbolo a
+    inverse: List[List[List[int]]] = []
+    for row in table:
+        inv: List[List[int]] = [[] for _ in range(n + 1)]
+        for i in alive:
+            inv[row[i]].append(i)
+        inverse.append(inv)
+
+    finals = {i for i in alive if i != sink and states[i] in dfa.finals}
+    non_finals = set(alive) - finals
+    blocks: List[Set[int]] = [b for b in (finals, non_finals) if b]
+    block_of = [0] * (n + 1)
+    for b, members in enumerate(blocks):
+        for s in members:
+            block_of[s] = b
+
+    # Basta con usar como separador el menor de los dos bloques iniciales
+    start = min(range(len(blocks)), key=lambda b: len(blocks[b]))
+    worklist = deque((start, a) for a in range(k))
+
+    while worklist:
+        b, a = worklist.popleft()
+        inv = inverse[a]
+        # Predecesores del bloque con el símbolo a, agrupados por bloque
+        touched: Dict[int, Set[int]] = {}
+        for t in blocks[b]:
+            for s in inv[t]:
+                touched.setdefault(block_of[s], set()).add(s)
+
+        for y, inside in touched.items():
+            members = blocks[y]
+            if len(inside) == len(members):
+                continue
+            # members queda como la parte exterior con coste O(|inside|); el
+            # bloque grande conserva el id y el pequeño pasa a ser nuevo.
+            members -= inside
+            small, big = (inside, members) if len(inside) <= len(members) else (members, inside)
+            new = len(blocks)
+            blocks[y] = big
+            blocks.append(small)
+            for s in small:
+                block_of[s] = new
+            # Si (y, c) ya estaba pendiente basta añadir la otra mitad; si no,
+            # Hopcroft añade sólo la mitad pequeña. En ambos casos es la nueva.
+            for c in range(k):
+                worklist.append((new, c))
+
+    # Construir el DFA cociente
+    reps: Dict[int, Hashable] = {}
+    for b, members in enumerate(blocks):
+        real = [s for s in members if s != sink]
+        if real:
+            reps[b] = states[min(real)]
+
+    delta: Dict[Tuple[Hashable, str], Hashable] = {}
+    for b, rep in reps.items():
+        i = index[rep]
+        for sym, row in zip(symbols, table):
+            target = reps.get(block_of[row[i]])
+            if target is not None:
+                delta[(rep, sym)] = target
+
+    return DFA(
+        states=set(reps.values()),
+        sigma=set(dfa.sigma),
+        delta=delta,
+        q0=reps[block_of[index[dfa.q0]]],
+        finals={rep for rep in reps.values() if rep in dfa.finals},
+        subsets=dfa.subsets,
+        nfa_states=dfa.nfa_states
+    )
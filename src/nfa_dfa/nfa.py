@@ -1,4 +1,6 @@
-from typing import Set, Dict, List, Tuple
+from typing import Set, Dict, Iterator, List, TextIO, Tuple
+from .compiled import CompiledNFA, TrackedDelta
+
 
 class NFA:
     """
@@ -9,47 +11,98 @@ class NFA:
             delta: Función de transición: dict[(estado, simbolo)] -> set(estados).
             q0: Estado inicial.
             finals: Conjunto de estados finales.
+        La forma compilada y las clausuras ε se calculan una sola vez y quedan
+        en caché; se invalidan al reasignar cualquiera de los atributos o al
+        modificar delta. Si se modifican en sitio los conjuntos de destinos
+        (p. ej. delta[k].add(q)) hay que llamar a invalidate_cache().
     """
 
+    _COMPILED_FIELDS = frozenset({'states', 'sigma', 'delta', 'q0', 'finals'})
+
     def __init__(self, states: Set[str], sigma: Set[str], delta: Dict[Tuple[str, str], Set[str]], q0: str, finals:Set[str]):
+        self._compiled = None
         self.states = states
         self.sigma = sigma
         self.delta = delta
         self.q0 = q0
         self.finals = finals
 
+    def __setattr__(self, name, value):
+        if name in self._COMPILED_FIELDS:
+            if name == 'delta':
+                value = TrackedDelta(self, value)
+            self.__dict__['_compiled'] = None
+        super().__setattr__(name, value)
+
+    def invalidate_cache(self):
+        """
+            Descarta la forma compilada en caché (se recalcula en el próximo uso).
+        """
+        self.__dict__['_compiled'] = None
+
+    def compile(self) -> CompiledNFA:
+        """
+            Devuelve la forma compilada (estados/símbolos como enteros y
+            transiciones como bitmasks) sobre la que trabaja el motor.
+            Se construye una vez y se reutiliza mientras el NFA no cambie.
+        """
+        if self._compiled is None:
+            self.__dict__['_compiled'] = CompiledNFA(self)
+        return self._compiled
+
+    def accepts(self, word) -> bool:
+        """
+            Indica si el AFN acepta word (cadena o secuencia de símbolos),
+            simulando en paralelo todos los estados activos como un bitmask.
+        """
+        return self.compile().accepts(word)
+
     def epsilon_closure(self, state: str) -> Set[str]:
         """
-            Calcula la clausura epsilon de un estado.
-        """
-        stack = [state]
-        closure = {state}
-        while stack:
-            s = stack.pop()
-            for t in self.delta.get(( s, '' ), set()):
-                if t not in closure:
-                    closure.add(t)
-                    stack.append(t)
-        return closure
+            Calcula la clausura epsilon de un estado (consulta la tabla precalculada).
+        """
+        compiled = self.compile()
+        i = compiled.index.get(state)
+        if i is None:
+            return {state}
+        return set(compiled.members(compiled.closures[i]))
 
     def epsilon_closures(self) -> Dict[str, Set[str]]:
         """
             Calcula la clausura epsilon de cada estado.
         """
-        return {s: self.epsilon_closure(s) for s in self.states}
+        compiled = self.compile()
+        return {s: set(compiled.members(compiled.closures[compiled.index[s]])) for s in self.states}
+
+    def iter_quintuple(self) -> Iterator[str]:
+        """
+            Genera la quíntupla M = (Q, Sigma, delta, q0, F) en trozos de texto,
+            para escribirla sin construir la cadena completa.
+        """
+        states = sorted(self.states)
+        symbols = sorted(self.sigma)
+        Q = '{' + ', '.join(states) + '}'
+        Sigma = '{' + ', '.join(symbols) + '}'
+        F = '{' + ', '.join(sorted(self.finals)) + '}'
+        yield f"M = ({Q}, {Sigma} ∪ {{ε}}, delta, {self.q0}, {F})\n{{ "
+        empty = ()
+        sep = ''
+        for q in states:
+            for a in symbols + ['']:
+                targets = ', '.join(sorted(self.delta.get((q, a), empty)))
+                yield f"{sep}delta({q}, '{a}') = {{{targets}}}"
+                sep = ', '
+        yield ' }'
 
     def quintuple(self) -> str:
         """
             Devuelve la representación en texto de la quíntupla M = (Q, Sigma, delta, q0, F).
         """
-        Q = '{' + ', '.join(sorted(self.states)) + '}'
-        Sigma = '{' + ', '.join(sorted(self.sigma)) + '}'
-        delta_str = '{ ' + ', '.join(
-            f"delta({q}, '{a}') = {{{', '.join(sorted(self.delta.get((q, a), [])))}}}"
-            for q in sorted(self.states) for a in list(self.sigma) + ['']
-        ) + ' }'
-        F = '{' + ', '.join(sorted(self.finals)) + '}'
-        return f"M = ({Q}, {Sigma} ∪ {{ε}}, delta, {self.q0}, {F})\n{delta_str}"
+        return ''.join(self.iter_quintuple())
+
+    def write_quintuple(self, file: TextIO):
+        """Escribe la quíntupla en file sin materializarla entera."""
+        file.writelines(self.iter_quintuple())
 
     def transition_table(self) -> List[Dict[str, str]]:
         """
@@ -58,13 +111,13 @@ class NFA:
             Las claves son 'state', luego cada simbolo en sigma y '' para epsilon.
         """
         table = []
-        headers = ['state'] + sorted(self.sigma) + ['']
+        empty = ()
+        symbols = sorted(self.sigma) + ['']
         for q in sorted(self.states):
             row = {'state': q}
-            for a in sorted(self.sigma):
-                row[a] = ','.join(sorted(self.delta.get((q, a), set())))
-            # epsilon
-            row[''] = ','.join(sorted(self.delta.get((q, ''), set())))
+            # el último símbolo ('') es epsilon
+            for a in symbols:
+                row[a] = ','.join(sorted(self.delta.get((q, a), empty)))
             table.append(row)
         return table
 
@@ -0,0 +1,76 @@
+"""
+Expansión en paralelo de la construcción por subconjuntos: cada frontera del
+recorrido en anchura se reparte entre procesos de un ProcessPoolExecutor que
+calculan ε-closure(mover(T, a)) para cada subconjunto T. Los procesos reciben
+una única vez la forma compilada del NFA (sólo lectura); el coordinador
+deduplica los subconjuntos nuevos en el mismo orden que la versión secuencial.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+
+from .compiled import CompiledNFA
+
+# Por debajo de este tamaño de frontera no compensa el coste de IPC
+MIN_PARALLEL_FRONTIER = 64
+
+_worker_nfa: Optional[CompiledNFA] = None
+
+
+def _init_worker(compiled: CompiledNFA):
+    global _worker_nfa
+    _worker_nfa = compiled
+
+
+def _expand_chunk(subsets: List[int]) -> List[List[int]]:
+    successors = _worker_nfa.successors
+    return [successors(T) for T in subsets]
+
+
+def _expand_chunk_with_moves(subsets: List[int]) -> List[List[Tuple[int, int]]]:
+    transitions = _worker_nfa.transitions
+    return [transitions(T) for T in subsets]
+
+
+class FrontierExpander:
+    """
+    Calcula los sucesores de una frontera de subconjuntos, localmente o con
+    jobs procesos. Se usa como context manager para cerrar el pool.
+    """
+
+    def __init__(self, compiled: CompiledNFA, jobs: int = 1, with_moves: bool = False):
+        self.compiled = compiled
+        self.with_moves = with_moves
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if self.jobs > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.jobs,
+                initializer=_init_worker,
+                initargs=(compiled,)
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def expand(self, frontier: List[int]) -> Iterator[List[int]]:
+        """
+        Sucesores de cada subconjunto de frontier, en el mismo orden. Con
+        with_moves cada sucesor es el par (mover, ε-closure(mover)).
+        """
+        if self._pool is None or len(frontier) < MIN_PARALLEL_FRONTIER:
+            expand = self.compiled.transitions if self.with_moves else self.compiled.successors
+            return (expand(T) for T in frontier)
+        # Varios bloques por proceso para repartir mejor la carga
+        size = -(-len(frontier) // (self.jobs * 4))
+        chunks = [frontier[i:i + size] for i in range(0, len(frontier), size)]
+        work = _expand_chunk_with_moves if self.with_moves else _expand_chunk
+        return (row for rows in self._pool.map(work, chunks) for row in rows)
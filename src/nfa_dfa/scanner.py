@@ -0,0 +1,140 @@
+"""
+Escaneo de archivos grandes con un DFA sin cargarlos en memoria: se leen
+bloques de tamaño fijo (de una ruta, un archivo binario o un mmap) y el estado
+del DFA se arrastra entre bloques. Cada línea (registro separado por delimiter) es
+una palabra; se pueden obtener veredictos por línea o los desplazamientos de
+las líneas aceptadas.
+"""
+import mmap
+from array import array
+from typing import BinaryIO, Iterator, Tuple, Union
+
+from .dfa import DFA
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+Source = Union[str, BinaryIO, mmap.mmap]
+
+
+def byte_classes(dfa: DFA) -> bytes:
+    """
+    Tabla de traducción de 256 entradas byte -> clase de símbolo, apta para
+    bytes.translate(). La clase es el índice del símbolo en la tabla
+    compilada, o len(sigma) para los bytes que no pertenecen a sigma. Los
+    símbolos deben ser caracteres que se codifiquen en un solo byte (latin-1).
+    """
+    compiled = dfa.compile()
+    unknown = min(len(compiled.symbols), 255)
+    classes = bytearray([unknown]) * 256
+    for a, i in compiled.sym_index.items():
+        try:
+            code = a.encode('latin-1')
+        except UnicodeEncodeError:
+            code = b''
+        if len(code) != 1:
+            raise ValueError(f"El símbolo {a!r} no es un único byte; no se puede escanear en binario")
+        classes[code[0]] = i
+    return bytes(classes)
+
+
+def _class_table(dfa: DFA) -> Tuple[array, int, int]:
+    """
+    Tabla de transiciones indexada por clase de byte: como la compilada pero
+    con una columna extra para la clase "desconocido", que lleva al estado
+    muerto. Devuelve (tabla, stride, estado inicial premultiplicado).
+    """
+    compiled = dfa.compile()
+    k = len(compiled.symbols)
+    stride = k + 1 if k < 256 else k
+    dead = compiled.dead
+    table = array('q', [dead * stride]) * ((dead + 1) * stride)
+    for s in range(dead + 1):
+        for a in range(k):
+            table[s * stride + a] = compiled.table[s * compiled.stride + a] // compiled.stride * stride
+    return table, stride, compiled.index[dfa.q0] * stride
+
+
+def _chunks(source: Source, chunk_size: int) -> Iterator[bytes]:
+    if isinstance(source, str):
+        # Una ruta se lee por bloques con read(): a diferencia de un mmap, las
+        # páginas ya leídas no se quedan contando en la memoria residente.
+        with open(source, 'rb', buffering=0) as f:
+            yield from _chunks(f, chunk_size)
+        return
+    if isinstance(source, mmap.mmap):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+        return
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def scan_lines(
+    dfa: DFA,
+    source: Source,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    delimiter: bytes = b'\n'
+) -> Iterator[Tuple[int, int, int, bool]]:
+    """
+    Recorre source (ruta, archivo binario o mmap) y produce, por cada línea,
+    (número de línea, desplazamiento inicial, longitud, aceptada). La línea
+    no incluye el delimitador; un '\\r' final (CRLF) tampoco se considera.
+    """
+    if len(delimiter) != 1:
+        raise ValueError("El delimitador debe ser un único byte")
+    classes = byte_classes(dfa)
+    table, stride, start = _class_table(dfa)
+    accepting = dfa.compile().accepting
+
+    line_no = 1
+    line_start = 0     # desplazamiento absoluto de la línea actual
+    base = 0           # desplazamiento absoluto del bloque actual
+    state = start
+    before_cr = None   # estado previo al '\r' final de la línea, si lo hay
+
+    for chunk in _chunks(source, chunk_size):
+        # Los delimitadores se localizan con find() y cada tramo se traduce a
+        # clases de símbolo con translate(), ambos en C; el bucle de Python
+        # sólo hace una indexación por byte.
+        size = len(chunk)
+        pos = 0
+        while True:
+            nl = chunk.find(delimiter, pos)
+            end = size if nl == -1 else nl
+            if end > pos:
+                segment = chunk[pos:end].translate(classes)
+                for c in segment[:-1]:
+                    state = table[state + c]
+                before_cr = state if chunk[end - 1] == 13 else None
+                state = table[state + segment[-1]]
+            if nl == -1:
+                break
+            final = before_cr if before_cr is not None else state
+            length = base + nl - line_start - (before_cr is not None)
+            yield line_no, line_start, length, accepting[final // stride] == 1
+            line_no += 1
+            line_start = base + nl + 1
+            state = start
+            before_cr = None
+            pos = nl + 1
+        base += size
+
+    if base > line_start:
+        final = before_cr if before_cr is not None else state
+        length = base - line_start - (before_cr is not None)
+        yield line_no, line_start, length, accepting[final // stride] == 1
+
+
+def iter_matches(
+    dfa: DFA,
+    source: Source,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    delimiter: bytes = b'\n'
+) -> Iterator[Tuple[int, int]]:
+    """Produce (desplazamiento, longitud) de cada línea aceptada por el DFA."""
+    for _, start, length, accepted in scan_lines(dfa, source, chunk_size, delimiter):
+        if accepted:
+            yield start, length
@@ -1,83 +1,310 @@
-from typing import Set, Dict, List, Tuple
+import time
+from functools import cached_property
+from itertools import repeat
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, TextIO, Tuple
 from .nfa import NFA
 from .dfa import DFA
+from .minimize import minimize
+from .parallel import FrontierExpander
+from .trace import ListTrace, StepEvent, TraceSink
+from .trim import trim_dfa, trim_nfa
 
 class ConversionResult:
+    """
+    Resultado de convert_nfa_to_dfa. Las representaciones en texto (quíntuplas
+    y tablas de transiciones) se generan en el primer acceso y quedan en
+    caché, así que quien sólo necesita el AFD no paga su coste.
+    """
 
     def __init__(
         self,
-        nfa_quint: str,
-        afn_table: List[Dict[str, str]],
+        nfa: NFA,
         dfa: DFA,
-        dfa_quint: str,
-        dfa_table: List[Dict[str, str]],
-        steps: List[Tuple[str, str, str]]
+        steps: List[StepEvent],
+        minimal_dfa: DFA = None,
+        peak_states: int = 0
     ):
-        self.nfa_quint = nfa_quint
-        self.afn_table = afn_table
+        self.nfa = nfa
         self.dfa = dfa
-        self.dfa_quint = dfa_quint
-        self.dfa_table = dfa_table
         self.steps = steps
+        self.minimal_dfa = minimal_dfa
+        self.peak_states = peak_states
 
-def convert_nfa_to_dfa(nfa: NFA, step_by_step: bool = False) -> ConversionResult:
-
-    def closure(states: Set[str]) -> Set[str]:
-        result = set()
-        for s in states:
-            result |= nfa.epsilon_closure(s)
-        return result
-
-    start_closure = closure({nfa.q0})
-    unmarked: List[Set[str]] = [start_closure]
-    marked: List[Set[str]] = []
-    dfa_states: List[Set[str]] = []
-    transitions: Dict[Tuple[str, str], str] = {}
-    steps: List[Tuple[str, str, str]] = []
-
-    sigma = nfa.sigma
-
-    while unmarked:
-        T = unmarked.pop(0)
-        marked.append(T)
-        dfa_states.append(T)
-        T_name = ','.join(sorted(T)) or '∅'
-
-        for a in sorted(sigma):
-            # movimiento y clausura
-            move_set: Set[str] = set()
-            for p in T:
-                move_set |= nfa.delta.get((p, a), set())
-            U = closure(move_set)
-            U_name = ','.join(sorted(U)) or '∅'
-
-            transitions[(T_name, a)] = U_name
-            if step_by_step:
-                steps.append((T_name, a, U_name))
-
-            if U not in marked and U not in unmarked:
-                unmarked.append(U)
-
-    # Construir DFA
-    state_names = {','.join(sorted(s)) or '∅' for s in dfa_states}
-    finals = set(filter(
-        lambda name: any(fs in nfa.finals for fs in name.split(',')),
-        state_names
-    ))
+    @cached_property
+    def nfa_quint(self) -> str:
+        return self.nfa.quintuple()
+
+    @cached_property
+    def afn_table(self) -> List[Dict[str, str]]:
+        return self.nfa.transition_table()
+
+    @cached_property
+    def dfa_quint(self) -> str:
+        return self.dfa.quintuple()
+
+    @cached_property
+    def dfa_table(self) -> List[Dict[str, str]]:
+        return self.dfa.transition_table()
+
+    def write_dfa_quintuple(self, file: TextIO):
+        """Escribe la quíntupla del AFD en file por trozos."""
+        self.dfa.write_quintuple(file)
+
+STRATEGIES = ('subset', 'brzozowski')
+
+_NO_MOVES = repeat(None)
+
+# Orígenes expandidos entre dos avisos de progreso / comprobaciones de cancelación
+CHECK_EVERY = 1024
+
+
+class ConversionCancelled(Exception):
+    """La conversión se interrumpió porque cancelled() devolvió True."""
+
+
+class ConversionProgress(NamedTuple):
+    states: int     # estados del AFD descubiertos hasta ahora
+    frontier: int   # tamaño de la frontera que se está expandiendo
+    elapsed: float  # segundos desde el inicio de la determinización
+
+
+ProgressCallback = Callable[[ConversionProgress], None]
+CancelCheck = Callable[[], bool]
+
+
+def _subset_construction(
+    nfa: NFA,
+    step_by_step: bool = False,
+    compact_names: bool = False,
+    starts: Set[str] = None,
+    jobs: int = 1,
+    trace: Optional[TraceSink] = None,
+    progress: Optional[ProgressCallback] = None,
+    cancelled: Optional[CancelCheck] = None,
+    record_moves: bool = True
+) -> Tuple[DFA, List[StepEvent]]:
+    """
+    Construcción por subconjuntos sobre la forma compilada del NFA.
+    Los estados del AFD son enteros 0, 1, … en orden de descubrimiento (0 es
+    el inicial) y los pasos son StepEvent (origen, símbolo, destino, mover)
+    con esos ids y mover(T, a) como bitmask de estados del NFA (bit i =
+    nfa.compile().states[i]). Con compact_names=True no se adjunta la tabla
+    de miembros, así que los nombres para mostrar son los propios ids.
+    starts permite partir de un conjunto de estados iniciales en lugar de
+    {q0}. Con jobs > 1 (o 0 = todos los núcleos) cada frontera se expande en
+    varios procesos; el resultado es idéntico al secuencial. Cada paso se
+    envía a trace si se indica; con step_by_step=True además se acumulan en
+    la lista devuelta. Cada CHECK_EVERY orígenes expandidos (contados en
+    total, no por frontera) se llama a progress (si se indica) y se consulta
+    cancelled; si devuelve True se lanza ConversionCancelled. Con
+    record_moves=False los pasos llevan mover=None y mover(T, a) no se
+    calcula aparte.
+    """
+    compiled = nfa.compile()
+    t0 = time.perf_counter()
+
+    # Cada subconjunto descubierto recibe un id entero compacto (su orden de
+    # descubrimiento) y se indexa por su bitmask, de modo que comprobar si ya
+    # existe es O(1). La tabla lateral subsets (id -> bitmask) permite
+    # obtener miembros y nombres para mostrar sin guardar strings.
+    ids: Dict[int, int] = {}
+    subsets: List[int] = []
+    start = compiled.to_mask(starts) if starts is not None else 1 << compiled.q0
+    start_closure = compiled.closure(start)
+    ids[start_closure] = 0
+    subsets.append(start_closure)
+    transitions: Dict[Tuple[int, str], int] = {}
+    steps = ListTrace()
+    if step_by_step:
+        if trace is None:
+            trace = steps
+        else:
+            user_trace = trace
+
+            def trace(origin, symbol, dest, move):
+                steps(origin, symbol, dest, move)
+                user_trace(origin, symbol, dest, move)
+
+    # Recorrido en anchura por fronteras: procesar cada frontera en orden
+    # equivale a la cola FIFO, así que el orden de descubrimiento (y con él
+    # los pasos) no depende de si la expansión es local o en paralelo.
+    watch = progress is not None or cancelled is not None
+
+    def checkpoint(frontier_size: int):
+        if cancelled is not None and cancelled():
+            raise ConversionCancelled()
+        if progress is not None:
+            progress(ConversionProgress(len(subsets), frontier_size, time.perf_counter() - t0))
+
+    # Con traza, el expansor devuelve también mover(T, a) para cada símbolo,
+    # que acompaña a cada paso; sin ella sólo se calculan los sucesores
+    frontier: List[int] = [start_closure]
+    with_moves = trace is not None and record_moves
+    with FrontierExpander(compiled, jobs, with_moves=with_moves) as expander:
+        while frontier:
+            next_frontier: List[int] = []
+            for T, row in zip(frontier, expander.expand(frontier)):
+                T_id = ids[T]
+                # Los orígenes se expanden en orden de descubrimiento, así que
+                # T_id cuenta los ya expandidos en todas las fronteras: con
+                # fronteras estrechas (cadenas) no se avisa en cada una
+                if watch and T_id % CHECK_EVERY == 0:
+                    checkpoint(len(frontier))
+                if not with_moves:
+                    successors, moves = row, _NO_MOVES
+                else:
+                    successors = [U for _, U in row]
+                    moves = [M for M, _ in row]
+
+                for a, U, M in zip(compiled.symbols, successors, moves):
+                    U_id = ids.get(U)
+                    if U_id is None:
+                        U_id = ids[U] = len(subsets)
+                        subsets.append(U)
+                        next_frontier.append(U)
+
+                    transitions[(T_id, a)] = U_id
+                    if trace is not None:
+                        trace(T_id, a, U_id, M)
+            frontier = next_frontier
+    if watch:
+        checkpoint(0)
+
+    # Construir DFA: la finalidad se decide con un AND de bitmasks
+    finals_mask = compiled.finals
     dfa = DFA(
-        states=state_names,
-        sigma=sigma,
+        states=set(range(len(subsets))),
+        sigma=nfa.sigma,
         delta=transitions,
-        q0=','.join(sorted(start_closure)),
-        finals=finals
+        q0=0,
+        finals={q for q, T in enumerate(subsets) if T & finals_mask},
+        subsets=None if compact_names else subsets,
+        nfa_states=None if compact_names else compiled.states
     )
+    return dfa, steps
+
+
+def _reverse(states, sigma, edges, q0: str, finals) -> NFA:
+    """
+    AFN reverso: invierte cada arista (src, a, dst) y añade un estado inicial
+    nuevo con transiciones ε hacia los antiguos finales; el único final es q0.
+    Al determinizarlo hay que partir de los antiguos finales (starts) y no del
+    estado nuevo, para que éste no forme parte del subconjunto inicial.
+    """
+    start = '⟨inicio⟩'
+    while start in states:
+        start += "'"
+    delta: Dict[Tuple[str, str], Set[str]] = {(start, ''): set(finals)}
+    for src, a, dst in edges:
+        delta.setdefault((dst, a), set()).add(src)
+    return NFA(states=set(states) | {start}, sigma=set(sigma), delta=delta, q0=start, finals={q0})
+
+
+def _brzozowski(
+    nfa: NFA,
+    step_by_step: bool,
+    jobs: int = 1,
+    trace: Optional[TraceSink] = None,
+    progress: Optional[ProgressCallback] = None,
+    cancelled: Optional[CancelCheck] = None
+) -> Tuple[DFA, List[StepEvent], int]:
+    """
+    Algoritmo de Brzozowski: reverso → determinizar → reverso → determinizar.
+    El resultado es el AFD mínimo sin construir nunca el AFD de subconjuntos
+    del NFA original. Devuelve (dfa, pasos de la última determinización,
+    máximo de estados de AFD materializados a la vez). Esa determinización
+    trabaja sobre un AFN interno (el reverso del AFD reverso), así que sus
+    pasos llevan mover=None: un bitmask suyo no nombraría estados de nfa.
+    """
+    nfa_edges = ((q, a, d) for (q, a), dests in nfa.delta.items() for d in dests)
+    reverse_dfa, _ = _subset_construction(
+        _reverse(nfa.states | {nfa.q0}, nfa.sigma, nfa_edges, nfa.q0, nfa.finals),
+        compact_names=True,
+        starts=nfa.finals,
+        jobs=jobs,
+        progress=progress,
+        cancelled=cancelled
+    )
+    # Los estados del NFA se nombran con strings: los ids pasan a str
+    dfa_edges = ((str(q), a, str(d)) for (q, a), d in reverse_dfa.delta.items())
+    dfa_finals = {str(q) for q in reverse_dfa.finals}
+    dfa, steps = _subset_construction(
+        _reverse({str(q) for q in reverse_dfa.states}, reverse_dfa.sigma, dfa_edges,
+                 str(reverse_dfa.q0), dfa_finals),
+        step_by_step=step_by_step,
+        compact_names=True,
+        starts=dfa_finals,
+        jobs=jobs,
+        trace=trace,
+        progress=progress,
+        cancelled=cancelled,
+        record_moves=False
+    )
+    return dfa, steps, max(len(reverse_dfa.states), len(dfa.states))
+
+
+def convert_nfa_to_dfa(
+    nfa: NFA,
+    step_by_step: bool = False,
+    minimal: bool = False,
+    strategy: str = 'subset',
+    jobs: int = 1,
+    trace: Optional[TraceSink] = None,
+    progress: Optional[ProgressCallback] = None,
+    cancelled: Optional[CancelCheck] = None,
+    prune: bool = False
+) -> ConversionResult:
+    """
+    Convierte el AFN en AFD.
+    strategy='subset' hace la construcción por subconjuntos; con minimal=True
+    además se minimiza el AFD resultante (Hopcroft) y se deja en
+    result.minimal_dfa, mientras result.dfa sigue siendo el AFD de
+    subconjuntos, al que se refieren los pasos.
+    strategy='brzozowski' obtiene directamente el AFD mínimo (result.dfa y
+    result.minimal_dfa) sin materializar el AFD de subconjuntos; conviene
+    cuando éste es enorme pero el mínimo es pequeño.
+    En ambos casos result.peak_states indica el máximo de estados de AFD
+    que se llegaron a construir. jobs > 1 (o 0 = todos los núcleos) reparte
+    la construcción por subconjuntos entre varios procesos.
+    trace recibe cada paso (origen, símbolo, destino, mover) según se produce,
+    con mover como bitmask de estados de result.nfa (ver _subset_construction;
+    con strategy='brzozowski' mover es siempre None), p. ej.
+    un NDJSONTraceWriter para volcar la traza a disco sin acumularla;
+    step_by_step=True la acumula además en result.steps.
+    progress recibe ConversionProgress periódicamente y cancelled() permite
+    interrumpir la conversión desde otro hilo (lanza ConversionCancelled).
+    Con prune=True se podan los estados inútiles (ver nfa_dfa.trim) del AFN
+    antes de determinizar, lo que achica la búsqueda, y del AFD después:
+    result.nfa es entonces el AFN podado (los bitmasks de mover se refieren
+    a él) y los pasos pueden mencionar estados, como ∅, que ya no están en
+    result.dfa.
+    """
+    if prune:
+        nfa = trim_nfa(nfa)
+    if strategy == 'subset':
+        dfa, steps = _subset_construction(
+            nfa, step_by_step, jobs=jobs, trace=trace,
+            progress=progress, cancelled=cancelled
+        )
+        peak_states = len(dfa.states)
+        if prune:
+            dfa = trim_dfa(dfa)
+        if minimal and cancelled is not None and cancelled():
+            raise ConversionCancelled()
+        minimal_dfa = minimize(dfa) if minimal else None
+    elif strategy == 'brzozowski':
+        dfa, steps, peak_states = _brzozowski(nfa, step_by_step, jobs, trace, progress, cancelled)
+        if prune:
+            dfa = trim_dfa(dfa)
+        minimal_dfa = dfa
+    else:
+        raise ValueError(f"Estrategia desconocida: {strategy!r} (opciones: {', '.join(STRATEGIES)})")
 
     result = ConversionResult(
-        nfa_quint=nfa.quintuple(),
-        afn_table=nfa.transition_table(),
+        nfa=nfa,
         dfa=dfa,
-        dfa_quint=dfa.quintuple(),
-        dfa_table=dfa.transition_table(),
-        steps=steps
+        steps=steps,
+        minimal_dfa=minimal_dfa,
+        peak_states=peak_states
     )
-    return result
\ No newline at end of file
+    return result
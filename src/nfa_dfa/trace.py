@@ -0,0 +1,206 @@
+"""
+Traza de pasos de la construcción por subconjuntos. El motor emite cada
+paso (origen, símbolo, destino, mover) — con los ids enteros de los estados
+del AFD y mover(T, a) como bitmask de estados del NFA — a un sumidero:
+cualquier callable sink(origen, símbolo, destino, mover).
+Aquí se ofrecen un sumidero en memoria (ListTrace) y otro que escribe NDJSON
+a disco (NDJSONTraceWriter), más un lector paginado para recorrer trazas
+grandes sin cargarlas enteras (TraceReader). StepIndex indexa los pasos por
+(origen, símbolo) y BatchTrace los agrupa en lotes para enviarlos a otro hilo.
+"""
+import json
+import os
+from typing import IO, Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+
+class StepEvent(NamedTuple):
+    origin: int
+    symbol: str
+    dest: int
+    move: Optional[int] = None   # mover(origen, símbolo) como bitmask del NFA (None si no se conoce)
+
+
+TraceSink = Callable[[int, str, int, int], None]
+
+
+class ListTrace(list):
+    """Sumidero en memoria: una lista de StepEvent."""
+
+    def __call__(self, origin: int, symbol: str, dest: int, move: Optional[int] = None):
+        self.append(StepEvent(origin, symbol, dest, move))
+
+
+class StepIndex:
+    """
+    Sumidero que indexa los pasos: el destino de cada (origen, símbolo) en un
+    dict y los orígenes en orden de primera aparición, de modo que una fila
+    (origen) y una celda (destino) se consultan en O(1). Se puede ir
+    ampliando mientras la conversión avanza.
+    """
+
+    def __init__(self, steps: Iterable[Tuple[Hashable, ...]] = ()):
+        self.targets: Dict[Tuple[Hashable, str], Hashable] = {}
+        self.origins: List[Hashable] = []
+        self._seen = set()
+        self.extend(steps)
+
+    def __call__(self, origin: Hashable, symbol: str, dest: Hashable, move: Optional[int] = None):
+        self.targets[(origin, symbol)] = dest
+        if origin not in self._seen:
+            self._seen.add(origin)
+            self.origins.append(origin)
+
+    def extend(self, steps: Iterable[Tuple[Hashable, ...]]):
+        """Añade pasos (origen, símbolo, destino[, mover])."""
+        for step in steps:
+            self(step[0], step[1], step[2])
+
+    def dest(self, origin: Hashable, symbol: str) -> Optional[Hashable]:
+        """Destino de (origen, símbolo), o None si aún no se conoce."""
+        return self.targets.get((origin, symbol))
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+
+class BatchTrace:
+    """
+    Sumidero que acumula pasos y llama a flush(lista) cada size pasos; close()
+    entrega los que queden. Útil para pasar la traza a otro hilo sin una
+    señal por paso.
+    """
+
+    def __init__(self, flush: Callable[[List[StepEvent]], None], size: int = 2048):
+        self._flush = flush
+        self._size = size
+        self._batch: List[StepEvent] = []
+
+    def __call__(self, origin: int, symbol: str, dest: int, move: Optional[int] = None):
+        self._batch.append(StepEvent(origin, symbol, dest, move))
+        if len(self._batch) >= self._size:
+            self._flush(self._batch)
+            self._batch = []
+
+    def close(self):
+        if self._batch:
+            self._flush(self._batch)
+            self._batch = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class NDJSONTraceWriter:
+    """
+    Sumidero que escribe un paso por línea como JSON:
+    [origen, "símbolo", destino, mover] (mover es null si no se conoce).
+    Acepta una ruta o un archivo de texto abierto; se usa como context manager.
+    """
+
+    def __init__(self, target: Union[str, IO[str]]):
+        if isinstance(target, str):
+            self._file = open(target, 'w', encoding='utf-8')
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+        self._write = self._file.write
+        self._symbols: Dict[str, str] = {}
+        self.count = 0
+
+    def __call__(self, origin: int, symbol: str, dest: int, move: Optional[int] = None):
+        encoded = self._symbols.get(symbol)
+        if encoded is None:
+            encoded = self._symbols[symbol] = json.dumps(symbol, ensure_ascii=False)
+        self._write(f"[{origin},{encoded},{dest},{'null' if move is None else move}]\n")
+        self.count += 1
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _parse(line: bytes) -> StepEvent:
+    # Las trazas sin mover (tres campos) también se aceptan
+    return StepEvent(*json.loads(line))
+
+
+class TraceReader:
+    """
+    Lectura paginada de una traza NDJSON. Al abrirla se indexa el
+    desplazamiento de cada página (page_size líneas) en una sola pasada; luego
+    page(i) y reader[j] sólo leen la página necesaria; la última página leída
+    queda en caché sin decodificar y reader[j] decodifica sólo su línea.
+    """
+
+    def __init__(self, path: str, page_size: int = 1000):
+        self.path = path
+        self.page_size = page_size
+        self._offsets: List[int] = []
+        self._length = 0
+        self._cached_page: Optional[int] = None
+        self._cached: List[bytes] = []
+        with open(path, 'rb') as f:
+            offset = 0
+            for line in f:
+                if self._length % page_size == 0:
+                    self._offsets.append(offset)
+                offset += len(line)
+                self._length += 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def page_count(self) -> int:
+        return len(self._offsets)
+
+    def _raw_page(self, index: int) -> List[bytes]:
+        if index == self._cached_page:
+            return self._cached
+        if not 0 <= index < len(self._offsets):
+            raise IndexError(index)
+        count = min(self.page_size, self._length - index * self.page_size)
+        with open(self.path, 'rb') as f:
+            f.seek(self._offsets[index])
+            lines = [f.readline() for _ in range(count)]
+        self._cached_page = index
+        self._cached = lines
+        return lines
+
+    def page(self, index: int) -> List[StepEvent]:
+        """Devuelve los pasos de la página index."""
+        return [_parse(line) for line in self._raw_page(index)]
+
+    def __getitem__(self, index: int) -> StepEvent:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return _parse(self._raw_page(index // self.page_size)[index % self.page_size])
+
+    def __iter__(self) -> Iterator[StepEvent]:
+        with open(self.path, 'rb') as f:
+            for line in f:
+                yield _parse(line)
+
+    def close(self, remove: bool = False):
+        """Suelta la página en caché y, con remove=True, borra el archivo."""
+        self._cached_page = None
+        self._cached = []
+        if remove:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
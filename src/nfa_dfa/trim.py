@@ -0,0 +1,135 @@
+"""
+Poda de estados inútiles en AFN y AFD. Un estado es útil si es alcanzable
+desde q₀ (accesible) y desde él se llega a algún final (co-accesible); los
+demás no cambian el lenguaje, pero en un AFN inflan la construcción por
+subconjuntos y en un AFD las tablas y los archivos exportados.
+
+Las dos búsquedas son recorridos en profundidad: hacia delante desde q₀
+consultando δ directamente, y hacia atrás desde los finales alcanzables
+sobre un índice de predecesores construido en una sola pasada por δ. q₀ se
+conserva siempre, aunque el lenguaje sea vacío.
+"""
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+from .dfa import DFA
+from .nfa import NFA
+
+
+def _search(roots: Iterable[Hashable], successors: Callable[[Hashable], Iterable[Hashable]],
+            within: Optional[Set[Hashable]] = None) -> Set[Hashable]:
+    """Estados alcanzables desde roots (sin salir de within, si se indica)."""
+    seen = set(roots)
+    pending = list(seen)
+    while pending:
+        for t in successors(pending.pop()):
+            if t not in seen and (within is None or t in within):
+                seen.add(t)
+                pending.append(t)
+    return seen
+
+
+def _predecessors(edges: Iterable) -> Dict[Hashable, List[Hashable]]:
+    """Índice inverso destino -> orígenes a partir de pares ((origen, símbolo), destinos)."""
+    pred = defaultdict(list)
+    for (q, _), dests in edges:
+        for d in dests:
+            pred[d].append(q)
+    return pred
+
+
+def useful_nfa_states(nfa: NFA) -> Set[str]:
+    """Estados del NFA accesibles y co-accesibles (las transiciones ε cuentan)."""
+    delta = nfa.delta
+    symbols = list(nfa.sigma) + ['']
+    empty = ()
+
+    def successors(q):
+        for a in symbols:
+            yield from delta.get((q, a), empty)
+
+    reachable = _search([nfa.q0], successors)
+    pred = _predecessors(delta.items())
+    return _search(nfa.finals & reachable, lambda q: pred.get(q, empty), within=reachable)
+
+
+def trim_nfa(nfa: NFA) -> NFA:
+    """
+    Devuelve un NFA equivalente sin estados inútiles ni las transiciones que
+    los tocan; el alfabeto no cambia. Si no sobra ningún estado devuelve el
+    propio nfa.
+    """
+    useful = useful_nfa_states(nfa)
+    useful.add(nfa.q0)
+    if useful == nfa.states:
+        return nfa
+    delta = {}
+    for (q, a), dests in nfa.delta.items():
+        if q in useful:
+            kept = dests & useful
+            if kept:
+                delta[(q, a)] = kept
+    return NFA(states=useful, sigma=set(nfa.sigma), delta=delta, q0=nfa.q0, finals=nfa.finals & useful)
+
+
+def trim_dfa(dfa: DFA, keep_sink: bool = False) -> DFA:
+    """
+    Devuelve un DFA equivalente sin estados inalcanzables ni muertos (los
+    que no llegan a un final, como ∅). El resultado es parcial: en la tabla
+    compilada las transiciones que faltan van al estado muerto implícito de
+    CompiledDFA, y las tablas de texto las muestran como ∅. Con
+    keep_sink=True se conserva un único sumidero explícito (el estado ∅ si
+    existe) al que se redirigen las transiciones hacia estados muertos, de
+    modo que un DFA completo sigue siéndolo. Los estados conservan sus ids y
+    la tabla de subconjuntos; si no sobra ninguno devuelve el propio dfa.
+    """
+    delta = dfa.delta
+    symbols = list(dfa.sigma)
+    empty = ()
+
+    def successors(q):
+        for a in symbols:
+            t = delta.get((q, a))
+            if t is not None:
+                yield t
+
+    reachable = _search([dfa.q0], successors)
+    pred = _predecessors(((key, (t,)) for key, t in delta.items()))
+    alive = _search(dfa.finals & reachable, lambda q: pred.get(q, empty), within=reachable)
+    dead = reachable - alive
+    if reachable == dfa.states:
+        # Si el único estado muerto es q₀, ya está podado cuando se conserva como
+        # sumidero o cuando no hay transiciones
+        if not dead or (dead == {dfa.q0} and (keep_sink or not dfa.delta)):
+            return dfa
+
+    sink = None
+    if dead and keep_sink:
+        if dfa.q0 in dead:
+            sink = dfa.q0
+        else:
+            sinks = [q for q in dead if dfa.subsets is not None and not dfa.subsets[q]]
+            sink = min(sinks or dead)
+    states = set(alive)
+    states.add(dfa.q0)
+
+    delta = {}
+    for (q, a), t in dfa.delta.items():
+        if q in alive:
+            if t in alive:
+                delta[(q, a)] = t
+            elif sink is not None:
+                delta[(q, a)] = sink
+                states.add(sink)
+        elif q == sink:
+            delta[(q, a)] = sink
+
+    return DFA(
+        states=states,
+        sigma=set(dfa.sigma),
+        delta=delta,
+        q0=dfa.q0,
+        finals=dfa.finals & alive,
+        subsets=dfa.subsets,
+        nfa_states=dfa.nfa_states
+    )
@@ -1,54 +1,101 @@
+import gzip
 from lxml import etree
-from typing import Set, Dict, Tuple
-from src.nfa_dfa.nfa import NFA
+from sys import intern
+from typing import List, Optional, Set, Dict, Tuple
+from nfa_dfa.nfa import NFA
 
 
 def parse_nfa_from_jff(path: str) -> NFA:
     """
     Parsea un archivo JFLAP (.jff) y devuelve un objeto NFA.
     Valida estructura y reporta errores precisos.
-    """
-    try:
-        tree = etree.parse(path)
-    except (etree.XMLSyntaxError, OSError) as e:
-        raise ValueError(f"Error al abrir o parsear JFLAP file: {e}")
-
-    root = tree.getroot()
-    automaton = root.find('.//automaton')
-    if automaton is None:
-        raise ValueError("No se encontró el elemento <automaton> en el JFLAP file")
 
+    El archivo se recorre en streaming (iterparse): cada <state> y
+    <transition> se procesa al cerrarse y se libera en seguida, así que la
+    memoria no depende del tamaño del árbol XML. Nombres, ids y símbolos se
+    internan para que las cadenas repetidas se compartan. Las transiciones
+    se guardan como tuplas de ids y se resuelven al final, y el primer error
+    de validación se reporta tras leer todo el archivo: los errores y su
+    prioridad son los mismos que si se cargara el documento completo.
+    Los archivos .gz (p. ej. .jff.gz) se descomprimen al vuelo.
+    """
+    automaton = None
     states: Set[str] = set()
     finals: Set[str] = set()
     initial_state: str = None
     state_id_map: Dict[str, str] = {}
+    state_error: Optional[str] = None
+    transitions: List[Tuple[Optional[str], Optional[str], str]] = []
 
-    # Leer estados
-    for state in automaton.findall('state'):
-        sid = state.get('id')
-        name = state.get('name')
-        if sid is None or name is None:
-            raise ValueError(f"Estado mal formado: {etree.tostring(state)}")
-        state_id_map[sid] = name
-        states.add(name)
-        if state.find('initial') is not None:
-            if initial_state is not None:
-                raise ValueError("Múltiples estados iniciales detectados")
-            initial_state = name
-        if state.find('final') is not None:
-            finals.add(name)
+    source = path
+    try:
+        if path.lower().endswith('.gz'):
+            source = gzip.open(path, 'rb')
+        events = etree.iterparse(source, events=('start', 'end'), tag=('automaton', 'state', 'transition'))
+        for event, elem in events:
+            if event == 'start':
+                # El primer <automaton> por debajo de la raíz (como .//automaton)
+                if automaton is None and elem.tag == 'automaton' and elem.getparent() is not None:
+                    automaton = elem
+                continue
+            if elem.tag == 'automaton' or elem.getparent() is not automaton:
+                continue
+
+            if elem.tag == 'state':
+                # Leer estados
+                sid = elem.get('id')
+                name = elem.get('name')
+                if state_error is None:
+                    if sid is None or name is None:
+                        state_error = f"Estado mal formado: {etree.tostring(elem)}"
+                    else:
+                        name = intern(name)
+                        state_id_map[intern(sid)] = name
+                        states.add(name)
+                        tags = {child.tag for child in elem}
+                        if 'initial' in tags:
+                            if initial_state is not None:
+                                state_error = "Múltiples estados iniciales detectados"
+                            initial_state = name
+                        if 'final' in tags:
+                            finals.add(name)
+            else:
+                # Leer transiciones (se resuelven cuando ya se conocen todos los estados)
+                # Equivale a findtext() de cada hijo, sin pasar por ElementPath
+                texts = {}
+                for child in elem:
+                    if child.tag not in texts:
+                        texts[child.tag] = child.text or ''
+                src_id = texts.get('from')
+                dst_id = texts.get('to')
+                sym = texts.get('read') or ''
+                transitions.append((
+                    intern(src_id) if src_id else src_id,
+                    intern(dst_id) if dst_id else dst_id,
+                    intern(sym),
+                ))
+
+            # Liberar el elemento ya procesado y los hermanos anteriores
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del automaton[0]
+    except (etree.XMLSyntaxError, OSError, EOFError) as e:
+        raise ValueError(f"Error al abrir o parsear JFLAP file: {e}")
+    finally:
+        if source is not path:
+            source.close()
 
+    if automaton is None:
+        raise ValueError("No se encontró el elemento <automaton> en el JFLAP file")
+    if state_error is not None:
+        raise ValueError(state_error)
     if initial_state is None:
         raise ValueError('No se encontró estado inicial en el JFLAP file')
 
-    # Leer transiciones
     delta: Dict[Tuple[str, str], Set[str]] = {}
     sigma: Set[str] = set()
 
-    for trans in automaton.findall('transition'):
-        src_id = trans.findtext('from')
-        dst_id = trans.findtext('to')
-        sym = trans.findtext('read') or ''
+    for src_id, dst_id, sym in transitions:
         if src_id not in state_id_map or dst_id not in state_id_map:
             raise ValueError(f"Transición con referencia de estado desconocido: {src_id}->{dst_id}")
         src = state_id_map[src_id]
@@ -57,6 +104,10 @@ def parse_nfa_from_jff(path: str) -> NFA:
         if sym:
             sigma.add(sym)
         key = (src, sym)
-        delta.setdefault(key, set()).add(dst)
+        dests = delta.get(key)
+        if dests is None:
+            delta[key] = {dst}
+        else:
+            dests.add(dst)
 
     return NFA(states=states, sigma=sigma, delta=delta, q0=initial_state, finals=finals)
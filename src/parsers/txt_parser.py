@@ -1,109 +1,184 @@
+import itertools
 import re
-from typing import List, Set, Dict, Tuple
-from src.nfa_dfa.nfa import NFA
+from sys import intern
+from typing import Iterator, List, Set, Dict, Tuple
+from nfa_dfa.nfa import NFA
+
+# "Estados: q0, q1" o "Estados q0, q1"
+_LABEL_SPLIT = re.compile(r'[:\s]+')
+# Línea de clave del formato etiquetado (todas salvo Estados llevan ':')
+_LABELED = re.compile(r'estados|(alfabeto|inicial|finales|transiciones)\s*:', re.IGNORECASE)
+# Celdas sin destinos en una fila de transiciones
+_EMPTY = frozenset(('-', '–', '—'))
+
+
+def _lines(f) -> Iterator[Tuple[int, str]]:
+    """(número de línea, línea sin espacios) de cada línea no vacía."""
+    for lineno, line in enumerate(f, 1):
+        line = line.strip()
+        if line:
+            yield lineno, line
+
+
+def _value(line: str, lineno: int) -> str:
+    """Lo que sigue a ':' en una línea "Clave: valor"."""
+    if ':' not in line:
+        raise ValueError(f'Línea {lineno}: falta ":" en "{line}"')
+    return line.split(':', 1)[1]
+
+
+def _names(text: str) -> List[str]:
+    """Nombres separados por comas, internados."""
+    return [intern(s.strip()) for s in text.split(',') if s.strip()]
+
+
+def _parse_dests(tok: str) -> List[str]:
+    # tok puede ser "A,B", "{A,B}" o "C"
+    if tok.startswith('{') and tok.endswith('}'):
+        tok = tok[1:-1]
+    return _names(tok)
+
 
 def parse_nfa_from_txt(path: str) -> NFA:
     """
     Parsea un AFN desde un .txt (etiquetado o crudo) y retorna un objeto NFA.
     Ahora separa siempre por comas los destinos, con o sin llaves.
-    """
-    def _parse_dests(tok: str) -> List[str]:
-        # tok puede ser "A,B", "{A,B}" o "C"
-        tok = tok.strip()
-        if tok.startswith('{') and tok.endswith('}'):
-            core = tok[1:-1]
-        else:
-            core = tok
-        return [d.strip() for d in core.split(',') if d.strip()]
-
-    with open(path, encoding='utf-8') as f:
-        lines = [line.strip() for line in f if line.strip()]
-
-    has_labels = any(line.lower().startswith('estados') for line in lines)
 
+    El archivo se lee línea a línea en una sola pasada. Es etiquetado si
+    alguna línea es una clave (Estados, Alfabeto:, …); las líneas previas a
+    la primera clave, como un título, se ignoran. Si la clave sólo aparece
+    después de las 4 líneas de cabecera del formato crudo, el archivo se
+    vuelve a leer como etiquetado. Cuando llegan las filas de transiciones
+    los estados ya son conocidos, así que cada destino se valida al leerlo
+    contra un set. Los errores indican el número de línea; los de δ se
+    guardan y se lanzan al final, detrás de las validaciones globales y en
+    el orden de inserción de δ, como antes.
+    """
     delta: Dict[Tuple[str, str], Set[str]] = {}
     states: List[str] = []
     sigma: List[str] = []
     q0: str = None
     finals: Set[str] = set()
+    # (origen, símbolo) -> mensaje del primer error de esa transición
+    errors: Dict[Tuple[str, str], str] = {}
 
-    if has_labels:
-        # — Formato etiquetado —
-        for line in lines:
+    def add_row(src: str, row: str, lineno: int, known: Set[str], syms: List[str]):
+        for sym, tok in zip(syms, row.split()):
+            if tok in _EMPTY:
+                continue
+            dests = _parse_dests(tok)
+            if not dests:
+                continue
+            key = (src, sym)
+            targets = delta.get(key)
+            if targets is None:
+                targets = delta[key] = set()
+                if src not in known:
+                    errors[key] = f'Línea {lineno}: Transición desde estado desconocido: {src}'
+            targets.update(dests)
+            if key not in errors:
+                for d in dests:
+                    if d not in known:
+                        errors[key] = f'Línea {lineno}: Transición hacia estado desconocido: {d}'
+                        break
+
+    def read_labeled(lines: Iterator[Tuple[int, str]]):
+        # Las líneas que no son claves (títulos, comentarios) se ignoran
+        nonlocal states, sigma, q0, finals
+        for lineno, line in lines:
             low = line.lower()
             if low.startswith('estados'):
-                parts = re.split(r'[:\s]+', line, maxsplit=1)[1]
-                states = [s.strip() for s in parts.split(',') if s.strip()]
+                parts = _LABEL_SPLIT.split(line, maxsplit=1)
+                if len(parts) < 2:
+                    raise ValueError(f'Línea {lineno}: no se indicaron estados')
+                states = _names(parts[1])
             elif low.startswith('alfabeto'):
-                parts = line.split(':', 1)[1]
-                sigma = [s.strip() for s in parts.split(',') if s.strip()]
+                sigma = _names(_value(line, lineno))
             elif low.startswith('inicial'):
-                q0 = line.split(':', 1)[1].strip()
+                q0 = intern(_value(line, lineno).strip())
             elif low.startswith('finales'):
-                parts = line.split(':', 1)[1]
-                finals = set(s.strip() for s in parts.split(',') if s.strip())
+                finals = set(_names(_value(line, lineno)))
             elif low.startswith('transiciones'):
-                start = lines.index(line) + 1
-                raw = lines[start:]
                 break
         else:
             raise ValueError('Sección "Transiciones:" no encontrada')
 
+        known = set(states)
         syms = sigma + ['']
-        for row in raw:
+        for lineno, row in lines:
             if ':' not in row:
                 continue
             src, rest = row.split(':', 1)
-            src = src.strip()
-            toks = re.split(r'\s+', rest.strip())
-            toks = ['' if t in ('-', '–', '—') else t for t in toks]
-            for sym, tok in zip(syms, toks):
-                if not tok:
-                    continue
-                for d in _parse_dests(tok):
-                    delta.setdefault((src, sym), set()).add(d)
-
-    else:
-        # — Formato crudo —
-        if len(lines) < 5:
+            add_row(intern(src.strip()), rest, lineno, known, syms)
+        return known
+
+    def read_raw(header: List[Tuple[int, str]], lines: Iterator[Tuple[int, str]]):
+        # Devuelve None si aparece una clave del formato etiquetado
+        nonlocal states, sigma, q0, finals
+        if len(header) < 4:
             raise ValueError('Formato crudo inválido: se requieren al menos 5 líneas')
-        states = lines[0].split()
-        q0     = lines[1].strip()
-        finals = set(lines[2].split())
-        sigma  = lines[3].split()
-        raw    = lines[4:]
-        if len(raw) != len(states):
-            raise ValueError(f'Se esperaban {len(states)} filas de transiciones, hay {len(raw)}')
+        states = [intern(s) for s in header[0][1].split()]
+        q0     = intern(header[1][1])
+        finals = {intern(s) for s in header[2][1].split()}
+        sigma  = [intern(s) for s in header[3][1].split()]
 
+        known = set(states)
         syms = sigma + ['']
-        for src, row in zip(states, raw):
-            toks = re.split(r'\s+', row.strip())
-            toks = ['' if t in ('-', '–', '—') else t for t in toks]
-            for sym, tok in zip(syms, toks):
-                if not tok:
-                    continue
-                for d in _parse_dests(tok):
-                    delta.setdefault((src, sym), set()).add(d)
+        rows = 0
+        for lineno, row in lines:
+            if _LABELED.match(row):
+                return None
+            if rows < len(states):
+                add_row(states[rows], row, lineno, known, syms)
+            rows += 1
+        if rows == 0:
+            raise ValueError('Formato crudo inválido: se requieren al menos 5 líneas')
+        if rows != len(states):
+            raise ValueError(f'Se esperaban {len(states)} filas de transiciones, hay {rows}')
+        return known
+
+    with open(path, encoding='utf-8') as f:
+        lines = _lines(f)
+        # Cabecera: hasta la primera clave (formato etiquetado) o hasta
+        # completar las 4 líneas del formato crudo
+        header: List[Tuple[int, str]] = []
+        key = None
+        for item in lines:
+            if _LABELED.match(item[1]):
+                key = item
+                break
+            header.append(item)
+            if len(header) == 4:
+                break
+
+        if key is not None:
+            known = read_labeled(itertools.chain([key], lines))
+        else:
+            known = read_raw(header, lines)
+
+    if known is None:
+        # Etiquetado con 4 o más líneas de texto antes de la primera clave:
+        # se vuelve a leer desde el principio con el formato correcto
+        delta.clear()
+        errors.clear()
+        states, sigma, q0, finals = [], [], None, set()
+        with open(path, encoding='utf-8') as f:
+            known = read_labeled(_lines(f))
 
     # — Validaciones finales —
     if not states:
         raise ValueError('No se encontraron estados válidos')
     if q0 is None:
         raise ValueError('No se encontró estado inicial')
-    unknown_finals = set(finals) - set(states)
+    unknown_finals = finals - known
     if unknown_finals:
         raise ValueError(f'Estados finales desconocidos: {unknown_finals}')
+    if errors:
+        # El primero en el orden de δ, como si se recorriera completo
+        for key in delta:
+            if key in errors:
+                raise ValueError(errors[key])
 
-    sigma_set = set(sigma)
-    for (s, sym), dests in list(delta.items()):
-        if s not in states:
-            raise ValueError(f'Transición desde estado desconocido: {s}')
-        if sym and sym not in sigma_set:
-            raise ValueError(f'Símbolo desconocido en transiciones: {sym}')
-        for d in dests:
-            if d not in states:
-                raise ValueError(f'Transición hacia estado desconocido: {d}')
-
-    nfa = NFA(states=set(states), sigma=sigma_set, delta=delta, q0=q0, finals=finals)
+    nfa = NFA(states=known, sigma=set(sigma), delta=delta, q0=q0, finals=finals)
     nfa.source_path = path
     return nfa
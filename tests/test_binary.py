@@ -0,0 +1,155 @@
+"""
+Ida y vuelta del formato binario (.afb) con AFN leídos de .txt y .jff y sus
+AFD (subconjuntos, mínimo y Brzozowski), con y sin mmap, y rechazo de archivos dañados.
+"""
+import itertools
+
+import pytest
+
+from nfa_dfa import binary
+from nfa_dfa.step_engine import convert_nfa_to_dfa
+from parsers.jflap_parser import parse_nfa_from_jff
+from parsers.txt_parser import parse_nfa_from_txt
+
+# (a|b)*a(a|b) con una transición ε al final: penúltimo símbolo 'a'
+TXT = """\
+Estados: q0, q1, q2, q3
+Alfabeto: a, b
+Inicial: q0
+Finales: q3
+Transiciones:
+q0: {q0,q1} {q0} -
+q1: {q2} {q2} -
+q2: - - {q3}
+q3: - - -
+"""
+
+JFF = """\
+<?xml version='1.0' encoding='UTF-8'?>
+<structure>
+  <type>fa</type>
+  <automaton>
+    <state id="0" name="q0"><initial/></state>
+    <state id="1" name="q1"/>
+    <state id="2" name="q2"/>
+    <state id="3" name="q3"><final/></state>
+    <transition><from>0</from><to>0</to><read>a</read></transition>
+    <transition><from>0</from><to>0</to><read>b</read></transition>
+    <transition><from>0</from><to>1</to><read>a</read></transition>
+    <transition><from>1</from><to>2</to><read>a</read></transition>
+    <transition><from>1</from><to>2</to><read>b</read></transition>
+    <transition><from>2</from><to>3</to><read/></transition>
+  </automaton>
+</structure>
+"""
+
+WORDS = [''.join(w) for n in range(6) for w in itertools.product('ab', repeat=n)]
+
+
+@pytest.fixture(params=['txt', 'jff'])
+def nfa(request, tmp_path):
+    path = tmp_path / f'afn.{request.param}'
+    path.write_text(TXT if request.param == 'txt' else JFF, encoding='utf-8')
+    parse = parse_nfa_from_txt if request.param == 'txt' else parse_nfa_from_jff
+    return parse(str(path))
+
+
+def _dfas(nfa):
+    result = convert_nfa_to_dfa(nfa, minimal=True)
+    return {
+        'subset': result.dfa,
+        'minimal': result.minimal_dfa,
+        'brzozowski': convert_nfa_to_dfa(nfa, strategy='brzozowski').dfa,
+    }
+
+
+def _roundtrip(automaton, path, use_mmap, labels=False):
+    binary.save(automaton, str(path), labels=labels)
+    return binary.load(str(path), use_mmap=use_mmap)
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_nfa_roundtrip(nfa, tmp_path, use_mmap):
+    loaded = _roundtrip(nfa, tmp_path / 'afn.afb', use_mmap)
+    assert loaded.states == nfa.states
+    assert loaded.sigma == nfa.sigma
+    assert loaded.delta == nfa.delta
+    assert loaded.q0 == nfa.q0
+    assert loaded.finals == nfa.finals
+    assert [loaded.accepts(w) for w in WORDS] == [nfa.accepts(w) for w in WORDS]
+
+
+@pytest.mark.parametrize('strategy', ['subset', 'minimal', 'brzozowski'])
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_dfa_roundtrip(nfa, tmp_path, strategy, use_mmap):
+    dfa = _dfas(nfa)[strategy]
+    loaded = _roundtrip(dfa, tmp_path / 'afd.afb', use_mmap)
+    assert loaded.states == dfa.states
+    assert loaded.sigma == dfa.sigma
+    assert dict(loaded.delta) == dict(dfa.delta)
+    assert loaded.q0 == dfa.q0
+    assert loaded.finals == dfa.finals
+    assert {q: loaded.label(q) for q in loaded.states} == {q: dfa.label(q) for q in dfa.states}
+    assert loaded.accepts_many(WORDS) == [nfa.accepts(w) for w in WORDS]
+
+
+@pytest.mark.parametrize('strategy', ['subset', 'minimal', 'brzozowski'])
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_dfa_roundtrip_labels(nfa, tmp_path, strategy, use_mmap):
+    dfa = _dfas(nfa)[strategy]
+    loaded = _roundtrip(dfa, tmp_path / 'afd.afb', use_mmap, labels=True)
+    assert loaded.states == {dfa.label(q) for q in dfa.states}
+    assert loaded.q0 == dfa.label(dfa.q0)
+    assert loaded.finals == {dfa.label(q) for q in dfa.finals}
+    assert dict(loaded.delta) == {(dfa.label(q), a): dfa.label(t) for (q, a), t in dfa.delta.items()}
+    assert loaded.accepts_many(WORDS) == [nfa.accepts(w) for w in WORDS]
+
+
+@pytest.mark.parametrize('strategy', ['subset', 'minimal', 'brzozowski'])
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_compile_from_file(nfa, tmp_path, strategy, use_mmap):
+    path = tmp_path / 'afd.afb'
+    binary.save(_dfas(nfa)[strategy], str(path))
+    with binary.BinaryAutomaton(str(path), use_mmap=use_mmap) as afb:
+        assert afb.kind == binary.KIND_DFA
+        assert afb.version == binary.VERSION
+        assert afb.compile().accepts_many(WORDS) == [nfa.accepts(w) for w in WORDS]
+
+
+@pytest.fixture
+def saved(tmp_path):
+    path = tmp_path / 'afn.txt'
+    path.write_text(TXT, encoding='utf-8')
+    out = tmp_path / 'afd.afb'
+    binary.save(convert_nfa_to_dfa(parse_nfa_from_txt(str(path))).dfa, str(out))
+    return out
+
+
+def _patch(path, offset, data):
+    raw = bytearray(path.read_bytes())
+    raw[offset:offset + len(data)] = data
+    path.write_bytes(bytes(raw))
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_truncated(saved, use_mmap):
+    raw = saved.read_bytes()
+    for size in (0, 10, len(raw) - 8):
+        saved.write_bytes(raw[:size])
+        with pytest.raises(ValueError):
+            binary.load(str(saved), use_mmap=use_mmap)
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_bad_magic(saved, use_mmap):
+    _patch(saved, 0, b'XYZ\0')
+    with pytest.raises(ValueError):
+        binary.load(str(saved), use_mmap=use_mmap)
+
+
+@pytest.mark.parametrize('use_mmap', [True, False])
+def test_wrong_version(saved, use_mmap):
+    # La versión es el u16 que sigue al magic
+    _patch(saved, len(binary.MAGIC), (binary.VERSION + 1).to_bytes(2, 'little'))
+    with pytest.raises(ValueError, match='versión'):
+        binary.load(str(saved), use_mmap=use_mmap)